@@ -4,9 +4,12 @@ import sys
 import time
 import hashlib
 import json
+import shutil
 import argparse
 import threading
 import itertools
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ANSI color codes for Windows
@@ -23,6 +26,51 @@ BOLD = "\033[1m"
 
 # Build cache file
 CACHE_FILE = ".build_cache"
+CACHE_VERSION = 2
+
+# Inputs that trigger a rebuild, and directories never searched for them
+TRACKED_EXTENSIONS = ('.py', '.qss', '.qrc', '.png')
+PRUNED_DIRS = {'venv', '.venv', '.git', '__pycache__', 'build', 'dist',
+               '.pytest_cache', '.mypy_cache', '.tox', '.nox', 'node_modules'}
+HASH_WORKERS = 8
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Build profiles
+BUILD_PROFILES = {
+    'onefile': "Single executable; unpacks itself to a temp dir on every launch",
+    'onedir': "Folder with the executable and its libraries; starts without unpacking",
+    'lean': "Onedir without unused Qt modules, plugins and translations, with optimized bytecode",
+}
+DEFAULT_PROFILE = 'onefile'
+
+# Not imported by SteamDown; the PySide6 hooks would otherwise bundle them and their plugins
+LEAN_EXCLUDED_MODULES = [
+    "PySide6.QtQml", "PySide6.QtQuick", "PySide6.QtQuickWidgets", "PySide6.QtQuickControls2",
+    "PySide6.QtWebEngineCore", "PySide6.QtWebEngineWidgets", "PySide6.QtWebChannel",
+    "PySide6.QtWebSockets", "PySide6.QtMultimedia", "PySide6.QtMultimediaWidgets",
+    "PySide6.QtNetwork", "PySide6.QtOpenGL", "PySide6.QtOpenGLWidgets", "PySide6.QtSql",
+    "PySide6.QtPdf", "PySide6.QtPdfWidgets", "PySide6.QtCharts", "PySide6.QtDataVisualization",
+    "PySide6.Qt3DCore", "PySide6.Qt3DRender", "PySide6.QtBluetooth", "PySide6.QtPositioning",
+    "PySide6.QtSerialPort", "PySide6.QtTest", "PySide6.QtDesigner", "PySide6.QtHelp",
+    "tkinter", "unittest", "pydoc", "lib2to3",
+]
+# Removed from the lean output after PyInstaller runs (relative to the bundle's Qt dir)
+LEAN_PRUNED_PATHS = [
+    "translations",
+    os.path.join("plugins", "networkinformation"),
+    os.path.join("plugins", "tls"),
+    os.path.join("plugins", "generic"),
+    os.path.join("plugins", "qmltooling"),
+]
+
+# Qt resources (icons, stylesheets) compiled into a module the app imports at startup
+RESOURCE_FILE = os.path.join("src", "steamdown", "assets", "resources.qrc")
+RESOURCE_MODULE = os.path.join("src", "steamdown", "resources_rc.py")
+
+# Startup probe: the app exits as soon as its window is shown when this is set
+STARTUP_PROBE_ENV = "STEAMDOWN_STARTUP_PROBE"
+STARTUP_PROBE_RUNS = 5
+STARTUP_PROBE_TIMEOUT = 60
 
 # Verbosity levels
 QUIET = 1      # Only errors and final result
@@ -88,63 +136,125 @@ def print_color(text, color, min_verbosity=NORMAL):
 
 def get_file_hash(filepath):
     """Get hash of file contents"""
-    if not os.path.exists(filepath):
+    try:
+        with open(filepath, 'rb') as f:
+            digest = hashlib.blake2b(digest_size=16)
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+            return digest.hexdigest()
+    except OSError:
         return None
-    with open(filepath, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
 
-def load_cache():
+def get_cache_file(profile=DEFAULT_PROFILE):
+    """Each profile has its own cache, since building one doesn't update the others"""
+    return CACHE_FILE if profile == DEFAULT_PROFILE else f"{CACHE_FILE}.{profile}"
+
+def load_cache(profile=DEFAULT_PROFILE):
     """Load the build cache"""
-    if os.path.exists(CACHE_FILE):
+    cache_file = get_cache_file(profile)
+    if os.path.exists(cache_file):
         try:
-            with open(CACHE_FILE, 'r') as f:
-                return json.load(f)
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+            # Caches from older versions hold MD5 digests only; start over
+            if cache.get('version') == CACHE_VERSION:
+                return cache
         except:
             return {}
     return {}
 
-def save_cache(cache):
+def save_cache(cache, profile=DEFAULT_PROFILE):
     """Save the build cache"""
-    with open(CACHE_FILE, 'w') as f:
+    with open(get_cache_file(profile), 'w') as f:
         json.dump(cache, f, indent=2)
 
 def get_tracked_files():
-    """Get list of files to track for changes"""
-    python_files = []
-    for root, _, files in os.walk('.'):
-        if 'venv' in root or '.git' in root or '__pycache__' in root:
-            continue
+    """Get tracked files with their (size, mtime_ns), skipping environments and build output"""
+    tracked = {}
+    for root, dirs, files in os.walk('.'):
+        # Prune in place so os.walk never descends into these
+        dirs[:] = [d for d in dirs if d not in PRUNED_DIRS and not d.endswith('.egg-info')]
         for file in files:
-            if file.endswith('.py') or file.endswith('.qss'):
-                python_files.append(os.path.join(root, file))
-    return python_files
-
-def check_for_changes():
-    """Check if any tracked files have changed"""
-    cache = load_cache()
-    tracked_files = get_tracked_files()
-    
-    # Check if any new files were added
-    cached_files = set(cache.get('files', {}))
-    current_files = set(tracked_files)
-    
-    if cached_files != current_files:
-        return True
-        
-    # Check if any existing files were modified
-    for file in tracked_files:
-        current_hash = get_file_hash(file)
-        if current_hash != cache.get('files', {}).get(file):
-            return True
-            
-    return False
+            if file.endswith(TRACKED_EXTENSIONS):
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                tracked[path] = (stat.st_size, stat.st_mtime_ns)
+    return tracked
+
+def hash_files(paths):
+    """Hash files in parallel; hashlib releases the GIL while hashing"""
+    if len(paths) <= 1:
+        return {path: get_file_hash(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(paths))) as executor:
+        return dict(zip(paths, executor.map(get_file_hash, paths)))
+
+def take_snapshot(cache):
+    """Stat every tracked file and hash only those whose size or mtime changed.
+
+    Returns (snapshot, number of files hashed, per-phase timings in seconds), where
+    the snapshot maps each path to {'size', 'mtime_ns', 'hash'}.
+    """
+    timings = {}
+    start = time.perf_counter()
+    tracked = get_tracked_files()
+    timings['scan'] = time.perf_counter() - start
+
+    cached_files = cache.get('files', {})
+    snapshot = {}
+    suspects = []
+    for path, (size, mtime_ns) in tracked.items():
+        entry = cached_files.get(path)
+        if entry and entry.get('size') == size and entry.get('mtime_ns') == mtime_ns:
+            snapshot[path] = entry
+        else:
+            suspects.append(path)
+            snapshot[path] = {'size': size, 'mtime_ns': mtime_ns, 'hash': None}
+
+    start = time.perf_counter()
+    for path, file_hash in hash_files(suspects).items():
+        snapshot[path]['hash'] = file_hash
+    timings['hash'] = time.perf_counter() - start
+    return snapshot, len(suspects), timings
+
+def print_timings(timings, hashed, total):
+    """Show how long each phase of the change check took"""
+    phases = ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in timings.items())
+    print_color(f"⏱  Change check: {phases} ({total} files, {hashed} hashed)", CYAN, DETAILED)
+
+def check_for_changes(profile=DEFAULT_PROFILE):
+    """Check if any tracked files have changed.
 
-def update_cache():
-    """Update the build cache with current file hashes"""
-    cache = {'files': {}}
-    for file in get_tracked_files():
-        cache['files'][file] = get_file_hash(file)
-    save_cache(cache)
+    Returns (changed, snapshot); pass the snapshot to update_cache after a
+    successful build so edits made during the build are picked up next time.
+    """
+    start = time.perf_counter()
+    cache = load_cache(profile)
+    timings = {'load': time.perf_counter() - start}
+    snapshot, hashed, snapshot_timings = take_snapshot(cache)
+    timings.update(snapshot_timings)
+
+    start = time.perf_counter()
+    cached_files = cache.get('files', {})
+    changed = (set(cached_files) != set(snapshot)
+               or any(snapshot[path]['hash'] != cached_files[path].get('hash') for path in snapshot))
+    timings['compare'] = time.perf_counter() - start
+
+    if not changed and hashed:
+        # Touched but identical files: remember their new mtimes so they aren't hashed again
+        cache['files'] = snapshot
+        save_cache(cache, profile)
+
+    print_timings(timings, hashed, len(snapshot))
+    return changed, snapshot
+
+def update_cache(snapshot=None, profile=DEFAULT_PROFILE):
+    """Update the build cache with current file sizes, mtimes and hashes"""
+    if snapshot is None:
+        snapshot, _, _ = take_snapshot(load_cache(profile))
+    save_cache({'version': CACHE_VERSION, 'files': snapshot}, profile)
 
 def get_venv_python():
     """Get the Python executable path from virtual environment"""
@@ -158,18 +268,170 @@ def get_pyside_plugins_path():
         return os.path.join("venv", "Lib", "site-packages", "PySide6", "plugins")
     return os.path.join("venv", "lib", "python3.*", "site-packages", "PySide6", "plugins")
 
-def build(force=False):
-    """Build the application using PyInstaller"""
-    print_color("\n🚀 Building SteamDown...\n", CYAN + BOLD, QUIET)
+def get_rcc_command(venv_python):
+    """pyside6-rcc from the build environment, else from PATH (None if neither has it)"""
+    scripts_dir = os.path.dirname(venv_python)
+    for name in ("pyside6-rcc.exe", "pyside6-rcc"):
+        path = os.path.join(scripts_dir, name)
+        if os.path.exists(path):
+            return [path]
+    path = shutil.which("pyside6-rcc")
+    return [path] if path else None
+
+def get_resource_files():
+    """Files listed in resources.qrc as {alias: path}, plus the listed files that don't exist"""
+    qrc_dir = os.path.dirname(RESOURCE_FILE)
+    files = {}
+    missing = []
+    for entry in ET.parse(RESOURCE_FILE).getroot().iter('file'):
+        path = os.path.normpath(os.path.join(qrc_dir, entry.text.strip()))
+        if os.path.exists(path):
+            files[entry.get('alias') or entry.text.strip()] = path
+        else:
+            missing.append(path)
+    return files, missing
+
+def compile_resources(venv_python):
+    """Compile resources.qrc into resources_rc.py unless it is up to date; returns False on error"""
+    files, missing = get_resource_files()
+    for path in missing:
+        print_color(f"⚠ Resource not found, leaving it out: {path}", YELLOW, QUIET)
+
+    # Regenerating an unchanged module would make every build look changed
+    inputs = [RESOURCE_FILE] + list(files.values())
+    if (os.path.exists(RESOURCE_MODULE)
+            and os.path.getmtime(RESOURCE_MODULE) >= max(os.path.getmtime(path) for path in inputs)):
+        print_color("✔ Qt resources are up to date", GREEN, DETAILED)
+        return True
+
+    rcc = get_rcc_command(venv_python)
+    if rcc is None:
+        print_color("❌ Error: pyside6-rcc not found (it comes with PySide6)", RED, QUIET)
+        return False
+
+    # rcc fails on missing files, so compile a copy that lists only the existing ones
+    os.makedirs("build", exist_ok=True)
+    qrc_path = os.path.join("build", "resources.qrc")
+    root = ET.Element('RCC', version="1.0")
+    resources = ET.SubElement(root, 'qresource', prefix="/")
+    for alias, path in sorted(files.items()):
+        ET.SubElement(resources, 'file', alias=alias).text = os.path.abspath(path)
+    ET.ElementTree(root).write(qrc_path, encoding="utf-8")
+
+    try:
+        subprocess.run(rcc + ["-o", RESOURCE_MODULE, qrc_path], check=True,
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except subprocess.CalledProcessError as e:
+        print_color(f"❌ Error compiling Qt resources: {e.stderr.strip()}", RED, QUIET)
+        return False
+    print_color(f"✔ Compiled {len(files)} Qt resources into {RESOURCE_MODULE}", GREEN, NORMAL)
+    return True
+
+def get_dist_dir(profile):
+    """Output directory of a profile ('dist' itself for the default onefile build)"""
+    return "dist" if profile == DEFAULT_PROFILE else os.path.join("dist", profile)
+
+def get_executable_path(profile):
+    """Path of the built executable for a profile"""
+    exe_name = "SteamDown.exe" if sys.platform == "win32" else "SteamDown"
+    if profile == 'onefile':
+        return os.path.join(get_dist_dir(profile), exe_name)
+    return os.path.join(get_dist_dir(profile), "SteamDown", exe_name)
+
+def get_output_size(profile):
+    """Total size in bytes of what a profile ships"""
+    exe_path = get_executable_path(profile)
+    if profile == 'onefile':
+        return os.path.getsize(exe_path)
+    total = 0
+    for root, _, files in os.walk(os.path.dirname(exe_path)):
+        for file in files:
+            total += os.path.getsize(os.path.join(root, file))
+    return total
+
+def prune_lean_output(profile):
+    """Delete Qt files the lean build doesn't need; returns the bytes freed"""
+    bundle_dir = os.path.dirname(get_executable_path(profile))
+    freed = 0
+    # PyInstaller 6 moves everything but the executable into _internal
+    for base in (bundle_dir, os.path.join(bundle_dir, "_internal")):
+        for qt_dir in (os.path.join(base, "PySide6"), os.path.join(base, "PySide6", "Qt")):
+            for relative in LEAN_PRUNED_PATHS:
+                path = os.path.join(qt_dir, relative)
+                if not os.path.isdir(path):
+                    continue
+                for root, _, files in os.walk(path):
+                    freed += sum(os.path.getsize(os.path.join(root, file)) for file in files)
+                shutil.rmtree(path, ignore_errors=True)
+                print_color(f"✂ Removed {os.path.relpath(path, bundle_dir)}", YELLOW, DETAILED)
+    return freed
+
+def measure_startup(profile, runs=STARTUP_PROBE_RUNS):
+    """Launch the built app with the startup probe set and time each run until it exits.
+
+    The first run is the cold start (files not yet in the OS cache, and for onefile
+    the archive unpacked for the first time); returns a list of seconds.
+    """
+    exe_path = get_executable_path(profile)
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: "1"})
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([exe_path], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=STARTUP_PROBE_TIMEOUT, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+def get_pyinstaller_command(profile, venv_python, pyside_plugins):
+    """PyInstaller command line for a build profile"""
+    python = [venv_python]
+    if profile == 'lean':
+        # PyInstaller compiles the bundled bytecode at its own optimization level
+        python.append("-O")
+    cmd = python + [
+        "-m", "PyInstaller",
+        "--noconfirm",
+        "--onefile" if profile == 'onefile' else "--onedir",
+        "--windowed",
+        "--name", "SteamDown",
+        "--distpath", get_dist_dir(profile),
+        "--workpath", os.path.join("build", profile),
+        "main.py",
+    ]
+    if profile == 'lean':
+        # The PySide6 hooks collect the plugins the imported Qt modules need
+        for module in LEAN_EXCLUDED_MODULES:
+            cmd.extend(["--exclude-module", module])
+    else:
+        cmd.extend(["--add-data", f"{pyside_plugins}{os.pathsep}PySide6/plugins"])
+
+    # Add verbosity flags for PyInstaller
+    if verbosity == QUIET:
+        cmd.append("--quiet")
+    elif verbosity == DETAILED:
+        cmd.append("-v")
+    elif verbosity == DEBUG:
+        cmd.append("-vv")
+    return cmd
+
+def build_profile(profile, force=False, measure=False):
+    """Build one profile using PyInstaller; returns (exit code, size, startup times)"""
+    print_color(f"\n🚀 Building SteamDown ({profile})...\n", CYAN + BOLD, QUIET)
+    print_color(BUILD_PROFILES[profile], CYAN, NORMAL)
+    venv_python = get_venv_python()
+    
+    # Regenerate the resource module first so its changes count as source changes
+    if not compile_resources(venv_python):
+        return 1, None, None
     
     # Check for changes
-    if not force and not check_for_changes():
+    changed, snapshot = check_for_changes(profile)
+    if not force and not changed and os.path.exists(get_executable_path(profile)):
         print_color("✨ No changes detected since last build", YELLOW, QUIET)
-        print_color("📁 Using existing build in 'dist' directory", YELLOW, QUIET)
+        print_color(f"📁 Using existing build in '{get_dist_dir(profile)}' directory", YELLOW, QUIET)
         print_color("\nUse --force to rebuild anyway", YELLOW, NORMAL)
-        return 0
+        return finish_profile(profile, measure)
     
-    venv_python = get_venv_python()
     pyside_plugins = get_pyside_plugins_path()
     
     # Check Python virtual environment
@@ -179,38 +441,12 @@ def build(force=False):
         print_color("python -m venv venv", RED, QUIET)
         print_color("Then install requirements using:", RED, QUIET)
         print_color("pip install -r requirements.txt", RED, QUIET)
-        return 1
+        return 1, None, None
     
-    # Ensure theme files exist
-    theme_file = os.path.join("src", "steamdown", "themes", "theme_dark.qss")
-    if not os.path.exists(theme_file):
-        print_color("❌ Error: Required theme file not found!", RED, QUIET)
-        print_color(f"Missing: {theme_file}", RED, QUIET)
-        return 1
-
-    print_color("✔ Found theme file", GREEN, NORMAL)
     print_color("✔ Using virtual environment Python", GREEN, NORMAL)
     print_color("\n📦 Starting PyInstaller build...\n", CYAN, NORMAL)
 
-    # PyInstaller command
-    cmd = [
-        venv_python, "-m", "PyInstaller",
-        "--noconfirm",
-        "--onefile",
-        "--windowed",
-        "--name", "SteamDown",
-        "main.py",
-        "--add-data", f"{theme_file}{os.pathsep}steamdown/themes",
-        "--add-data", f"{pyside_plugins}{os.pathsep}PySide6/plugins"
-    ]
-
-    # Add verbosity flags for PyInstaller
-    if verbosity == QUIET:
-        cmd.append("--quiet")
-    elif verbosity == DETAILED:
-        cmd.append("-v")
-    elif verbosity == DEBUG:
-        cmd.append("-vv")
+    cmd = get_pyinstaller_command(profile, venv_python, pyside_plugins)
 
     try:
         # Use subprocess.PIPE to control output based on verbosity
@@ -220,27 +456,66 @@ def build(force=False):
         with Spinner(" Building... "):
             process = subprocess.run(cmd, check=True, stdout=stdout, stderr=stderr)
         
-        print_color("\n✨ Build completed successfully!", GREEN + BOLD, QUIET)
-        print_color("📁 Executable can be found in the 'dist' directory", GREEN, QUIET)
+        if profile == 'lean':
+            freed = prune_lean_output(profile)
+            print_color(f"✂ Pruned {freed / (1024 * 1024):.1f}MB of unused Qt files", GREEN, NORMAL)
         
-        # Check if executable was created
-        exe_name = "SteamDown.exe" if sys.platform == "win32" else "SteamDown"
-        exe_path = os.path.join("dist", exe_name)
-        if os.path.exists(exe_path):
-            size_mb = os.path.getsize(exe_path) / (1024 * 1024)
-            print_color(f"📊 Executable size: {size_mb:.1f}MB", CYAN, QUIET)
+        print_color("\n✨ Build completed successfully!", GREEN + BOLD, QUIET)
+        print_color(f"📁 Executable can be found in the '{get_dist_dir(profile)}' directory", GREEN, QUIET)
             
         # Update cache after successful build
-        update_cache()
-        return 0
+        update_cache(snapshot, profile)
+        return finish_profile(profile, measure)
     except subprocess.CalledProcessError as e:
         print_color(f"\n❌ Build failed with error: {e}", RED, QUIET)
-        return 1
+        return 1, None, None
+
+def finish_profile(profile, measure):
+    """Report the size (and optionally the startup time) of a built profile"""
+    if not os.path.exists(get_executable_path(profile)):
+        return 0, None, None
+    size = get_output_size(profile)
+    print_color(f"📊 {'Executable' if profile == 'onefile' else 'Bundle'} size: "
+                f"{size / (1024 * 1024):.1f}MB", CYAN, QUIET)
+    if not measure:
+        return 0, size, None
+    try:
+        times = measure_startup(profile)
+    except (OSError, subprocess.SubprocessError) as e:
+        print_color(f"❌ Startup probe failed: {e}", RED, QUIET)
+        return 1, size, None
+    print_color(f"⏱  Startup: cold {times[0]:.2f}s, warm median "
+                f"{sorted(times[1:])[len(times[1:]) // 2]:.2f}s over {len(times) - 1} runs", CYAN, QUIET)
+    return 0, size, times
+
+def build(force=False, profile=DEFAULT_PROFILE, measure=False):
+    """Build one profile, or every profile and compare them"""
+    profiles = list(BUILD_PROFILES) if profile == 'all' else [profile]
+    results = {}
+    exit_code = 0
+    for name in profiles:
+        code, size, times = build_profile(name, force, measure)
+        exit_code = exit_code or code
+        results[name] = (size, times)
+
+    if len(profiles) > 1:
+        print_color("\n📊 Profile comparison:", CYAN + BOLD, QUIET)
+        for name, (size, times) in results.items():
+            size_text = f"{size / (1024 * 1024):7.1f}MB" if size else "      n/a"
+            startup = (f"cold {times[0]:.2f}s, warm {sorted(times[1:])[len(times[1:]) // 2]:.2f}s"
+                       if times else "not measured")
+            print_color(f"  {name:<8} {size_text}  {startup}", CYAN, QUIET)
+    return exit_code
 
 if __name__ == "__main__":
     try:
         parser = argparse.ArgumentParser(description="Build SteamDown application")
         parser.add_argument("--force", action="store_true", help="Force rebuild even if no changes detected")
+        parser.add_argument("--profile", choices=list(BUILD_PROFILES) + ["all"], default=DEFAULT_PROFILE,
+                          help="Build profile: " + "; ".join(f"{name}: {text}" for name, text in BUILD_PROFILES.items())
+                          + "; all: build and compare every profile")
+        parser.add_argument("--measure", action="store_true",
+                          help="Launch the built app and report its cold and warm startup times")
         parser.add_argument("-v", "--verbosity", type=int, choices=[1, 2, 3, 4], default=2,
                           help="Verbosity level (1=quiet, 2=normal, 3=detailed, 4=debug)")
         args = parser.parse_args()
@@ -249,7 +524,7 @@ if __name__ == "__main__":
         global verbosity
         verbosity = args.verbosity
         
-        sys.exit(build(force=args.force))
+        sys.exit(build(force=args.force, profile=args.profile, measure=args.measure))
     except KeyboardInterrupt:
         print_color("\n\n🛑 Build cancelled by user", RED, QUIET)
         sys.exit(1)
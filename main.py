@@ -1,12 +1,6 @@
-import sys
-from src.steamdown import MainWindow
-from PySide6.QtWidgets import QApplication
-
-def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+# Entry point for running from a checkout and for the PyInstaller build; the
+# app itself starts in src/steamdown/__main__.py (also run by python -m src.steamdown)
+from src.steamdown.__main__ import main
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
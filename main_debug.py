@@ -1,37 +1,239 @@
+import os
 import sys
+import time
+import types
 import logging
+import argparse
+import importlib
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QFrame, QVBoxLayout, QLabel, QCheckBox, QPushButton
+from PySide6.QtCore import Qt, QTimer, QObject, Signal
+from PySide6.QtGui import QShortcut, QKeySequence
 from src.steamdown import MainWindow
+from src.steamdown.utils.profiler import SamplingProfiler, DEFAULT_SAMPLE_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG,
                    format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shows and hides the debug overlay
+OVERLAY_SHORTCUT = "F12"
+# Editors often write a file several times per save; changes are batched for this long (ms)
+RELOAD_DEBOUNCE_MS = 100
+# Modules whose widgets MainWindow can rebuild in place
+RELOADABLE_PACKAGE = "src.steamdown.components."
+# Modules that own long-lived state; edits to these still need a restart
+RESTART_MODULES = {"src.steamdown.components.main_window"}
+THEME_MODULE = "src.steamdown.themes.styles"
+
 class CodeChangeHandler(FileSystemEventHandler):
+    """Forwards source file changes from the watchdog thread to the reloader"""
+    def __init__(self, reloader):
+        super().__init__()
+        self.reloader = reloader
+
     def on_modified(self, event):
-        if event.src_path.endswith('.py'):
-            print(f"\nCode change detected in {event.src_path}")
-            print("Restart the app to apply changes")
+        self.forward(event.src_path)
+
+    def on_created(self, event):
+        self.forward(event.src_path)
+
+    def on_moved(self, event):
+        # Editors that save atomically rename a temporary file over the original
+        self.forward(event.dest_path)
+
+    def forward(self, path):
+        if path.endswith(('.py', '.qss')):
+            self.reloader.file_changed.emit(os.path.abspath(path))
+
+def module_name(path):
+    """Dotted module name of a source file under the current directory, or None"""
+    relative = os.path.relpath(path)
+    if relative.startswith('..') or not relative.endswith('.py'):
+        return None
+    return relative[:-3].replace(os.sep, '.')
+
+def rebind_references(module, old_values):
+    """Point other steamdown modules' imported names at the reloaded classes/functions"""
+    replacements = {}
+    for name, old_value in old_values.items():
+        new_value = getattr(module, name, None)
+        if (isinstance(old_value, (type, types.FunctionType)) and new_value is not None
+                and new_value is not old_value):
+            replacements[id(old_value)] = new_value
+    if not replacements:
+        return
+    for other in list(sys.modules.values()):
+        if other is None or other is module or not other.__name__.startswith("src.steamdown"):
+            continue
+        for name, value in list(vars(other).items()):
+            new_value = replacements.get(id(value))
+            if new_value is not None:
+                setattr(other, name, new_value)
+
+class HotReloader(QObject):
+    """Applies edited themes and component modules to the running window.
+
+    Theme edits are re-applied through the window's ThemeManager; edited
+    component modules are reloaded and MainWindow rebuilds its screens, so the
+    monitor keeps its timers, countdown and download history.
+    """
+    # Absolute path of a changed file (emitted from the watchdog thread)
+    file_changed = Signal(str)
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.pending = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self.timer.timeout.connect(self.apply_changes)
+        self.file_changed.connect(self.on_file_changed)
+
+    def on_file_changed(self, path):
+        self.pending.add(path)
+        self.timer.start()
+
+    def apply_changes(self):
+        paths, self.pending = self.pending, set()
+        start = time.perf_counter()
+        stylesheet = None
+        reload_theme = False
+        modules = []
+        for path in sorted(paths):
+            if path.endswith('.qss'):
+                stylesheet = path
+                continue
+            name = module_name(path)
+            if name == THEME_MODULE:
+                reload_theme = True
+            elif name in sys.modules and name.startswith(RELOADABLE_PACKAGE) and name not in RESTART_MODULES:
+                modules.append(name)
+            elif name in sys.modules:
+                print(f"\nCode change detected in {path}")
+                print("Restart the app to apply changes")
+
+        try:
+            for name in modules:
+                module = sys.modules[name]
+                old_values = dict(vars(module))
+                importlib.reload(module)
+                rebind_references(module, old_values)
+            if modules:
+                self.window.rebuild_screens()
+            if stylesheet or reload_theme:
+                self.window.theme_manager.reload_theme(self.window, stylesheet)
+        except Exception as e:
+            # A half-typed edit shouldn't take the app down; the next save retries
+            logging.exception(f"Hot reload failed: {e}")
+            return
+
+        changed = [os.path.relpath(path) for path in sorted(paths)
+                   if path.endswith('.qss') or module_name(path) in modules or module_name(path) == THEME_MODULE]
+        if changed:
+            print(f"Hot reloaded {', '.join(changed)} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+class DebugOverlay(QFrame):
+    """Small panel over the main window for switching profiling on and off"""
+
+    def __init__(self, window, profiler, report_dir):
+        super().__init__(window)
+        self.profiler = profiler
+        self.report_dir = report_dir
+        self.setObjectName("DebugOverlay")
+        self.setStyleSheet("#DebugOverlay { background: rgba(0, 0, 0, 200); border-radius: 6px; }"
+                           "QLabel, QCheckBox { color: #9f9; font-family: monospace; }")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+
+        self.sampling_check = QCheckBox("Sample stacks")
+        self.sampling_check.setChecked(profiler.sampling)
+        self.sampling_check.toggled.connect(profiler.set_sampling)
+        layout.addWidget(self.sampling_check)
+
+        self.tracing_check = QCheckBox("Trace allocations")
+        self.tracing_check.setChecked(profiler.tracing)
+        self.tracing_check.toggled.connect(profiler.set_tracing)
+        layout.addWidget(self.tracing_check)
+
+        self.stats_label = QLabel()
+        layout.addWidget(self.stats_label)
+
+        report_button = QPushButton("Write reports")
+        report_button.clicked.connect(self.write_reports)
+        layout.addWidget(report_button)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        profiler = self.profiler
+        lines = [f"samples: {profiler.sample_count} ({profiler.overhead:.1%} overhead)"]
+        if profiler.memory_history:
+            _, current, peak = profiler.memory_history[-1]
+            lines.append(f"traced: {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB)")
+        self.stats_label.setText("\n".join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 10, parent.height() - self.height() - 10)
+        self.raise_()
+
+    def write_reports(self):
+        if self.profiler.tracing:
+            self.profiler.take_snapshot()
+        for path in self.profiler.write_reports(self.report_dir):
+            print(f"Wrote {path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run SteamDown with debugging aids")
+    parser.add_argument("--profile", action="store_true",
+                        help="Start the stack sampler right away")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Start tracing allocations right away")
+    parser.add_argument("--sample-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                        help="Seconds between stack samples")
+    parser.add_argument("--snapshot-interval", type=float, default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help="Seconds between tracemalloc snapshots")
+    parser.add_argument("--report-dir", default="profile",
+                        help="Where the collapsed stacks and allocation report are written on exit")
+    # Anything else (e.g. -platform) is left for Qt
+    return parser.parse_known_args()
 
 def main():
-    app = QApplication(sys.argv)
-    
-    # Set up file watcher
-    observer = Observer()
-    observer.schedule(CodeChangeHandler(), path='src', recursive=True)
-    observer.start()
-    
+    args, qt_args = parse_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    # Profiling is switchable at runtime from the overlay (F12)
+    profiler = SamplingProfiler(args.sample_interval, args.snapshot_interval)
+    profiler.set_tracing(args.tracemalloc)
+    profiler.set_sampling(args.profile)
+
     # Create and show the main window
     window = MainWindow()
+
+    # Set up file watcher; themes and components are reloaded in place
+    reloader = HotReloader(window)
+    observer = Observer()
+    observer.schedule(CodeChangeHandler(reloader), path='src', recursive=True)
+    observer.start()
+    overlay = DebugOverlay(window, profiler, args.report_dir)
+    overlay.setVisible(args.profile or args.tracemalloc)
+    QShortcut(QKeySequence(OVERLAY_SHORTCUT), window, lambda: overlay.setVisible(not overlay.isVisible()))
     window.show()
-    
+
     try:
         app.exec()
     finally:
         observer.stop()
         observer.join()
+        profiler.stop()
+        for path in profiler.write_reports(args.report_dir):
+            print(f"Wrote {path}")
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
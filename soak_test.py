@@ -0,0 +1,296 @@
+"""Soak test: run the real MainWindow offscreen for a simulated day (or more) of churning downloads.
+
+A fake Steam backend serves thousands of apps whose downloads start, progress,
+pause, stall and finish on an accelerated clock. SteamDown is enabled, and
+actions run through the real pipeline with a DryRunExecutor, so no command is
+executed. The monitor is ticked as fast as it runs, and RSS, open handles, threads, live Qt objects and tick latency
+are sampled along the way. The run fails if any of them keeps growing.
+
+    python soak_test.py --hours 24 --csv soak.csv
+"""
+import os
+import sys
+import gc
+import csv
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import threading
+import statistics
+
+# Simulated time per monitor tick (seconds) and length of the run (hours)
+DEFAULT_STEP = 5
+DEFAULT_HOURS = 24
+# Installed apps and downloads kept in the queue at once
+DEFAULT_APPS = 5000
+DEFAULT_CONCURRENT = 8
+# Ticks between metric samples, and the share of samples ignored as warm-up
+SAMPLE_EVERY = 100
+WARMUP_SHARE = 0.2
+# Ticks between UI churn (page switches, settings edits) and forced actions
+UI_CHURN_EVERY = 250
+ACTION_EVERY = 1000
+# Actions forced in turn (countdowns that run out perform the selected one too)
+ACTIONS = ("Close Steam", "Shutdown PC", "Sleep PC")
+# Real seconds an action may take before the soak gives up on it
+ACTION_TIMEOUT = 30
+
+# metric -> (absolute slack, relative slack) allowed between the first and last third
+TOLERANCES = {
+    'rss_mb': (8.0, 0.10),
+    'handles': (4, 0.0),
+    'threads': (2, 0.0),
+    'qt_objects': (20, 0.0),
+    'tick_ms': (2.0, 0.5),
+}
+
+
+class SimulatedClock:
+    """Stands in for the time module where the monitor reads the wall clock"""
+
+    def __init__(self, start=None):
+        self.now = time.time() if start is None else start
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def time(self):
+        return self.now
+
+    def __getattr__(self, name):
+        # monotonic(), perf_counter(), sleep() etc. stay real
+        return getattr(time, name)
+
+
+def create_backend(steam_path, app_count, concurrent, seed):
+    """Fake platform backend with churning downloads (imported late, after the Qt platform is set)"""
+    from src.steamdown.platforms.base import PlatformBackend
+    from src.steamdown.utils.snapshot import AppDownloadState, intern_state
+
+    class SoakBackend(PlatformBackend):
+        name = "soak"
+
+        def __init__(self):
+            self.rng = random.Random(seed)
+            self.names = {str(app_id): f"Soak Game {app_id}" for app_id in range(10, 10 * (app_count + 1), 10)}
+            self.app_ids = list(self.names)
+            # app id -> [bytes_total, bytes_downloaded, rate, paused]
+            self.downloads = {}
+            self.finished = 0
+            self._states = {}
+            self._lock = threading.Lock()
+
+        def step(self, seconds):
+            """Advance every download by `seconds` of simulated time"""
+            rng = self.rng
+            with self._lock:
+                while len(self.downloads) < concurrent:
+                    app_id = rng.choice(self.app_ids)
+                    if app_id not in self.downloads:
+                        self.downloads[app_id] = [rng.randint(100, 50000) * 1024 * 1024, 0,
+                                                  rng.randint(1, 50) * 1024 * 1024, False]
+                for app_id, download in list(self.downloads.items()):
+                    roll = rng.random()
+                    if roll < 0.005:
+                        download[3] = not download[3]        # pause / resume
+                    elif roll < 0.01:
+                        download[2] = 0                      # stall
+                    elif roll < 0.05:
+                        download[2] = rng.randint(1, 50) * 1024 * 1024
+                    if not download[3]:
+                        download[1] = min(download[0], download[1] + download[2] * seconds)
+                    if download[1] >= download[0] or roll > 0.9995:
+                        # Finished, or removed from the queue
+                        del self.downloads[app_id]
+                        self.finished += 1
+
+        def get_steam_path(self):
+            return steam_path
+
+        def get_downloads(self, library_folders):
+            with self._lock:
+                active = [intern_state(self._states, AppDownloadState(
+                    app_id, self.names[app_id], total, done, 0 if paused else rate, paused))
+                    for app_id, (total, done, rate, paused) in self.downloads.items()]
+                for app_id in list(self._states):
+                    if app_id not in self.downloads:
+                        del self._states[app_id]
+            return active
+
+        def get_idle_time(self):
+            return 3600.0
+
+        def power_command(self, action):
+            # Only ever handed to the DryRunExecutor
+            return ["soak-power", action]
+
+    return SoakBackend()
+
+
+def open_handles(process):
+    """Open file descriptors (POSIX) or handles (Windows) of the process"""
+    return process.num_handles() if sys.platform == "win32" else process.num_fds()
+
+
+def find_trends(samples):
+    """Metrics whose last third (after warm-up) grew past tolerance over the first third"""
+    samples = samples[int(len(samples) * WARMUP_SHARE):]
+    third = len(samples) // 3
+    if third < 2:
+        return {}
+    trends = {}
+    for metric, (absolute, relative) in TOLERANCES.items():
+        first = statistics.median(sample[metric] for sample in samples[:third])
+        last = statistics.median(sample[metric] for sample in samples[-third:])
+        if last > first * (1 + relative) + absolute:
+            trends[metric] = (first, last)
+    return trends
+
+
+def run(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    workdir = tempfile.mkdtemp(prefix="steamdown-soak-")
+    # Keep settings, history and caches out of the user's data folder
+    os.environ["XDG_CACHE_HOME"] = os.environ["LOCALAPPDATA"] = workdir
+    steam_path = os.path.join(workdir, "Steam")
+    os.makedirs(os.path.join(steam_path, "steamapps"))
+
+    import psutil
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject
+    from src.steamdown.platforms.base import set_backend
+    from src.steamdown.utils import system, shutdown
+    from src.steamdown.utils.executors import DryRunExecutor, set_default_executor
+    from src.steamdown.components import main_window
+
+    backend = create_backend(steam_path, args.apps, args.concurrent, args.seed)
+    set_backend(backend)
+    # The fake Steam has no processes; never let the shutdown path reach a real one
+    system.find_steam_processes = shutdown.find_steam_processes = lambda: []
+    # Power actions and Steam shutdown requests are recorded, not run
+    executor = DryRunExecutor()
+    set_default_executor(executor)
+    clock = SimulatedClock()
+    main_window.time = clock
+
+    app = QApplication(sys.argv[:1])
+    window = main_window.MainWindow()
+    window.show()
+    # Ticks are driven below as fast as they run, not by the window's timer
+    window.timer.stop()
+    window.enable_check.setChecked(True)
+    actions = []
+    window.action_pipeline.finished.connect(lambda success, latency: actions.append(success))
+
+    def finish_action():
+        """Let a running action pipeline finish, then re-arm the monitor"""
+        deadline = time.perf_counter() + ACTION_TIMEOUT
+        while window.shutdown_in_progress and time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.001)
+        if window.shutdown_in_progress:
+            raise RuntimeError(f"action did not finish within {ACTION_TIMEOUT}s")
+        if window.steam_closed:
+            # A performed action stops monitoring until SteamDown is toggled
+            window.enable_check.setChecked(False)
+            window.enable_check.setChecked(True)
+        executor.commands.clear()
+
+    process = psutil.Process()
+    report = sys.stdout
+    if not args.verbose:
+        # The app's own logging still goes through print, just not to the terminal
+        sys.stdout = open(os.devnull, "w")
+
+    ticks = int(args.hours * 3600 / args.step)
+    samples = []
+    latencies = []
+    started = time.perf_counter()
+    print(f"Soaking {ticks} ticks ({args.hours}h simulated, {args.apps} apps)...", file=report)
+    try:
+        for tick in range(1, ticks + 1):
+            clock.advance(args.step)
+            backend.step(args.step)
+            tick_start = time.perf_counter()
+            window.monitor_downloads()
+            app.processEvents()
+            latencies.append((time.perf_counter() - tick_start) * 1000)
+            if window.shutdown_in_progress or window.steam_closed:
+                finish_action()
+
+            if tick % UI_CHURN_EVERY == 0:
+                window.switch_to_settings()
+                app.processEvents()
+                window.settings_screen.stall_spin.setValue(600 + tick // UI_CHURN_EVERY % 2)
+                window.settings_screen.flush()
+                window.switch_to_main()
+            if tick % ACTION_EVERY == 0:
+                window.action_combo.setCurrentText(ACTIONS[tick // ACTION_EVERY % len(ACTIONS)])
+                window.perform_action()
+                finish_action()
+
+            if tick % SAMPLE_EVERY == 0:
+                gc.collect()
+                sample = {
+                    'tick': tick,
+                    'simulated_h': tick * args.step / 3600,
+                    'rss_mb': process.memory_info().rss / (1024 * 1024),
+                    'handles': open_handles(process),
+                    'threads': threading.active_count(),
+                    'qt_objects': len(window.findChildren(QObject)),
+                    'tick_ms': statistics.median(latencies),
+                    'tick_p95_ms': sorted(latencies)[int(len(latencies) * 0.95)],
+                    'downloads': len(backend.downloads),
+                }
+                latencies = []
+                samples.append(sample)
+                if tick % (SAMPLE_EVERY * 20) == 0:
+                    print(f"  {sample['simulated_h']:6.1f}h  rss {sample['rss_mb']:.1f}MB  "
+                          f"handles {sample['handles']}  threads {sample['threads']}  "
+                          f"qt objects {sample['qt_objects']}  tick {sample['tick_ms']:.2f}ms "
+                          f"(p95 {sample['tick_p95_ms']:.2f}ms)", file=report)
+    finally:
+        if sys.stdout is not report:
+            sys.stdout.close()
+            sys.stdout = report
+        window.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.csv and samples:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(samples[0]))
+            writer.writeheader()
+            writer.writerows(samples)
+        print(f"Wrote {args.csv}")
+
+    print(f"Ran {ticks} ticks in {time.perf_counter() - started:.0f}s, "
+          f"{backend.finished} downloads finished, {len(actions)} actions performed "
+          f"({actions.count(False)} failed)")
+    trends = find_trends(samples)
+    for metric, (first, last) in trends.items():
+        print(f"FAIL: {metric} grew from {first:.2f} to {last:.2f}")
+    if not trends:
+        print("PASS: no upward trends")
+    return 1 if trends else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test SteamDown under simulated download churn")
+    parser.add_argument("--hours", type=float, default=DEFAULT_HOURS, help="Simulated hours to run")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="Simulated seconds per tick")
+    parser.add_argument("--apps", type=int, default=DEFAULT_APPS, help="Installed apps in the fake library")
+    parser.add_argument("--concurrent", type=int, default=DEFAULT_CONCURRENT, help="Downloads queued at once")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the download churn")
+    parser.add_argument("--csv", help="Write the samples to this CSV file")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own output")
+    args = parser.parse_args()
+    exit_code = run(args)
+    sys.stdout.flush()
+    # Skip interpreter teardown of the Qt objects; the verdict is already in
+    os._exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,21 @@
-from .components.main_window import MainWindow
-from .themes.theme_manager import ThemeManager
-from .utils.system import resource_path, get_steam_path, close_steam_async
+__version__ = "1.0.0"
 
-__version__ = "1.0.0" 
\ No newline at end of file
+# Exports are loaded lazily so lightweight entry points (e.g. the single-instance
+# hand-off) can import from this package without pulling in Qt
+_EXPORTS = {
+    "MainWindow": ".components.main_window",
+    "ThemeManager": ".themes.theme_manager",
+    "resource_path": ".utils.system",
+    "get_steam_path": ".utils.system",
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
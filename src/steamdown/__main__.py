@@ -1,12 +1,34 @@
+import os
 import sys
-from PySide6.QtWidgets import QApplication
-from . import MainWindow
+from .utils.single_instance import acquire_or_hand_off
+
+# Set by build.py --measure: quit as soon as the window is up, without touching
+# the single-instance lock
+STARTUP_PROBE_ENV = "STEAMDOWN_STARTUP_PROBE"
 
 def main():
+    probe = bool(os.environ.get(STARTUP_PROBE_ENV))
+    
+    # Hand off to a running instance before loading any of the GUI stack
+    guard = None if probe else acquire_or_hand_off(sys.argv[1:])
+    if guard is None and not probe:
+        sys.exit(0)
+    
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+    from .components.main_window import MainWindow
+    
     app = QApplication(sys.argv)
     window = MainWindow()
+    if guard is not None:
+        guard.serve(window.instance_message.emit)
     window.show()
-    sys.exit(app.exec())
+    if probe:
+        QTimer.singleShot(0, app.quit)
+    exit_code = app.exec()
+    if guard is not None:
+        guard.close()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
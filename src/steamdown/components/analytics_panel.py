@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QPlainTextEdit
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QFontDatabase
+
+# Shared worker for building reports, so a long history doesn't freeze the UI
+_report_executor = None
+
+
+def get_report_executor():
+    """Get the single-worker executor that builds analytics reports"""
+    global _report_executor
+    if _report_executor is None:
+        _report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="steamdown-analytics")
+    return _report_executor
+
+
+class AnalyticsPanel(QWidget):
+    """Settings page panel showing the download history report.
+
+    The report is built on a worker thread and delivered through report_ready.
+    """
+
+    report_ready = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._future = None
+        self.report_ready.connect(self.on_report_ready)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.refresh_button = QPushButton("Analyse download history")
+        self.refresh_button.setObjectName("AnalyticsButton")
+        self.refresh_button.clicked.connect(self.refresh)
+        layout.addWidget(self.refresh_button)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setObjectName("AnalyticsReport")
+        self.report_view.setReadOnly(True)
+        self.report_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.report_view.hide()
+        layout.addWidget(self.report_view)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Start the analysis in the background"""
+        if self._future is not None and not self._future.done():
+            return
+        self.refresh_button.setEnabled(False)
+        self.show_report("Analysing download history...")
+        self._future = get_report_executor().submit(self.build_report)
+
+    def build_report(self):
+        """Run the analysis (on the worker) and hand the text to the UI thread"""
+        try:
+            # numpy is only needed here, so don't load it with the rest of the UI
+            from ..utils.analytics import generate_report
+            report, elapsed = generate_report()
+            text = f"{report}\n\nAnalysed in {elapsed * 1000:.0f} ms"
+        except ImportError as e:
+            text = f"Download analytics need numpy: {e}"
+        except Exception as e:
+            text = f"Error analysing download history: {e}"
+        try:
+            self.report_ready.emit(text)
+        except RuntimeError:
+            # The panel was deleted meanwhile (e.g. rebuilt by hot reload)
+            pass
+
+    def on_report_ready(self, text):
+        self.refresh_button.setEnabled(True)
+        self.show_report(text)
+
+    def show_report(self, text):
+        self.report_view.setPlainText(text)
+        self.report_view.show()
@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QLabel
-from PySide6.QtCore import Property, QPropertyAnimation, QEasingCurve, QSize
+from PySide6.QtCore import Property, QPropertyAnimation, QEasingCurve, QSize, QEvent
 from PySide6.QtGui import QColor
 
 class AnimatedLabel(QLabel):
@@ -33,6 +33,14 @@ class PulsingLabel(AnimatedLabel):
         # Use easing curve for smooth animation
         self.animation.setEasingCurve(QEasingCurve.InOutQuad)
         self.animation.start()
+    
+    def set_animated(self, animated):
+        """Run or stop the pulse (stopped, the label stays at its start color)"""
+        if animated and self.animation.state() != QPropertyAnimation.Running:
+            self.animation.start()
+        elif not animated and self.animation.state() != QPropertyAnimation.Stopped:
+            self.animation.stop()
+            self._set_color(self.animation.startValue())
 
     def sizeHint(self):
         # Get the font metrics to calculate proper text size
@@ -51,4 +59,33 @@ class PulsingLabel(AnimatedLabel):
         super().resizeEvent(event)
         # Ensure the widget is tall enough for the text
         if event.size().height() < self.sizeHint().height():
-            self.setMinimumHeight(self.sizeHint().height()) 
\ No newline at end of file
+            self.setMinimumHeight(self.sizeHint().height()) 
+
+
+class FixedSizeLabel(QLabel):
+    """Label for text that changes every tick (ETAs, counters) without relayouting the window.
+
+    It is sized for `template`, the widest text it will show, whenever its font
+    changes (e.g. when the stylesheet is applied). Qt doesn't re-run the layout
+    for a fixed-size widget, and setting the same text again is skipped.
+    """
+
+    def __init__(self, template, parent=None):
+        super().__init__(parent)
+        self.template = template
+        self.fit_template()
+
+    def fit_template(self):
+        margins = self.contentsMargins()
+        metrics = self.fontMetrics()
+        self.setFixedSize(metrics.horizontalAdvance(self.template) + margins.left() + margins.right(),
+                          metrics.height() + margins.top() + margins.bottom())
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self.fit_template()
+        super().changeEvent(event)
+
+    def setText(self, text):
+        if text != self.text():
+            super().setText(text)
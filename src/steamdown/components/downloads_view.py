@@ -0,0 +1,138 @@
+from PySide6.QtWidgets import (QListView, QStyledItemDelegate, QStyleOptionProgressBar,
+                               QStyle, QApplication, QAbstractItemView)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect
+from PySide6.QtGui import QColor
+
+# Custom item roles
+AppIdRole = Qt.UserRole + 1
+ProgressRole = Qt.UserRole + 2
+RateRole = Qt.UserRole + 3
+EtaRole = Qt.UserRole + 4
+
+ROW_HEIGHT = 52
+
+
+class DownloadsModel(QAbstractListModel):
+    """List model of active downloads.
+
+    Rows are (app_id, name, progress, rate_text, eta_text) tuples. update() diffs a
+    new snapshot against the current rows and only emits dataChanged for rows whose
+    displayed values changed, so an unchanged tick does no layout or paint work.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        app_id, name, progress, rate, eta = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == AppIdRole:
+            return app_id
+        if role == ProgressRole:
+            return progress
+        if role == RateRole:
+            return rate
+        if role == EtaRole:
+            return eta
+        return None
+
+    def update(self, rows):
+        """Apply a new snapshot of rows, emitting only the minimal change signals"""
+        rows = [tuple(row) for row in rows]
+        new_ids = [row[0] for row in rows]
+
+        # Remove rows that went away (bottom-up so indexes stay valid)
+        for i in range(len(self._rows) - 1, -1, -1):
+            if self._rows[i][0] not in new_ids:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+
+        current_ids = [row[0] for row in self._rows]
+        for i, row in enumerate(rows):
+            if i < len(self._rows) and self._rows[i][0] == row[0]:
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    model_index = self.index(i)
+                    self.dataChanged.emit(model_index, model_index)
+            elif row[0] not in current_ids:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self._rows.insert(i, row)
+                self.endInsertRows()
+                current_ids.insert(i, row[0])
+            else:
+                # Steam reordered the queue; rare enough to just reset
+                self.beginResetModel()
+                self._rows = rows
+                self.endResetModel()
+                return
+
+
+class DownloadDelegate(QStyledItemDelegate):
+    """Paints a download as its name, a progress bar and a rate/ETA line"""
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(4, 4, -4, -4)
+        line_height = option.fontMetrics.height()
+
+        name = index.data(Qt.DisplayRole)
+        painter.setPen(QColor("#ffffff"))
+        name_rect = QRect(rect.left(), rect.top(), rect.width(), line_height)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         option.fontMetrics.elidedText(name, Qt.ElideRight, rect.width()))
+
+        progress = index.data(ProgressRole)
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(rect.left(), name_rect.bottom() + 3, rect.width(), 8)
+        bar.minimum = 0
+        bar.maximum = 100 if progress >= 0 else 0  # Busy indicator when size is unknown
+        bar.progress = max(progress, 0)
+        bar.textVisible = False
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter, option.widget)
+
+        details = index.data(RateRole)
+        eta = index.data(EtaRole)
+        if progress >= 0:
+            details = f"{progress}% · {details}"
+        if eta:
+            details += f" · ETA {eta}"
+        painter.setPen(QColor("#cccccc"))
+        details_rect = QRect(rect.left(), bar.rect.bottom() + 3, rect.width(), line_height)
+        painter.drawText(details_rect, Qt.AlignLeft | Qt.AlignVCenter, details)
+        painter.restore()
+
+
+class DownloadsView(QListView):
+    """Read-only list of active downloads with per-row progress"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("DownloadsView")
+        self.downloads_model = DownloadsModel(self)
+        self.setModel(self.downloads_model)
+        self.setItemDelegate(DownloadDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+    def update_downloads(self, rows):
+        """Update the list from (app_id, name, progress, rate_text, eta_text) rows"""
+        self.downloads_model.update(rows)
+        self.setVisible(bool(rows))
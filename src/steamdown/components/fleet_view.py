@@ -0,0 +1,98 @@
+import sys
+import asyncio
+import threading
+
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, QTableWidget,
+                               QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, Signal
+
+from ..utils.fleet import COLUMNS, host_summary
+from ..themes.theme_manager import ThemeManager
+
+
+class FleetView(QWidget):
+    """Window listing the state of every polled SteamDown instance.
+
+    The FleetMonitor runs on its own event loop in a background thread; each round
+    of results is handed to the UI thread through the `updated` signal.
+    """
+
+    updated = Signal(list, str)
+
+    def __init__(self, monitor, interval):
+        super().__init__()
+        self.monitor = monitor
+        self.interval = interval
+        self.loop = None
+        self.task = None
+        self.setWindowTitle("SteamDown Fleet")
+        self.resize(900, 400)
+        self.setup_ui()
+        ThemeManager().apply_theme(self, "dark")
+        self.updated.connect(self.on_updated)
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel("Connecting...")
+        self.summary_label.setObjectName("DownloadsLabel")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+    def start(self):
+        """Start polling in the background"""
+        threading.Thread(target=self._run, name="steamdown-fleet", daemon=True).start()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        self.task = self.loop.create_task(self.monitor.run(self.publish, self.interval))
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    def publish(self, hosts):
+        # Called on the polling thread; only plain data crosses to the UI
+        rows = [host_summary(host) for host in hosts]
+        online = sum(host.online for host in hosts)
+        self.updated.emit(rows, f"{online}/{len(hosts)} instances reachable")
+
+    def on_updated(self, rows, summary):
+        """Refresh the table in place"""
+        self.summary_label.setText(summary)
+        if self.table.rowCount() != len(rows):
+            self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    self.table.setItem(row, column, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+
+    def closeEvent(self, event):
+        """Stop polling"""
+        if self.task is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.task.cancel)
+        super().closeEvent(event)
+
+
+def run_fleet_view(monitor, interval):
+    """Show the fleet dashboard window until it is closed"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    view = FleetView(monitor, interval)
+    view.show()
+    view.start()
+    return app.exec()
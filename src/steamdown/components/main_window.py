@@ -1,17 +1,53 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
                               QHBoxLayout, QStackedWidget, QComboBox, QCheckBox)
-from PySide6.QtCore import Qt, QTimer, QPoint
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QTimer, QPoint, Signal
 import time
+import socket
+from concurrent.futures import Future
 
-from .animated_labels import PulsingLabel, AnimatedLabel
+from .. import __version__
+from .animated_labels import PulsingLabel, AnimatedLabel, FixedSizeLabel
 from .settings import SettingsScreen
-from ..utils.system import (close_steam_async, get_steam_status, system_action, resource_path)
+from .downloads_view import DownloadsView
+from ..utils.resources import load_resources, get_pixmap
+from ..utils.shutdown import SteamShutdownOrchestrator
+from ..utils.actions import ActionPipeline, stop_steam_steps, flush_history_step, power_action_step
+from ..utils.history import DownloadHistory
+from ..utils.classifier import DownloadClassifier, ACTIVE, STALLED, PAUSED, DISK_FULL
+from ..utils.io_activity import IoActivityDetector
+from ..utils.disk_guard import DiskSpaceGuard
+from ..utils.power_policy import PowerPolicy
+from ..utils.eta import EtaEstimator, format_duration, format_rate, format_size
+from ..utils.snapshot import SteamSnapshot
+from ..utils.status_server import StatusServer
+from ..utils.command_server import CommandServer
+from ..launchers.base import LauncherPoller, create_provider
 from ..themes.theme_manager import ThemeManager
 
+# Monitor polling bounds (seconds)
+MIN_POLL_INTERVAL = 1
+MAX_POLL_INTERVAL = 30
+# Wake up this long before a predicted finish
+ETA_WAKE_LEAD = 5
+
+# Map UI text to system action
+ACTION_MAP = {
+    "Shutdown PC": "shutdown",
+    "Sleep PC": "sleep",
+    "Hibernate PC": "hibernate",
+    "Log off": "logoff"
+}
+
 class MainWindow(QWidget):
+    # Arguments passed by a second launch (emitted from the single-instance listener)
+    instance_message = Signal(list)
+    # Remote (command, args, Future), emitted from command server threads
+    remote_command = Signal(object, object, object)
+    
     def __init__(self):
         super().__init__()
+        # Icons and stylesheet images come from the compiled resources when available
+        load_resources()
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setMinimumSize(400, 500)
         self.dragging = False
@@ -24,16 +60,59 @@ class MainWindow(QWidget):
         self.below_threshold_start = None
         self.shutdown_in_progress = False
         self.system_action = 'shutdown'
+        self.action_timeout = self.inactivity_timeout
+        self.eta = EtaEstimator()
+        self.io_activity = IoActivityDetector()
+        self.history = DownloadHistory()
+        self.classifier = DownloadClassifier()
+        # Tells downloads stopped by a full library drive apart from finished ones
+        self.disk_guard = DiskSpaceGuard()
+        self.disk_guard_enabled = True
+        self.disk_shortages = []
+        # Battery and user-idle awareness (polling cost, animation, action timing)
+        self.power_policy = PowerPolicy()
+        self.action_deferred = False
+        self.stall_timeout = 600
+        self.paused_timeout = 1800
+        self.steam_status = None
+        # Apps whose downloads hold the action back (empty: any download)
+        self.watch_list = []
+        
+        # Steam plus any other enabled launchers, polled concurrently each tick
+        self.launcher_providers = {"steam": create_provider("steam", io_detector=self.io_activity)}
+        self.launchers = LauncherPoller(self.launcher_providers.values(), max_workers=3)
+        
+        # Optional read-only status endpoint for fleet dashboards
+        self.status_server = StatusServer()
+        
+        # Optional authenticated command API; commands run on the UI thread
+        self.command_server = CommandServer(self.dispatch_remote_command)
+        self.remote_command.connect(self.on_remote_command)
+        
+        # Stops Steam as steps of the action pipeline; progress comes back via a signal
+        self.steam_shutdown = SteamShutdownOrchestrator(parent=self)
+        self.steam_shutdown.progress.connect(self.on_steam_shutdown_progress)
+        
+        # Runs the selected action as a sequence of background steps
+        self.current_action = None
+        self.action_pipeline = ActionPipeline(parent=self)
+        self.action_pipeline.step_started.connect(self.on_action_step_started)
+        self.action_pipeline.step_finished.connect(self.on_action_step_finished)
+        self.action_pipeline.finished.connect(self.on_action_finished)
         
         # Initialize theme manager
         self.theme_manager = ThemeManager()
         
         # Setup UI
         self.setup_ui()
+        self.apply_saved_settings()
         
         # Apply initial theme
         self.theme_manager.apply_theme(self, "dark")
         
+        # A second launch hands its arguments to us instead of starting another monitor
+        self.instance_message.connect(self.on_instance_message)
+        
         # Start monitoring
         self.timer = QTimer()
         self.timer.timeout.connect(self.monitor_downloads)
@@ -64,6 +143,59 @@ class MainWindow(QWidget):
         
         main_layout.addWidget(self.stacked_widget)
     
+    def apply_saved_settings(self):
+        """Apply the settings loaded by the settings screen before the window is shown"""
+        saved_action = self.settings_screen.get_extra('action')
+        if saved_action and self.action_combo.findText(saved_action) >= 0:
+            self.action_combo.setCurrentText(saved_action)
+        self.action_combo.currentTextChanged.connect(self.on_action_changed)
+        self.on_settings_changed(self.settings_screen.get_current_settings())
+    
+    def rebuild_screens(self):
+        """Recreate the main and settings screens, keeping the monitor state.
+
+        Used by hot reload in debug mode after component modules were reloaded;
+        the displayed state is carried over to the new widgets.
+        """
+        on_settings = self.stacked_widget.currentWidget() is self.settings_screen
+        status_text = self.status.text()
+        downloads_text = self.downloads_label.text()
+        queue_eta_text = self.queue_eta_label.text() if self.queue_eta_label.isVisibleTo(self.main_screen) else None
+        action = self.action_combo.currentText()
+
+        # Settings go through the store so unsaved edits survive the rebuild
+        self.settings_screen.flush()
+        old_screens = (self.main_screen, self.settings_screen)
+        self.main_screen = self.create_main_screen()
+        self.settings_screen = SettingsScreen(store=self.settings_screen.store)
+        self.settings_screen.settings_changed.connect(self.on_settings_changed)
+        for index, screen in enumerate((self.main_screen, self.settings_screen)):
+            self.stacked_widget.insertWidget(index, screen)
+        for screen in old_screens:
+            self.stacked_widget.removeWidget(screen)
+            screen.deleteLater()
+
+        self.status.setText(status_text)
+        self.downloads_label.setText(downloads_text)
+        if queue_eta_text:
+            self.queue_eta_label.setText(queue_eta_text)
+            self.queue_eta_label.show()
+        if self.steam_status is not None:
+            self.downloads_view.update_downloads([self.download_row(download)
+                                                  for download in self.steam_status.downloads])
+        self.action_combo.setCurrentText(action)
+        self.action_combo.currentTextChanged.connect(self.on_action_changed)
+        self.enable_check.blockSignals(True)
+        self.enable_check.setChecked(self.enabled)
+        self.enable_check.blockSignals(False)
+        self.title.set_animated(self.power_policy.animate)
+        self.stacked_widget.setCurrentWidget(self.settings_screen if on_settings else self.main_screen)
+        self.theme_manager.apply_theme(self, self.theme_manager.current_theme)
+
+    def on_action_changed(self, action):
+        """Remember the selected action"""
+        self.settings_screen.set_extra('action', action)
+    
     def setup_title_bar(self):
         title_bar = QWidget()
         title_bar.setObjectName("TitleBar")
@@ -76,7 +208,7 @@ class MainWindow(QWidget):
         title_layout.setSpacing(10)
         
         title_icon = QLabel()
-        title_icon.setPixmap(QIcon(resource_path("assets/steam_icon.png")).pixmap(16, 16))
+        title_icon.setPixmap(get_pixmap("steam_icon.png", 16))
         title_layout.addWidget(title_icon)
         
         title_label = QLabel("SteamDown")
@@ -148,6 +280,18 @@ class MainWindow(QWidget):
         self.downloads_label.setWordWrap(True)
         status_layout.addWidget(self.downloads_label)
         
+        # Changes every tick while downloading; fixed size so it doesn't relayout the window
+        self.queue_eta_label = FixedSizeLabel("Queue ETA: 999h 59m")
+        self.queue_eta_label.setAlignment(Qt.AlignCenter)
+        self.queue_eta_label.setObjectName("QueueEtaLabel")
+        self.queue_eta_label.hide()
+        status_layout.addWidget(self.queue_eta_label, 0, Qt.AlignHCenter)
+        
+        # Per-download progress list
+        self.downloads_view = DownloadsView()
+        self.downloads_view.hide()
+        status_layout.addWidget(self.downloads_view)
+        
         status_widget.setLayout(status_layout)
         layout.addWidget(status_widget)
         
@@ -199,6 +343,26 @@ class MainWindow(QWidget):
             self.move(event.globalPos() - self.drag_position)
             event.accept()
     
+    def on_instance_message(self, args):
+        """Bring the window to the front when SteamDown is launched again"""
+        print(f"SteamDown launched again with arguments: {args}")
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+    
+    def closeEvent(self, event):
+        """Save buffered history and settings before closing"""
+        # No more ticks once the launcher workers are gone
+        self.timer.stop()
+        # Cancel a running action so no later step fires after the window is gone
+        self.action_pipeline.shutdown()
+        self.history.flush()
+        self.settings_screen.flush()
+        self.launchers.shutdown()
+        self.status_server.stop()
+        self.command_server.stop()
+        super().closeEvent(event)
+    
     def switch_to_settings(self):
         """Switch to settings screen"""
         self.settings_button.hide()
@@ -226,135 +390,417 @@ class MainWindow(QWidget):
                 new_timeout = 300
                 
             self.inactivity_timeout = new_timeout
+            self.stall_timeout = settings.get('stall_timeout', self.stall_timeout)
+            self.paused_timeout = settings.get('paused_timeout', self.paused_timeout)
+            self.disk_guard_enabled = settings.get('disk_guard_enabled', True)
+            self.power_policy.battery_saver = settings.get('battery_saver', True)
+            self.power_policy.defer_while_active = settings.get('defer_while_active', True)
+            self.title.set_animated(self.power_policy.animate)
+            self.steam_shutdown.exit_timeout = settings.get('steam_exit_timeout', self.steam_shutdown.exit_timeout)
+            self.steam_shutdown.terminate_timeout = settings.get('steam_terminate_timeout', self.steam_shutdown.terminate_timeout)
+            self.apply_launchers(settings)
+            self.watch_list = [str(app_id) for app_id in settings.get('watch_list', [])]
+            self.launchers.set_watched(self.watch_list)
+            self.apply_status_server(settings.get('status_server_enabled', False),
+                                     settings.get('status_server_port', self.status_server.port))
+            self.apply_command_server(settings.get('command_server_enabled', False),
+                                      settings.get('command_server_port', self.command_server.port))
             
-            print(f"Settings updated - Timeout: {new_timeout}s")
+            print(f"Settings updated - Timeout: {new_timeout}s, "
+                  f"stalled: {self.stall_timeout}s, paused: {self.paused_timeout}s, "
+                  f"Steam exit deadlines: {self.steam_shutdown.exit_timeout}s/{self.steam_shutdown.terminate_timeout}s")
             
         except Exception as e:
             print(f"Error updating settings: {e}")
             # Revert to default values if there's an error
             self.inactivity_timeout = 300
     
+    def apply_launchers(self, settings):
+        """Poll Steam plus the other launchers that are enabled and installed"""
+        providers = [self.launcher_providers["steam"]]
+        for name in ("epic", "gog"):
+            if not settings.get(f'{name}_enabled', True):
+                continue
+            if name not in self.launcher_providers:
+                self.launcher_providers[name] = create_provider(name)
+            if self.launcher_providers[name].is_available():
+                providers.append(self.launcher_providers[name])
+        self.launchers.set_providers(providers)
+    
+    def apply_status_server(self, enabled, port):
+        """Start, stop or move the status endpoint to match the settings"""
+        if self.status_server.is_running() and (not enabled or port != self.status_server.port):
+            self.status_server.stop()
+        self.status_server.port = port
+        if enabled and not self.status_server.is_running():
+            self.status_server.start()
+            self.publish_status()
+    
+    def apply_command_server(self, enabled, port):
+        """Start, stop or move the command API to match the settings"""
+        if self.command_server.is_running() and (not enabled or port != self.command_server.port):
+            self.command_server.stop()
+        self.command_server.port = port
+        if enabled:
+            self.command_server.start()
+    
+    def dispatch_remote_command(self, command, args):
+        """Queue a remote command for the UI thread (called on a command server thread)"""
+        future = Future()
+        self.remote_command.emit(command, args, future)
+        return future
+    
+    def on_remote_command(self, command, args, future):
+        """Run a queued remote command and complete its future"""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.run_command(command, args))
+        except Exception as e:
+            future.set_exception(e)
+    
+    def run_command(self, command, args):
+        """Execute a remote command; returns a JSON-serialisable result"""
+        print(f"Remote command: {command} {args}")
+        if command == "status":
+            return self.status_snapshot()
+        if command in ("arm", "disarm"):
+            self.enable_check.setChecked(command == "arm")
+            return {'enabled': self.enabled}
+        if command == "set_timeout":
+            spin = self.settings_screen.timeout_spin
+            value = int(args.get('value'))
+            if not spin.minimum() <= value <= spin.maximum():
+                raise ValueError(f"timeout must be between {spin.minimum()} and {spin.maximum()} seconds")
+            spin.setValue(value)
+            # Apply now rather than after the settings debounce
+            self.settings_screen.flush()
+            return {'inactivity_timeout': self.inactivity_timeout}
+        if command == "set_action":
+            action = str(args.get('value'))
+            if self.action_combo.findText(action) < 0:
+                actions = ", ".join(self.action_combo.itemText(i) for i in range(self.action_combo.count()))
+                raise ValueError(f"unknown action {action!r} (expected one of: {actions})")
+            self.action_combo.setCurrentText(action)
+            return {'action': action}
+        if command == "cancel":
+            # Restart the countdown and stop an action that is already running
+            cancelled = self.below_threshold_start is not None or self.shutdown_in_progress
+            self.below_threshold_start = None
+            self.action_pipeline.cancel()
+            if self.enabled:
+                self.status.setText("Countdown cancelled remotely")
+            return {'cancelled': cancelled}
+        if command == "perform":
+            if self.steam_closed or self.shutdown_in_progress:
+                raise RuntimeError("an action has already been performed or is in progress")
+            self.perform_action()
+            return {'action': self.current_action}
+        raise ValueError(f"unknown command {command!r}")
+    
     def on_toggle_changed(self, state):
         """Handle enable/disable toggle"""
         self.enabled = bool(state)
+        self.schedule_next_check(None)
         if not self.enabled:
+            self.action_pipeline.cancel()
             self.steam_closed = False
             self.below_threshold_start = None
             self.status.setText("Automatic actions disabled")
     
     def monitor_downloads(self):
         """Monitor Steam downloads and take action if needed"""
+        try:
+            self.apply_power_policy()
+            self.check_downloads()
+        finally:
+            self.publish_status()
+    
+    def check_downloads(self):
+        """Poll Steam once and advance the countdown"""
         try:
             if self.steam_closed:
                 return
                 
-            # Get Steam status
-            steam_status = get_steam_status()
-            if not steam_status:
+            # Get Steam status, merged with the other launchers' downloads
+            steam_status = self.launchers.poll()
+            if steam_status is None:
                 return
+            changes = steam_status.diff(self.steam_status)
+            self.steam_status = steam_status
+            if changes.added or changes.removed:
+                print(f"Downloads started: {list(changes.added)}, stopped: {list(changes.removed)}")
                 
             # Check if there are any active Steam downloads
-            active_downloads = steam_status['active_downloads']
+            active_downloads = steam_status.downloads
+            now = time.time()
+            self.eta.update(active_downloads, now)
+            self.history.record(active_downloads, now)
+            states = self.classifier.update(active_downloads, now)
+            self.check_disk_space(active_downloads, states, now)
             
-            # Update active downloads display
+            # Update active downloads display; the model only repaints rows that changed
+            self.downloads_view.update_downloads([self.download_row(download) for download in active_downloads])
+            queue_eta = None
             if active_downloads:
-                # Format download information with progress
-                download_lines = []
-                has_active_download = False
-                for download in active_downloads:
-                    try:
-                        # Create simple status line
-                        status_line = f"• {download['name']}"
-                        download_lines.append(status_line)
-                        
-                        # Download is considered active if it's in the active_downloads list
-                        # since get_steam_registry_downloads() already checks Updating/Downloading state
-                        has_active_download = True
-                    except KeyError:
-                        # If we can't get basic info, show basic info
-                        download_lines.append(f"• {download['name']} (Downloading...)")
-                        has_active_download = True
-                
-                downloads_text = "Active downloads:\n" + "\n".join(download_lines)
-                self.downloads_label.setText(downloads_text)
+                self.downloads_label.setText(f"Active downloads: {len(active_downloads)}")
+                queue_eta = self.eta.queue_eta()
+            self.show_queue_eta(queue_eta)
+            
+            if ACTIVE in states.values():
+                # Reset the timer while anything is still downloading
+                self.below_threshold_start = None
+                if self.enabled:
+                    self.status.setText("Active download detected, waiting...")
+                else:
+                    self.status.setText("Automatic actions disabled")
                 
-                # Only start timing if there's NO active download
-                if not has_active_download and self.enabled:
-                    if self.below_threshold_start is None:
-                        self.below_threshold_start = time.time()
-                        print("No active downloads detected, starting timer")
-                    
-                    # Check if we've waited long enough
-                    time_below = time.time() - self.below_threshold_start
-                    if time_below >= self.inactivity_timeout:
-                        print(f"No active downloads for {time_below:.1f} seconds, performing action")
-                        self.perform_action()
-                    else:
-                        self.status.setText(f"No active downloads. Action in: {int(self.inactivity_timeout - time_below)} seconds")
+                # Sleep until the predicted finish instead of polling every second
+                self.schedule_next_check(queue_eta)
+            elif DISK_FULL in states.values():
+                # Counting down would act with the downloads unfinished; wait for space instead
+                self.below_threshold_start = None
+                if self.enabled:
+                    shortage = self.disk_shortages[0]
+                    self.status.setText(f"Library drive full ({format_size(shortage.free)} free, "
+                                        f"{format_size(shortage.needed)} needed). Action on hold")
                 else:
-                    # Reset timer if there are active downloads
-                    self.below_threshold_start = None
-                    if self.enabled:
-                        self.status.setText("Active download detected, waiting...")
-                    else:
-                        self.status.setText("Automatic actions disabled")
-            else:
-                # No downloads at all, start timer
+                    self.status.setText("Automatic actions disabled")
+                self.schedule_next_check(None)
+            elif steam_status.io_active and not self.watch_list:
+                # The registry hasn't caught up, but Steam is writing content to disk
+                # (not attributable to an app, so ignored while watching specific apps)
+                self.below_threshold_start = None
+                self.downloads_label.setText(f"Steam is writing {format_rate(steam_status.io_write_rate)} to disk")
                 if self.enabled:
-                    if self.below_threshold_start is None:
-                        self.below_threshold_start = time.time()
-                        print("No downloads detected, starting timer")
-                    
-                    time_below = time.time() - self.below_threshold_start
-                    if time_below >= self.inactivity_timeout:
-                        print(f"No downloads for {time_below:.1f} seconds, performing action")
-                        self.perform_action()
-                    else:
-                        self.status.setText(f"No downloads. Action in: {int(self.inactivity_timeout - time_below)} seconds")
+                    self.status.setText("Download activity detected, waiting...")
                 else:
                     self.status.setText("Automatic actions disabled")
-                self.downloads_label.setText("No active downloads")
+                self.schedule_next_check(None)
+            elif active_downloads:
+                # Everything listed is stalled, paused or completed: wait out the
+                # longest timeout among their states
+                timeout = max(self.state_timeout(state) for state in states.values())
+                reason = "Downloads " + "/".join(sorted(set(states.values())))
+                self.update_countdown(now, timeout, reason)
+                self.schedule_next_check(None)
+            else:
+                # No downloads at all, start timer
+                timeout = self.eta.grace_period(self.inactivity_timeout)
+                if timeout < self.inactivity_timeout:
+                    reason = "Downloads finished. Confirming"
+                else:
+                    reason = "No downloads"
+                # Act sooner on battery; stalled or paused downloads above keep their full timeouts
+                self.update_countdown(now, self.power_policy.action_timeout(timeout), reason)
+                self.downloads_label.setText("No watched downloads" if self.watch_list else "No active downloads")
+                self.schedule_next_check(None)
             
         except Exception as e:
             print(f"Error in download monitoring: {e}")
             self.below_threshold_start = None
+            self.schedule_next_check(None)
+    
+    def show_queue_eta(self, queue_eta):
+        """Show the predicted time until the queue is done (hidden when unknown)"""
+        if queue_eta is not None:
+            self.queue_eta_label.setText(f"Queue ETA: {format_duration(queue_eta)}")
+        self.queue_eta_label.setVisible(queue_eta is not None)
+    
+    def apply_power_policy(self):
+        """Follow changes of the power source (animation; polling adapts on the next schedule)"""
+        if self.power_policy.update():
+            if self.power_policy.on_battery:
+                print(f"Running on battery ({self.power_policy.battery_percent}%)"
+                      + (", polling less often and acting sooner" if self.power_policy.saving else ""))
+            else:
+                print("Running on mains power")
+            self.title.set_animated(self.power_policy.animate)
+    
+    def check_disk_space(self, downloads, states, now):
+        """Mark stopped downloads whose library drive lacks room for them as DISK_FULL"""
+        shortages = self.disk_guard.update(downloads, now) if self.disk_guard_enabled else []
+        full = []
+        for shortage in shortages:
+            stopped = [app_id for app_id in shortage.app_ids if states.get(app_id) in (STALLED, PAUSED)]
+            for app_id in stopped:
+                states[app_id] = DISK_FULL
+                self.classifier.mark(app_id, DISK_FULL)
+            if stopped:
+                full.append(shortage)
+        if full and not self.disk_shortages:
+            for shortage in full:
+                print(f"Library drive of {shortage.library} is full: {format_size(shortage.free)} free, "
+                      f"{format_size(shortage.needed)} needed by {list(shortage.app_ids)}")
+        self.disk_shortages = full
+    
+    def state_timeout(self, state):
+        """Inactivity timeout for a download in the given state"""
+        if state == STALLED:
+            return self.stall_timeout
+        if state == PAUSED:
+            return self.paused_timeout
+        return self.inactivity_timeout
+    
+    def update_countdown(self, now, timeout, reason):
+        """Run the countdown to the action while nothing is actively downloading"""
+        if not self.enabled:
+            self.status.setText("Automatic actions disabled")
+            return
+        
+        if self.below_threshold_start is None:
+            self.below_threshold_start = now
+            self.action_deferred = False
+            print(f"{reason}, starting timer ({timeout}s)")
+        self.action_timeout = timeout
+        # Keep the idle time fresh in the background, so it is known when the action is due
+        self.power_policy.refresh_idle()
+        
+        time_below = now - self.below_threshold_start
+        if time_below >= timeout:
+            if self.power_policy.user_active():
+                # Don't shut down or close Steam under someone who is using the PC
+                if not self.action_deferred:
+                    self.action_deferred = True
+                    print(f"{reason}, action deferred while the user is active")
+                self.status.setText(f"{reason}. Action waits until the PC is idle")
+                return
+            print(f"{reason} for {time_below:.1f} seconds, performing action")
+            self.perform_action()
+        else:
+            self.status.setText(f"{reason}. Action in: {int(timeout - time_below)} seconds")
     
-    def on_steam_shutdown_complete(self, success):
-        """Handle the completion of Steam shutdown"""
-        if success:
-            self.steam_closed = True
-            self.status.setText("Steam has been closed due to low download speed")
+    def download_row(self, download):
+        """Build the downloads view row for a single download"""
+        app_id = download.app_id
+        bytes_total = download.bytes_total
+        progress = int(download.bytes_downloaded / bytes_total * 100) if bytes_total > 0 else -1
+        app_eta = self.eta.app_eta(app_id)
+        state = self.classifier.state(app_id)
+        details = format_rate(self.eta.app_rate(app_id)) if state == ACTIVE else state.capitalize()
+        return (app_id, download.name, progress, details,
+                format_duration(app_eta) if app_eta is not None and state == ACTIVE else "")
+    
+    def publish_status(self):
+        """Publish the current state to the status endpoint, if it is running"""
+        if self.status_server.is_running():
+            self.status_server.update(self.status_snapshot())
+    
+    def status_snapshot(self):
+        """Current state as a JSON-serialisable dict"""
+        steam_status = self.steam_status or SteamSnapshot()
+        downloads = []
+        for download in steam_status.downloads:
+            app_id = download.app_id
+            downloads.append({
+                'app_id': app_id,
+                'name': download.name,
+                'bytes_downloaded': download.bytes_downloaded,
+                'bytes_total': download.bytes_total,
+                'rate': self.eta.app_rate(app_id),
+                'eta': self.eta.app_eta(app_id),
+                'state': self.classifier.state(app_id),
+                'launcher': download.launcher,
+            })
+        countdown = None
+        if self.below_threshold_start is not None and not self.steam_closed:
+            countdown = max(0, self.action_timeout - (time.time() - self.below_threshold_start))
+        return {
+            'host': socket.gethostname(),
+            'version': __version__,
+            'time': time.time(),
+            'enabled': self.enabled,
+            'action': self.action_combo.currentText(),
+            'status': self.status.text(),
+            'steam_running': steam_status.running,
+            'io_write_rate': steam_status.io_write_rate,
+            'launchers': steam_status.launchers,
+            'queue_eta': self.eta.queue_eta() if downloads else None,
+            'countdown': countdown,
+            'action_done': self.steam_closed,
+            'downloads': downloads,
+            'watch_list': self.watch_list,
+            'on_battery': self.power_policy.on_battery,
+            'action_deferred': self.action_deferred,
+            'disk_full': [{'library': shortage.library, 'free': shortage.free, 'needed': shortage.needed,
+                           'app_ids': list(shortage.app_ids)} for shortage in self.disk_shortages],
+        }
+    
+    def schedule_next_check(self, eta):
+        """Set the monitor interval based on the predicted time to completion"""
+        # Poll less often on battery
+        min_interval = MIN_POLL_INTERVAL * self.power_policy.poll_scale
+        if eta is None:
+            interval = min_interval
         else:
-            self.status.setText("Failed to close Steam completely. Try closing it manually.")
+            # Wake up shortly before the predicted finish, then poll normally
+            interval = min(max(MAX_POLL_INTERVAL, min_interval), max(min_interval, eta - ETA_WAKE_LEAD))
+        interval_ms = int(interval * 1000)
+        if self.timer.interval() != interval_ms:
+            self.timer.setInterval(interval_ms)
+    
+    def on_steam_shutdown_progress(self, message):
+        """Show Steam shutdown progress"""
+        self.status.setText(message)
+    
+    def build_action_steps(self, selected_action):
+        """Build the action pipeline steps for the selected action"""
+        if selected_action == "Close Steam":
+            return stop_steam_steps(self.steam_shutdown)
+        
+        action = ACTION_MAP.get(selected_action)
+        if not action:
+            return []
+        steps = []
+        if action != "sleep":
+            # Let Steam save its state before the session ends, but power off even if it won't exit
+            steps.extend(stop_steam_steps(self.steam_shutdown, required=False))
+        steps.append(flush_history_step(self.history))
+        steps.append(power_action_step(action))
+        return steps
+    
+    def on_action_step_started(self, name):
+        """Show which action step is running"""
+        self.status.setText(f"{name}...")
+    
+    def on_action_step_finished(self, name, success, message):
+        """Report failed action steps"""
+        if not success:
+            self.status.setText(f"{name} failed: {message}" if message else f"{name} failed")
+    
+    def on_action_finished(self, success, latency):
+        """Handle the completion of the action pipeline"""
         self.shutdown_in_progress = False
+        if not success:
+            # Start the countdown over instead of retrying on the next tick
+            self.below_threshold_start = None
+            if self.current_action == "Close Steam":
+                self.status.setText("Failed to close Steam completely. Try closing it manually.")
+            return
+        
+        # Stop monitoring so the action doesn't repeat (e.g. after waking from sleep);
+        # toggling SteamDown off and on re-arms it
+        self.steam_closed = True
+        # The queue that drained is done with; start the next session's estimates fresh
+        self.eta.reset()
+        if self.current_action == "Close Steam":
+            self.status.setText("Steam has been closed after downloads finished")
+        elif self.current_action == "Shutdown PC":
+            self.status.setText("PC will shutdown in 60 seconds...")
+        else:
+            self.status.setText(f"Performed {self.current_action}")
     
     def perform_action(self):
         """Perform selected action when conditions are met"""
         if self.steam_closed or self.shutdown_in_progress:
             return
             
-        self.shutdown_in_progress = True
         selected_action = self.action_combo.currentText()
+        steps = self.build_action_steps(selected_action)
+        if not steps:
+            return
         
-        if selected_action == "Gracefully stop Steam":
-            self.status.setText("Attempting to close Steam...")
-            close_steam_async(callback=self.on_steam_shutdown_complete)
-        else:
-            # Map UI text to system action
-            action_map = {
-                "Shutdown PC": "shutdown",
-                "Sleep PC": "sleep",
-                "Hibernate PC": "hibernate",
-                "Log off": "logoff"
-            }
-            action = action_map.get(selected_action)
-            if action:
-                self.status.setText(f"Performing {selected_action}...")
-                if system_action(action):
-                    if action == "shutdown":
-                        self.status.setText("PC will shutdown in 60 seconds...")
-                    else:
-                        self.status.setText(f"Performing {selected_action}...")
-                else:
-                    self.status.setText(f"Failed to perform {selected_action}")
-            self.shutdown_in_progress = False 
\ No newline at end of file
+        self.shutdown_in_progress = True
+        self.current_action = selected_action
+        self.status.setText(f"Performing {selected_action}...")
+        self.action_pipeline.start(steps, started_at=self.below_threshold_start)
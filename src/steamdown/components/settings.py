@@ -1,15 +1,39 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSpinBox, 
-                              QFormLayout)
-from PySide6.QtCore import Signal, Qt
+                              QFormLayout, QCheckBox, QScrollArea, QFrame)
+from PySide6.QtCore import Signal, Qt, QTimer
+
+from .analytics_panel import AnalyticsPanel
+from .watch_list import WatchListPanel
+from ..utils.settings_store import SettingsStore
+from ..utils.status_server import DEFAULT_STATUS_PORT
+from ..utils.command_server import DEFAULT_COMMAND_PORT, TOKEN_FILE
+from ..utils.power_policy import USER_IDLE_THRESHOLD
+
+# Quiet period after the last edit before changes are applied and saved (ms)
+SETTINGS_DEBOUNCE_MS = 400
 
 class SettingsScreen(QWidget):
     # Signals
     settings_changed = Signal(dict)
     
-    def __init__(self):
+    def __init__(self, store=None):
         super().__init__()
+        # Values saved alongside the settings that aren't edited on this screen
+        self.extra_settings = {}
+        self.changed = False
+        
+        # Coalesce bursts of edits (e.g. holding a spin box arrow) into one update
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SETTINGS_DEBOUNCE_MS)
+        self.save_timer.timeout.connect(self.flush)
+        
         self.setup_ui()
         
+        # Load synchronously so the first frame already shows the saved values
+        self.store = store or SettingsStore()
+        self.load_settings(self.store.load())
+        
     def setup_ui(self):
         layout = QVBoxLayout()
         form = QFormLayout()
@@ -24,18 +48,188 @@ class SettingsScreen(QWidget):
         self.timeout_spin.valueChanged.connect(self.on_settings_changed)
         form.addRow("Wait time before action (sec):", self.timeout_spin)
         
+        # Timeouts for downloads that stopped without finishing
+        self.stall_spin = self.create_spin_box(1, 86400, 600)
+        form.addRow("Wait when downloads stall (sec):", self.stall_spin)
+        
+        self.paused_spin = self.create_spin_box(1, 86400, 1800)
+        form.addRow("Wait when downloads are paused (sec):", self.paused_spin)
+        
+        # Steam shutdown deadlines
+        self.steam_exit_spin = self.create_spin_box(5, 600, 30)
+        form.addRow("Wait for Steam to exit (sec):", self.steam_exit_spin)
+        
+        self.steam_terminate_spin = self.create_spin_box(1, 120, 10)
+        form.addRow("Wait before force-killing Steam (sec):", self.steam_terminate_spin)
+        
+        # Downloads stopped by a full drive aren't treated as finished
+        self.disk_guard_check = QCheckBox("Hold the action while a library drive is full")
+        self.disk_guard_check.setChecked(True)
+        self.disk_guard_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.disk_guard_check)
+        
+        # Power and presence awareness
+        self.defer_check = QCheckBox("Wait until the PC is idle before acting")
+        self.defer_check.setToolTip(f"Defer the action while the keyboard or mouse was used "
+                                    f"in the last {USER_IDLE_THRESHOLD // 60} minutes")
+        self.defer_check.setChecked(True)
+        self.defer_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.defer_check)
+        
+        self.battery_saver_check = QCheckBox("On battery, poll less often and act sooner")
+        self.battery_saver_check.setChecked(True)
+        self.battery_saver_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.battery_saver_check)
+        
+        # Other launchers whose downloads also keep the action on hold
+        self.epic_check = QCheckBox("Watch Epic Games downloads")
+        self.epic_check.setChecked(True)
+        self.epic_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.epic_check)
+        
+        self.gog_check = QCheckBox("Watch GOG Galaxy downloads")
+        self.gog_check.setChecked(True)
+        self.gog_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.gog_check)
+        
+        # Read-only status endpoint for fleet dashboards (off by default)
+        self.status_server_check = QCheckBox("Share status on the network")
+        self.status_server_check.setToolTip("Serve this instance's status at http://<host>:<port>/status")
+        self.status_server_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.status_server_check)
+        
+        self.status_port_spin = self.create_spin_box(1024, 65535, DEFAULT_STATUS_PORT)
+        form.addRow("Status port:", self.status_port_spin)
+        
+        # Authenticated remote control (off by default)
+        self.command_server_check = QCheckBox("Accept remote commands")
+        self.command_server_check.setToolTip(f"Controllers authenticate with the token in the "
+                                             f"'{TOKEN_FILE}' file of the SteamDown data folder")
+        self.command_server_check.stateChanged.connect(self.on_settings_changed)
+        form.addRow(self.command_server_check)
+        
+        self.command_port_spin = self.create_spin_box(1024, 65535, DEFAULT_COMMAND_PORT)
+        form.addRow("Command port:", self.command_port_spin)
+        
         layout.addLayout(form)
-        self.setLayout(layout)
+        
+        # Apps to wait for instead of every download
+        self.watch_list = WatchListPanel()
+        self.watch_list.changed.connect(self.on_settings_changed)
+        layout.addWidget(self.watch_list)
+        
+        # Download history analytics
+        self.analytics_panel = AnalyticsPanel()
+        layout.addWidget(self.analytics_panel)
+        
+        # The rows and panels don't fit the fixed-size window, so they scroll vertically
+        content = QWidget()
+        content.setObjectName("SettingsContent")
+        content.setLayout(layout)
+        scroll_area = QScrollArea()
+        scroll_area.setObjectName("SettingsScroll")
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameShape(QFrame.NoFrame)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        scroll_area.setWidget(content)
+        
+        outer_layout = QVBoxLayout()
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.addWidget(scroll_area)
+        self.setLayout(outer_layout)
     
-    def on_settings_changed(self, *args):
-        """Emit settings changed signal with current values"""
-        settings = {
-            'inactivity_timeout': self.timeout_spin.value()
+    def create_spin_box(self, minimum, maximum, value):
+        """Create a spin box styled like the timeout spin box"""
+        spin = QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setValue(value)
+        spin.setButtonSymbols(QSpinBox.UpDownArrows)
+        spin.setFocusPolicy(Qt.StrongFocus)
+        spin.setAttribute(Qt.WA_MacShowFocusRect, False)
+        spin.valueChanged.connect(self.on_settings_changed)
+        return spin
+    
+    def setting_widgets(self):
+        """Map of setting keys to the widgets that edit them"""
+        return {
+            'inactivity_timeout': self.timeout_spin,
+            'stall_timeout': self.stall_spin,
+            'paused_timeout': self.paused_spin,
+            'steam_exit_timeout': self.steam_exit_spin,
+            'steam_terminate_timeout': self.steam_terminate_spin,
+            'disk_guard_enabled': self.disk_guard_check,
+            'defer_while_active': self.defer_check,
+            'battery_saver': self.battery_saver_check,
+            'epic_enabled': self.epic_check,
+            'gog_enabled': self.gog_check,
+            'status_server_enabled': self.status_server_check,
+            'status_server_port': self.status_port_spin,
+            'command_server_enabled': self.command_server_check,
+            'command_server_port': self.command_port_spin,
+            'watch_list': self.watch_list
         }
-        self.settings_changed.emit(settings)
+    
+    def load_settings(self, settings):
+        """Show saved settings without emitting change notifications"""
+        widgets = self.setting_widgets()
+        for key, value in settings.items():
+            widget = widgets.get(key)
+            if widget is None:
+                self.extra_settings[key] = value
+                continue
+            widget.blockSignals(True)
+            try:
+                if isinstance(widget, QCheckBox):
+                    widget.setChecked(bool(value))
+                elif isinstance(widget, WatchListPanel):
+                    widget.set_app_ids(value)
+                else:
+                    widget.setValue(int(value))
+            except (TypeError, ValueError):
+                print(f"Ignoring invalid saved setting {key}={value!r}")
+            finally:
+                widget.blockSignals(False)
+    
+    def get_extra(self, key, default=None):
+        """Saved value of a setting edited outside this screen"""
+        return self.extra_settings.get(key, default)
+    
+    def set_extra(self, key, value):
+        """Remember a setting edited outside this screen (saved with the next write)"""
+        if self.extra_settings.get(key) != value:
+            self.extra_settings[key] = value
+            self.save_timer.start()
+    
+    def on_settings_changed(self, *args):
+        """Restart the debounce timer; the change is applied once edits settle"""
+        self.changed = True
+        self.save_timer.start()
+    
+    def flush(self):
+        """Emit pending changes now and save everything to disk"""
+        self.save_timer.stop()
+        settings = self.get_current_settings()
+        if self.changed:
+            self.changed = False
+            self.settings_changed.emit(settings)
+        self.store.save({**self.extra_settings, **settings})
     
     def get_current_settings(self):
         """Get current settings as dictionary"""
         return {
-            'inactivity_timeout': self.timeout_spin.value()
+            'inactivity_timeout': self.timeout_spin.value(),
+            'stall_timeout': self.stall_spin.value(),
+            'paused_timeout': self.paused_spin.value(),
+            'steam_exit_timeout': self.steam_exit_spin.value(),
+            'steam_terminate_timeout': self.steam_terminate_spin.value(),
+            'disk_guard_enabled': self.disk_guard_check.isChecked(),
+            'defer_while_active': self.defer_check.isChecked(),
+            'battery_saver': self.battery_saver_check.isChecked(),
+            'epic_enabled': self.epic_check.isChecked(),
+            'gog_enabled': self.gog_check.isChecked(),
+            'status_server_enabled': self.status_server_check.isChecked(),
+            'status_server_port': self.status_port_spin.value(),
+            'command_server_enabled': self.command_server_check.isChecked(),
+            'command_server_port': self.command_port_spin.value(),
+            'watch_list': self.watch_list.app_ids()
         } 
\ No newline at end of file
@@ -0,0 +1,110 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Signal, Qt
+
+from ..utils.app_index import get_app_index
+
+
+class WatchListPanel(QWidget):
+    """Settings page panel for picking the apps whose downloads SteamDown waits for.
+
+    Typing searches the installed apps by name or id; activating a result adds
+    it to the list, activating a watched app (or pressing Delete) removes it.
+    An empty list waits for every download.
+    """
+
+    changed = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.index = get_app_index()
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        layout.addWidget(QLabel("Only wait for these apps (empty waits for all downloads):"))
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("WatchSearch")
+        self.search_edit.setPlaceholderText("Search installed games...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.search)
+        self.search_edit.returnPressed.connect(self.add_first_result)
+        layout.addWidget(self.search_edit)
+
+        self.results_list = QListWidget()
+        self.results_list.setObjectName("WatchResults")
+        self.results_list.itemActivated.connect(self.add_item)
+        self.results_list.hide()
+        layout.addWidget(self.results_list)
+
+        self.watched_list = QListWidget()
+        self.watched_list.setObjectName("WatchedApps")
+        self.watched_list.setToolTip("Double-click or press Delete to stop watching")
+        self.watched_list.itemActivated.connect(self.remove_item)
+        self.watched_list.installEventFilter(self)
+        layout.addWidget(self.watched_list)
+
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        # Pick up games installed or removed since the page was last shown
+        if self.index.refresh():
+            for row in range(self.watched_list.count()):
+                item = self.watched_list.item(row)
+                item.setText(self.label(item.data(Qt.UserRole)))
+            self.search(self.search_edit.text())
+        super().showEvent(event)
+
+    def eventFilter(self, obj, event):
+        if (obj is self.watched_list and event.type() == event.Type.KeyPress
+                and event.key() == Qt.Key_Delete and self.watched_list.currentItem()):
+            self.remove_item(self.watched_list.currentItem())
+            return True
+        return super().eventFilter(obj, event)
+
+    def app_ids(self):
+        """Watched app ids, in the order they were added"""
+        return [self.watched_list.item(row).data(Qt.UserRole) for row in range(self.watched_list.count())]
+
+    def set_app_ids(self, app_ids):
+        """Show a saved watch list (without emitting changed)"""
+        self.watched_list.clear()
+        for app_id in app_ids:
+            self._add_watched(str(app_id))
+
+    def label(self, app_id):
+        return f"{self.index.name(app_id) or f'Game {app_id}'} ({app_id})"
+
+    def _add_watched(self, app_id):
+        item = QListWidgetItem(self.label(app_id))
+        item.setData(Qt.UserRole, app_id)
+        self.watched_list.addItem(item)
+
+    def search(self, text):
+        """List the installed apps matching the search text"""
+        self.results_list.clear()
+        watched = set(self.app_ids())
+        for app_id, _ in self.index.search(text):
+            if app_id in watched:
+                continue
+            item = QListWidgetItem(self.label(app_id))
+            item.setData(Qt.UserRole, app_id)
+            self.results_list.addItem(item)
+        self.results_list.setVisible(self.results_list.count() > 0)
+
+    def add_first_result(self):
+        if self.results_list.count():
+            self.add_item(self.results_list.item(0))
+
+    def add_item(self, item):
+        """Start watching the app of a search result"""
+        self._add_watched(item.data(Qt.UserRole))
+        self.search_edit.clear()
+        self.changed.emit()
+
+    def remove_item(self, item):
+        """Stop watching an app"""
+        self.watched_list.takeItem(self.watched_list.row(item))
+        self.changed.emit()
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.snapshot import SteamSnapshot
+
+# How long a tick waits for each provider before using its previous result (seconds)
+DEFAULT_TIME_BUDGET = 0.3
+
+
+class LauncherProvider:
+    """A game launcher whose downloads SteamDown watches.
+
+    poll() runs on a worker thread and returns a SteamSnapshot of the launcher
+    (running flag and AppDownloadState downloads; the I/O fields only apply to
+    Steam). App ids of launchers other than Steam are prefixed with the launcher
+    name so they never collide with Steam app ids.
+    """
+
+    name = "launcher"
+    display_name = "Launcher"
+    time_budget = DEFAULT_TIME_BUDGET
+    # App ids the user watches (None watches everything); providers that can
+    # look up single apps use it, the poller filters the others' results
+    watched = None
+
+    def is_available(self):
+        """Whether the launcher is installed on this machine"""
+        return False
+
+    def poll(self):
+        """Get the launcher's current status"""
+        return SteamSnapshot()
+
+
+def create_provider(name, **kwargs):
+    """Instantiate a provider by name, importing only its module.
+
+    The imports are spelled out so PyInstaller can see them.
+    """
+    if name == "steam":
+        from .steam import SteamProvider
+        return SteamProvider(**kwargs)
+    if name == "epic":
+        from .epic import EpicProvider
+        return EpicProvider(**kwargs)
+    if name == "gog":
+        from .gog import GogProvider
+        return GogProvider(**kwargs)
+    raise KeyError(name)
+
+
+class LauncherPoller:
+    """Polls every enabled launcher concurrently and merges their downloads.
+
+    Each tick submits a poll for every provider that isn't still busy with the
+    previous one, then waits for each only until its time budget runs out. A
+    provider that misses its budget contributes its last result and is not
+    polled again until the slow call returns, so one stuck launcher never delays
+    the tick or piles up work.
+    """
+
+    def __init__(self, providers, max_workers=None):
+        self.providers = list(providers)
+        self.watched = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(self.providers)),
+                                            thread_name_prefix="steamdown-launcher")
+        self._pending = {}
+        self._results = {}
+        self._late = set()
+
+    def set_providers(self, providers):
+        """Replace the polled providers (e.g. after a settings change)"""
+        self.providers = list(providers)
+        for provider in self.providers:
+            provider.watched = self.watched
+        names = {provider.name for provider in self.providers}
+        for name in list(self._results):
+            if name not in names:
+                del self._results[name]
+
+    def set_watched(self, app_ids):
+        """Only report downloads of these app ids (empty or None reports all)"""
+        self.watched = tuple(sorted(set(app_ids))) if app_ids else None
+        for provider in self.providers:
+            provider.watched = self.watched
+
+    def poll(self):
+        """Poll all providers and return the merged status.
+
+        The result is Steam's snapshot with the other launchers' downloads appended
+        and `launchers` set to per-launcher summaries ({'running', 'downloads',
+        'stale'}). Returns None while Steam's status is unknown.
+        """
+        start = time.monotonic()
+        for provider in self.providers:
+            if provider.name not in self._pending:
+                self._pending[provider.name] = self._executor.submit(provider.poll)
+
+        statuses = {}
+        for provider in sorted(self.providers, key=lambda p: p.time_budget):
+            future = self._pending[provider.name]
+            # A provider already past its budget gets no more waiting this tick
+            budget = 0 if provider.name in self._late else provider.time_budget
+            try:
+                result = future.result(timeout=max(0, start + budget - time.monotonic()))
+            except Exception as e:
+                if not future.done():
+                    # Still running; reuse what it reported last time
+                    if provider.name not in self._late:
+                        self._late.add(provider.name)
+                        print(f"{provider.display_name} took longer than {provider.time_budget}s, "
+                              f"using its previous status")
+                    statuses[provider.name] = (self._results.get(provider.name), True)
+                    continue
+                print(f"Error polling {provider.display_name}: {e}")
+                result = None
+            del self._pending[provider.name]
+            self._late.discard(provider.name)
+            self._results[provider.name] = result
+            statuses[provider.name] = (result, False)
+        return self.merge(statuses)
+
+    def merge(self, statuses):
+        """Combine provider results; Steam's status forms the base"""
+        steam, _ = statuses.get("steam", (None, False))
+        if "steam" in statuses and steam is None:
+            # Steam's state is unknown this tick (error, or no result yet)
+            return None
+        base = steam or SteamSnapshot()
+        downloads = list(base.downloads)
+        launchers = {}
+        for name, (result, stale) in statuses.items():
+            if name != "steam" and result:
+                downloads.extend(result.downloads)
+            launchers[name] = {
+                'running': bool(result and result.running),
+                'downloads': len(result.downloads) if result else 0,
+                'stale': stale,
+            }
+        if self.watched is not None:
+            # A stale Steam result may predate the watch list; other launchers aren't filtered at the source
+            watched = set(self.watched)
+            downloads = [state for state in downloads if state.app_id in watched]
+        return base.replace(downloads=downloads, launchers=launchers)
+
+    def shutdown(self):
+        """Stop the worker threads without waiting for running polls"""
+        self._executor.shutdown(wait=False)
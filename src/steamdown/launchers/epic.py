@@ -0,0 +1,126 @@
+import os
+import glob
+import json
+import time
+
+from .base import LauncherProvider
+from ..utils.snapshot import AppDownloadState, SteamSnapshot, intern_state
+
+# Staged bytes are measured by walking the staging folder; do it at most this often (seconds)
+SIZE_REFRESH_INTERVAL = 10
+# Where the launcher stages downloaded chunks when the manifest doesn't say
+STAGING_SUBDIR = os.path.join(".egstore", "bps")
+
+
+def get_manifests_dir():
+    """Epic Games Launcher's install manifest directory"""
+    program_data = os.environ.get("PROGRAMDATA", r"C:\ProgramData")
+    return os.path.join(program_data, "Epic", "EpicGamesLauncher", "Data", "Manifests")
+
+
+def directory_size(path):
+    """Total size of the files below path (0 if it doesn't exist)"""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+class EpicProvider(LauncherProvider):
+    """Epic Games Launcher: every installed game has a JSON .item manifest.
+
+    A manifest flagged bIsIncompleteInstall is a download in progress (a new
+    install or an update). The manifests carry no download progress, and an
+    updating game's install folder is already close to its InstallSize, so the
+    folder's size says nothing about how far the download is. Downloads are
+    reported with an unknown total (bytes_total 0), which the classifier keeps
+    ACTIVE until the launcher clears the flag. bytes_downloaded is the size of
+    the staging folder, so the ETA estimator can still show a rate.
+    """
+
+    name = "epic"
+    display_name = "Epic Games"
+
+    def __init__(self, manifests_dir=None):
+        self.manifests_dir = manifests_dir or get_manifests_dir()
+        # manifest path -> (mtime_ns, parsed manifest)
+        self._manifests = {}
+        # staging folder -> (measured at, size)
+        self._sizes = {}
+        # app id -> last AppDownloadState, reused while unchanged
+        self._states = {}
+
+    def is_available(self):
+        return os.path.isdir(self.manifests_dir)
+
+    def _read_manifest(self, path):
+        """Parse a manifest, reusing the previous result if it hasn't changed"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._manifests.pop(path, None)
+            return None
+        cached = self._manifests.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading Epic manifest {path}: {e}")
+            manifest = None
+        self._manifests[path] = (mtime_ns, manifest)
+        return manifest
+
+    def _staged_size(self, staging):
+        """Current size of a staging folder, re-measured every SIZE_REFRESH_INTERVAL"""
+        now = time.monotonic()
+        cached = self._sizes.get(staging)
+        if cached and now - cached[0] < SIZE_REFRESH_INTERVAL:
+            return cached[1]
+        size = directory_size(staging)
+        self._sizes[staging] = (now, size)
+        return size
+
+    def poll(self):
+        downloads = []
+        staging_folders = set()
+        for path in glob.glob(os.path.join(self.manifests_dir, "*.item")):
+            manifest = self._read_manifest(path)
+            if not manifest or not manifest.get("bIsIncompleteInstall"):
+                continue
+            staging = manifest.get("StagingLocation")
+            if not staging and manifest.get("InstallLocation"):
+                staging = os.path.join(manifest["InstallLocation"], STAGING_SUBDIR)
+            if staging:
+                staging_folders.add(staging)
+            downloads.append(intern_state(self._states, AppDownloadState(
+                f"epic:{manifest.get('AppName', os.path.basename(path))}",
+                manifest.get("DisplayName") or manifest.get("AppName", "Unknown Epic game"),
+                bytes_total=0,
+                bytes_downloaded=self._staged_size(staging) if staging else 0,
+                launcher=self.name)))
+
+        # Forget folders and states of downloads that are gone
+        for staging in list(self._sizes):
+            if staging not in staging_folders:
+                del self._sizes[staging]
+        active_ids = {state.app_id for state in downloads}
+        for app_id in list(self._states):
+            if app_id not in active_ids:
+                del self._states[app_id]
+        # No process lookup: a download in progress implies the launcher is running
+        return SteamSnapshot(running=bool(downloads), downloads=downloads)
@@ -0,0 +1,121 @@
+import os
+import sqlite3
+
+from .base import LauncherProvider
+from ..utils.snapshot import AppDownloadState, SteamSnapshot, intern_state
+
+# Download tables of the Galaxy versions this was checked against:
+# (table, {field: column}); column names are matched exactly
+KNOWN_LAYOUTS = (
+    ("ProductDownloads", {
+        'id': "productId",
+        'downloaded': "bytesDownloaded",
+        'total': "totalSize",
+        'state': "state",
+    }),
+)
+# Download states that are no longer in progress
+INACTIVE_STATES = ("finished", "completed", "cancelled", "canceled")
+
+
+def get_database_path():
+    """GOG Galaxy 2.0's local state database"""
+    program_data = os.environ.get("PROGRAMDATA", r"C:\ProgramData")
+    return os.path.join(program_data, "GOG.com", "Galaxy", "storage", "galaxy-2.0.db")
+
+
+class GogProvider(LauncherProvider):
+    """GOG Galaxy 2.0, read from its SQLite database.
+
+    The schema is undocumented and changes between Galaxy versions, so only the
+    tables in KNOWN_LAYOUTS are read, and only if every column is there. Any
+    other schema disables the provider rather than misreading some other
+    table. The database is opened read-only and only briefly, never blocking
+    Galaxy's own writes.
+    """
+
+    name = "gog"
+    display_name = "GOG Galaxy"
+
+    def __init__(self, database_path=None):
+        self.database_path = database_path or get_database_path()
+        # Discovered (table, column mapping), False if the schema has nothing usable
+        self._layout = None
+        # app id -> last AppDownloadState, reused while unchanged
+        self._states = {}
+
+    def is_available(self):
+        return os.path.isfile(self.database_path)
+
+    def _connect(self):
+        uri = "file:" + self.database_path.replace("\\", "/") + "?mode=ro"
+        # Short busy timeout: a locked database just means this tick reuses old data
+        return sqlite3.connect(uri, uri=True, timeout=0.1)
+
+    def _discover(self, connection):
+        """Find a known downloads table with all of its columns"""
+        tables = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, layout in KNOWN_LAYOUTS:
+            if table not in tables:
+                continue
+            columns = {row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+            missing = set(layout.values()) - columns
+            if not missing:
+                return table, layout
+            print(f"GOG Galaxy table {table} lacks columns {sorted(missing)}")
+
+        print("GOG Galaxy database schema not recognised, GOG downloads are not watched")
+        return False
+
+    def _titles(self, connection, product_ids):
+        """Game titles by product id, if the database has them"""
+        try:
+            rows = connection.execute("SELECT productId, title FROM LimitedDetails").fetchall()
+        except sqlite3.Error:
+            return {}
+        return {str(product_id): title for product_id, title in rows if str(product_id) in product_ids}
+
+    def poll(self):
+        connection = self._connect()
+        try:
+            if self._layout is None:
+                self._layout = self._discover(connection)
+            if not self._layout:
+                return SteamSnapshot()
+            table, layout = self._layout
+            columns = list(layout.values())
+            quoted = ", ".join(f'"{column}"' for column in columns)
+            rows = connection.execute(f'SELECT {quoted} FROM "{table}"').fetchall()
+            records = [dict(zip(columns, row)) for row in rows]
+            titles = self._titles(connection, {str(record[layout['id']]) for record in records})
+        except sqlite3.Error:
+            # Rediscover next time, the schema may have changed with an update
+            self._layout = None
+            raise
+        finally:
+            connection.close()
+
+        downloads = []
+        for record in records:
+            state = str(record[layout['state']] or "").lower()
+            if state in INACTIVE_STATES:
+                continue
+            bytes_total = int(record[layout['total']] or 0)
+            bytes_downloaded = int(record[layout['downloaded']] or 0)
+            if bytes_total and bytes_downloaded >= bytes_total:
+                continue
+            product_id = str(record[layout['id']])
+            downloads.append(intern_state(self._states, AppDownloadState(
+                f"gog:{product_id}",
+                titles.get(product_id, f"GOG game {product_id}"),
+                bytes_total=bytes_total,
+                bytes_downloaded=bytes_downloaded,
+                paused=(state == "paused") if state else None,
+                launcher=self.name)))
+
+        active_ids = {state.app_id for state in downloads}
+        for app_id in list(self._states):
+            if app_id not in active_ids:
+                del self._states[app_id]
+        return SteamSnapshot(running=bool(downloads), downloads=downloads)
@@ -0,0 +1,22 @@
+from .base import LauncherProvider
+from ..utils.system import get_steam_status, get_steam_path
+
+
+class SteamProvider(LauncherProvider):
+    """Steam, through the platform backend (and disk I/O sampling if a detector is given)"""
+
+    name = "steam"
+    display_name = "Steam"
+    # Enumerating processes and reading the registry/manifests can take a while
+    time_budget = 0.5
+
+    def __init__(self, io_detector=None):
+        self.io_detector = io_detector
+        # Steam app ids to look up instead of all downloads (None watches everything)
+        self.watched = None
+
+    def is_available(self):
+        return get_steam_path() is not None
+
+    def poll(self):
+        return get_steam_status(self.io_detector, self.watched)
@@ -0,0 +1,69 @@
+import sys
+
+_backend = None
+
+
+class PlatformBackend:
+    """Platform-specific operations SteamDown relies on.
+
+    Backends locate Steam, enumerate its active downloads, provide the command that
+    asks Steam to exit and the commands for power actions, and report how long the
+    user has been idle. This base class is also
+    used on unsupported platforms, where every lookup comes back empty.
+    """
+
+    name = "unsupported"
+
+    def get_steam_path(self):
+        """Get the Steam installation directory, or None"""
+        return None
+
+    def get_downloads(self, library_folders):
+        """Get active downloads as a list of AppDownloadState"""
+        return []
+
+    def get_app_downloads(self, library_folders, app_ids):
+        """Get the active downloads among app_ids only.
+
+        Backends override this to look up just those apps instead of every
+        installed one; the default filters get_downloads().
+        """
+        app_ids = set(app_ids)
+        return [state for state in self.get_downloads(library_folders) if state.app_id in app_ids]
+
+    def steam_shutdown_command(self, steam_path):
+        """Get the command that asks a running Steam client to exit, or None"""
+        return None
+
+    def power_command(self, action):
+        """Get the command for a power action (shutdown, sleep, hibernate, logoff), or None"""
+        return None
+
+    def get_idle_time(self):
+        """Seconds since the user last used the keyboard or mouse, or None if unknown"""
+        return None
+
+
+def get_backend():
+    """Get the backend for the current platform, importing only its module.
+
+    The imports are static (not by name) so PyInstaller can see and bundle them.
+    """
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32":
+            from .windows import WindowsBackend
+            _backend = WindowsBackend()
+        elif sys.platform == "linux":
+            from .linux import LinuxBackend
+            _backend = LinuxBackend()
+        else:
+            print(f"Platform {sys.platform} is not supported, Steam monitoring is disabled")
+            _backend = PlatformBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the active backend (e.g. with a fake one for testing)"""
+    global _backend
+    _backend = backend
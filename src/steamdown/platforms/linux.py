@@ -0,0 +1,176 @@
+import os
+import glob
+import time
+import shutil
+import subprocess
+
+from .base import PlatformBackend
+from ..utils.system import read_app_manifest, get_game_name_from_appinfo
+from ..utils.snapshot import AppDownloadState, intern_state
+
+# Where the Steam client keeps its data (native, symlink, Flatpak)
+STEAM_PATHS = [
+    "~/.steam/steam",
+    "~/.local/share/Steam",
+    "~/.var/app/com.valvesoftware.Steam/.local/share/Steam",
+]
+
+# appmanifest StateFlags bits (EAppState)
+STATE_UPDATE_RUNNING = 256
+STATE_UPDATE_PAUSED = 512
+STATE_UPDATE_STARTED = 1024
+STATE_DOWNLOADING = 1048576
+STATE_ACTIVE = STATE_UPDATE_RUNNING | STATE_UPDATE_STARTED | STATE_DOWNLOADING
+
+# Idle time helpers are asked with this timeout (seconds)
+IDLE_QUERY_TIMEOUT = 1
+
+
+class LinuxBackend(PlatformBackend):
+    """Linux: downloads are read from the appmanifest files in each library"""
+
+    name = "linux"
+
+    # Power actions
+    POWER_COMMANDS = {
+        "shutdown": ["systemctl", "poweroff"],
+        "sleep": ["systemctl", "suspend"],
+        "hibernate": ["systemctl", "hibernate"],
+        "logoff": ["loginctl", "terminate-user", str(os.getuid())]
+    }
+
+    def __init__(self):
+        # manifest path -> (mtime_ns, parsed values)
+        self._manifests = {}
+        # app id -> last AppDownloadState, reused while the manifest is unchanged
+        self._states = {}
+
+    def get_steam_path(self):
+        """Get Steam data directory from the usual install locations"""
+        for path in STEAM_PATHS:
+            path = os.path.realpath(os.path.expanduser(path))
+            if os.path.isdir(os.path.join(path, "steamapps")):
+                return path
+        print("Could not find Steam installation")
+        return None
+
+    def _read_manifest(self, manifest_path):
+        """Parse a manifest, reusing the previous result if it hasn't changed"""
+        try:
+            mtime_ns = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            self._manifests.pop(manifest_path, None)
+            return None
+
+        cached = self._manifests.get(manifest_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        try:
+            values = read_app_manifest(manifest_path)
+        except OSError as e:
+            print(f"Error reading manifest {manifest_path}: {e}")
+            return None
+        self._manifests[manifest_path] = (mtime_ns, values)
+        return values
+
+    def _app_state(self, manifest_path):
+        """AppDownloadState of the manifest's app if it is downloading, else None"""
+        values = self._read_manifest(manifest_path)
+        if not values:
+            return None
+        try:
+            state_flags = int(values.get('StateFlags', 0))
+        except ValueError:
+            return None
+        if not state_flags & STATE_ACTIVE:
+            return None
+
+        app_id = values.get('appid') or os.path.basename(manifest_path)[12:-4]
+        game_name = values.get('name') or get_game_name_from_appinfo(app_id) or f"Game {app_id}"
+        return intern_state(self._states, AppDownloadState(
+            app_id, game_name,
+            bytes_total=int(values.get('BytesToDownload', 0) or 0),
+            bytes_downloaded=int(values.get('BytesDownloaded', 0) or 0),
+            # Manifests don't carry a rate; the ETA estimator fits one
+            download_rate=0,
+            paused=bool(state_flags & STATE_UPDATE_PAUSED)))
+
+    def _forget_inactive(self, active_downloads):
+        """Drop interned states of apps that stopped downloading"""
+        active_ids = {state.app_id for state in active_downloads}
+        for app_id in list(self._states):
+            if app_id not in active_ids:
+                del self._states[app_id]
+
+    def get_downloads(self, library_folders):
+        """Get active downloads from the StateFlags of every app manifest"""
+        active_downloads = []
+        seen = set()
+        for library in dict.fromkeys(os.path.realpath(l) for l in library_folders):
+            for manifest_path in glob.glob(os.path.join(library, "steamapps", "appmanifest_*.acf")):
+                seen.add(manifest_path)
+                state = self._app_state(manifest_path)
+                if state is not None:
+                    active_downloads.append(state)
+
+        # Forget manifests that were removed and apps that stopped downloading
+        for manifest_path in list(self._manifests):
+            if manifest_path not in seen:
+                del self._manifests[manifest_path]
+        self._forget_inactive(active_downloads)
+
+        if active_downloads:
+            print(f"\nFound {len(active_downloads)} active downloads")
+        return active_downloads
+
+    def get_app_downloads(self, library_folders, app_ids):
+        """Get active downloads among app_ids by reading only their manifests"""
+        active_downloads = []
+        for app_id in app_ids:
+            for library in dict.fromkeys(os.path.realpath(l) for l in library_folders):
+                manifest_path = os.path.join(library, "steamapps", f"appmanifest_{app_id}.acf")
+                state = self._app_state(manifest_path)
+                if state is not None:
+                    active_downloads.append(state)
+                    break
+        self._forget_inactive(active_downloads)
+        return active_downloads
+
+    def steam_shutdown_command(self, steam_path):
+        if shutil.which("steam"):
+            return ["steam", "-shutdown"]
+        if ".var/app/com.valvesoftware.Steam" in steam_path and shutil.which("flatpak"):
+            return ["flatpak", "run", "com.valvesoftware.Steam", "-shutdown"]
+        return None
+
+    def power_command(self, action):
+        return self.POWER_COMMANDS.get(action)
+
+    def get_idle_time(self):
+        """Idle time from xprintidle (X11), else the logind session's idle hint"""
+        if os.environ.get("DISPLAY") and shutil.which("xprintidle"):
+            try:
+                output = subprocess.run(["xprintidle"], capture_output=True, text=True,
+                                        timeout=IDLE_QUERY_TIMEOUT, check=True).stdout
+                return int(output.strip()) / 1000
+            except (OSError, subprocess.SubprocessError, ValueError):
+                pass
+        if shutil.which("loginctl"):
+            try:
+                output = subprocess.run(
+                    ["loginctl", "show-session", os.environ.get("XDG_SESSION_ID", "auto"),
+                     "-p", "IdleHint", "-p", "IdleSinceHintMonotonic"],
+                    capture_output=True, text=True, timeout=IDLE_QUERY_TIMEOUT, check=True).stdout
+                values = dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+                # Microseconds on CLOCK_MONOTONIC, like time.monotonic(); 0 if the
+                # desktop never reported idleness, in which case "no" means nothing
+                idle_since = int(values["IdleSinceHintMonotonic"])
+                if idle_since == 0:
+                    return None
+                if values.get("IdleHint") != "yes":
+                    return 0.0
+                return max(0.0, time.monotonic() - idle_since / 1e6)
+            except (OSError, subprocess.SubprocessError, ValueError, KeyError):
+                pass
+        return None
@@ -0,0 +1,180 @@
+import os
+import ctypes
+import winreg
+
+from .base import PlatformBackend
+from ..utils.system import get_game_name_from_manifest, get_game_name_from_appinfo
+from ..utils.snapshot import AppDownloadState, intern_state
+
+
+def _query_value(key, name, default=0):
+    """Read one registry value, or default if it doesn't exist"""
+    try:
+        return winreg.QueryValueEx(key, name)[0]
+    except WindowsError:
+        return default
+
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+
+class WindowsBackend(PlatformBackend):
+    """Windows: Steam is found and its downloads enumerated through the registry"""
+
+    name = "windows"
+
+    # Power actions
+    POWER_COMMANDS = {
+        "shutdown": ["shutdown", "/s", "/t", "60", "/c", "SteamDown is shutting down the PC. Save your work!"],
+        "sleep": ["rundll32.exe", "powrprof.dll,SetSuspendState", "0,1,0"],
+        "hibernate": ["shutdown", "/h"],
+        "logoff": ["shutdown", "/l"]
+    }
+
+    def __init__(self):
+        # app id -> last AppDownloadState / game name, reused while unchanged
+        self._states = {}
+        self._names = {}
+
+    def get_steam_path(self):
+        """Get Steam installation path from Windows registry"""
+        try:
+            hkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\WOW6432Node\\Valve\\Steam")
+            steam_path = winreg.QueryValueEx(hkey, "InstallPath")[0]
+            winreg.CloseKey(hkey)
+            return steam_path
+        except WindowsError:
+            try:
+                # Try non-WOW6432Node path as fallback
+                hkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\Valve\\Steam")
+                steam_path = winreg.QueryValueEx(hkey, "InstallPath")[0]
+                winreg.CloseKey(hkey)
+                return steam_path
+            except WindowsError:
+                print("Could not find Steam path in registry")
+                return None
+
+    def _open_apps_key(self):
+        """Open HKCU\\Software\\Valve\\Steam\\Apps, or None if Steam never created it"""
+        try:
+            return winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\\Valve\\Steam\\Apps")
+        except WindowsError:
+            print("Could not find Steam Apps registry key")
+            return None
+
+    def _read_app(self, hkey, app_id, library_folders):
+        """AppDownloadState of one app if it is downloading, else None"""
+        try:
+            # Opened relative to the Apps key; only the values we use are read
+            app_key = winreg.OpenKey(hkey, app_id)
+        except WindowsError:
+            return None
+        try:
+            # Check if app is being updated or downloaded
+            if _query_value(app_key, 'Updating') != 1 and _query_value(app_key, 'Downloading') != 1:
+                return None
+            
+            # Try different progress indicators
+            bytes_total = _query_value(app_key, 'SizeOnDisk', None)
+            if bytes_total is None:
+                bytes_total = _query_value(app_key, 'BytesToDownload')
+            bytes_downloaded = _query_value(app_key, 'BytesDownloaded')
+            download_rate = _query_value(app_key, 'DownloadRate')
+            
+            # Names don't change while downloading; look them up once per app
+            game_name = self._names.get(app_id)
+            if game_name is None:
+                # Try to get the game name from manifest first, then appinfo.vdf,
+                # then the registry name
+                game_name = (get_game_name_from_manifest(app_id, library_folders)
+                             or get_game_name_from_appinfo(app_id)
+                             or _query_value(app_key, 'Name', None)
+                             or f"Game {app_id}")
+                self._names[app_id] = game_name
+                print(f"\nFound active game: {game_name} (ID: {app_id})")
+            
+            return intern_state(self._states, AppDownloadState(
+                app_id, game_name, bytes_total, bytes_downloaded, download_rate))
+        except WindowsError as e:
+            if app_id in ['730', '228980', '250820']:  # Common Steam apps
+                print(f"Error reading values for {app_id}: {e}")
+            return None
+        finally:
+            winreg.CloseKey(app_key)
+
+    def _forget_inactive(self, active_downloads):
+        """Drop cached states and names of apps that are no longer downloading"""
+        active_ids = {state.app_id for state in active_downloads}
+        for app_id in list(self._states):
+            if app_id not in active_ids:
+                del self._states[app_id]
+                self._names.pop(app_id, None)
+
+    def get_downloads(self, library_folders):
+        """Get active downloads by monitoring Steam registry keys"""
+        try:
+            hkey = self._open_apps_key()
+            if hkey is None:
+                return []
+            
+            active_downloads = []
+            index = 0
+            try:
+                # Enumerate all app subkeys
+                while True:
+                    try:
+                        # Get the name of the subkey (app ID)
+                        app_id = winreg.EnumKey(hkey, index)
+                        index += 1
+                    except WindowsError:
+                        break  # No more subkeys
+                    state = self._read_app(hkey, app_id, library_folders)
+                    if state is not None:
+                        active_downloads.append(state)
+            finally:
+                winreg.CloseKey(hkey)
+            
+            self._forget_inactive(active_downloads)
+            return active_downloads
+        
+        except Exception as e:
+            print(f"Error checking Steam registry: {e}")
+            return []
+
+    def get_app_downloads(self, library_folders, app_ids):
+        """Get active downloads among app_ids by opening only their registry keys"""
+        try:
+            hkey = self._open_apps_key()
+            if hkey is None:
+                return []
+            try:
+                active_downloads = [state for state in (self._read_app(hkey, app_id, library_folders)
+                                                        for app_id in app_ids)
+                                    if state is not None]
+            finally:
+                winreg.CloseKey(hkey)
+            self._forget_inactive(active_downloads)
+            return active_downloads
+        except Exception as e:
+            print(f"Error checking Steam registry: {e}")
+            return []
+
+    def steam_shutdown_command(self, steam_path):
+        steam_exe = os.path.join(steam_path, "Steam.exe")
+        if not os.path.exists(steam_exe):
+            return None
+        return [steam_exe, "-shutdown"]
+
+    def power_command(self, action):
+        return self.POWER_COMMANDS.get(action)
+
+    def get_idle_time(self):
+        """Time since the last input event in this session (GetLastInputInfo)"""
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # Both are 32-bit tick counts that wrap around every ~49 days
+        millis = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return millis / 1000
@@ -55,6 +55,24 @@ QWidget {
     margin: 10px 0;
 }
 
+/* Active downloads */
+#DownloadsView {
+    background-color: #1a1a1a;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+}
+
+#DownloadsView QProgressBar, QProgressBar {
+    background-color: #2d2d2d;
+    border: none;
+    border-radius: 4px;
+}
+
+QProgressBar::chunk {
+    background-color: #00ff00;
+    border-radius: 4px;
+}
+
 /* Speed indicator */
 #SpeedFrame {
     background-color: #2d2d2d;
@@ -91,7 +109,7 @@ QComboBox::drop-down {
 }
 
 QComboBox::down-arrow {
-    image: url(down_arrow.png);
+    image: url(:/down_arrow.png);
 }
 
 /* Settings screen */
@@ -99,6 +117,30 @@ QComboBox::down-arrow {
     padding: 20px;
 }
 
+#SettingsScroll QScrollBar:vertical {
+    background-color: #1a1a1a;
+    width: 8px;
+    margin: 0;
+}
+
+#SettingsScroll QScrollBar::handle:vertical {
+    background-color: #3d3d3d;
+    border-radius: 4px;
+    min-height: 24px;
+}
+
+#SettingsScroll QScrollBar::handle:vertical:hover {
+    background-color: #4d4d4d;
+}
+
+#SettingsScroll QScrollBar::add-line:vertical, #SettingsScroll QScrollBar::sub-line:vertical {
+    height: 0;
+}
+
+#SettingsScroll QScrollBar::add-page:vertical, #SettingsScroll QScrollBar::sub-page:vertical {
+    background: none;
+}
+
 QSpinBox {
     background-color: #2d2d2d;
     border: 1px solid #3d3d3d;
@@ -136,6 +178,25 @@ QCheckBox::indicator:checked {
     border-radius: 3px;
 }
 
+/* Analytics */
+#AnalyticsButton {
+    background-color: #2d2d2d;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+    padding: 5px;
+}
+
+#AnalyticsButton:hover {
+    border-color: #4d4d4d;
+}
+
+#AnalyticsReport {
+    background-color: #2d2d2d;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+    font-size: 11px;
+}
+
 /* Form layout */
 QFormLayout {
     spacing: 15px;
@@ -1,14 +1,16 @@
 from PySide6.QtWidgets import QWidget
 import os
+import importlib
 
-from .styles import DARK_THEME
+from . import styles
 from ..utils.system import resource_path
+from ..utils.resources import resolve_stylesheet
 
 class ThemeManager:
     def __init__(self):
         self.current_theme = "dark"
         self.themes = {
-            "dark": DARK_THEME
+            "dark": styles.DARK_THEME
         }
         
     def load_theme(self, theme_name: str) -> str:
@@ -28,17 +30,25 @@ class ThemeManager:
             return
             
         # Apply new stylesheet
-        widget.setStyleSheet(stylesheet)
+        widget.setStyleSheet(resolve_stylesheet(stylesheet))
         
-        # Update all child widgets recursively
-        def refresh_widget_style(w):
-            w.setStyle(w.style())
+        # Update the widget and all its descendants (findChildren is already recursive)
+        for w in [widget] + widget.findChildren(QWidget):
             w.style().unpolish(w)
             w.style().polish(w)
-            w.repaint()
-            
-            for child in w.findChildren(QWidget):
-                refresh_widget_style(child)
+            # Item views overload update(index), which hides QWidget.update() in some PySide6 versions
+            QWidget.update(w)
+    
+    def reload_theme(self, widget: QWidget, stylesheet_path: str = None) -> None:
+        """Re-read the theme sources and re-apply the current theme (hot reload in debug mode).
         
-        refresh_widget_style(widget)
-        widget.repaint() 
\ No newline at end of file
+        With a stylesheet_path, that .qss file replaces the current theme's stylesheet;
+        otherwise the styles module is reloaded.
+        """
+        if stylesheet_path:
+            with open(stylesheet_path, "r", encoding="utf-8") as f:
+                self.themes[self.current_theme] = f.read()
+        else:
+            importlib.reload(styles)
+            self.themes["dark"] = styles.DARK_THEME
+        self.apply_theme(widget, self.current_theme) 
\ No newline at end of file
@@ -0,0 +1,173 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from PySide6.QtCore import QObject, Signal
+
+from .executors import get_default_executor
+from .system import system_action
+
+
+class ActionContext:
+    """State shared by the steps of one pipeline run.
+
+    cancel_event asks the running step to stop. Each step gets a fresh one, so
+    a best-effort step that timed out doesn't cancel the steps after it;
+    cancelling the run sets it for good.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.cancel_event = threading.Event()
+        self.data = {}
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """Cancel the run: the running step is asked to stop and no further steps start"""
+        self._cancelled = True
+        self.cancel_event.set()
+
+    def next_step(self):
+        """Give the next step its own cancel event"""
+        if not self._cancelled:
+            self.cancel_event = threading.Event()
+
+
+class ActionStep:
+    """A named unit of work with a timeout.
+
+    `func(context)` runs on a worker thread and returns True on success (or a
+    (success, message) tuple). Long-running steps should watch
+    context.cancel_event (read it once; the next step gets a new one). A step that isn't `required` is best effort: if it
+    fails or times out, the pipeline logs it and carries on.
+    """
+
+    def __init__(self, name, func, timeout=30, required=True):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.required = required
+
+
+def stop_steam_steps(orchestrator, required=True):
+    """Steps that request a Steam shutdown and wait for it to exit"""
+    def request(context):
+        context.data['steam_processes'] = orchestrator.request(context.executor)
+        return True
+
+    def wait(context):
+        return orchestrator.wait(context.data.get('steam_processes', []), context.cancel_event)
+
+    return [
+        ActionStep("Stop Steam", request, timeout=15, required=required),
+        ActionStep("Wait for Steam to exit", wait, timeout=orchestrator.total_timeout() + 5,
+                   required=required),
+    ]
+
+
+def flush_history_step(history):
+    """Step that writes buffered download history to disk (best effort)"""
+    def run(context):
+        return history.flush()
+
+    return ActionStep("Flush download history", run, timeout=10, required=False)
+
+
+def power_action_step(action):
+    """Step that runs a system power action (shutdown, sleep, hibernate, logoff)"""
+    def run(context):
+        return system_action(action, context.executor)
+
+    # Sleep and hibernate only return after the machine resumes
+    return ActionStep(f"Power action: {action}", run, timeout=None)
+
+
+class ActionPipeline(QObject):
+    """Runs an ordered list of ActionSteps in the background.
+
+    Each step runs on a worker with its own timeout; a failed or timed-out
+    required step, or cancelling, stops the pipeline. Results are reported through signals so
+    connected slots run on the UI thread. The time from `started_at` (when the
+    downloads finished) to the end of the last step is measured and logged.
+    """
+
+    # Signals
+    step_started = Signal(str)
+    step_finished = Signal(str, bool, str)
+    finished = Signal(bool, float)
+
+    def __init__(self, executor=None, parent=None):
+        super().__init__(parent)
+        self.executor = executor
+        self._driver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="steamdown-pipeline")
+        # Two workers so a step that overran its timeout can't block the next run
+        self._workers = ThreadPoolExecutor(max_workers=2, thread_name_prefix="steamdown-action")
+        self._context = None
+        self._future = None
+
+    def is_running(self):
+        """Whether a pipeline run is in progress"""
+        return self._future is not None and not self._future.done()
+
+    def start(self, steps, started_at=None):
+        """Start running steps; returns False if a run is already in progress"""
+        if self.is_running():
+            return False
+        self._context = ActionContext(self.executor or get_default_executor())
+        self._future = self._driver.submit(self._run, list(steps), self._context,
+                                           started_at or time.time())
+        return True
+
+    def cancel(self):
+        """Cancel the current run; the running step is asked to stop"""
+        if self._context is not None:
+            self._context.cancel()
+
+    def shutdown(self):
+        """Cancel any run and release the worker threads"""
+        self.cancel()
+        self._driver.shutdown(wait=False)
+        self._workers.shutdown(wait=False)
+
+    def _run(self, steps, context, started_at):
+        success = True
+        for step in steps:
+            if context.cancelled:
+                self.step_finished.emit(step.name, False, "Cancelled")
+                success = False
+                break
+
+            context.next_step()
+            self.step_started.emit(step.name)
+            step_start = time.time()
+            future = self._workers.submit(step.func, context)
+            try:
+                result = future.result(timeout=step.timeout)
+                ok, message = result if isinstance(result, tuple) else (bool(result), "")
+            except FutureTimeoutError:
+                # Ask the step to stop; it may keep its worker busy a while longer
+                context.cancel_event.set()
+                ok, message = False, f"Timed out after {step.timeout}s"
+            except Exception as e:
+                ok, message = False, str(e)
+
+            if context.cancelled and ok is False and not message:
+                message = "Cancelled"
+            print(f"Action step '{step.name}' {'succeeded' if ok else 'failed'} "
+                  f"in {time.time() - step_start:.2f}s {message}".rstrip())
+            self.step_finished.emit(step.name, ok, message)
+            if not ok:
+                if step.required or context.cancelled:
+                    success = False
+                    break
+                print(f"Continuing without '{step.name}'")
+
+        latency = time.time() - started_at
+        print(f"Action pipeline {'completed' if success else 'stopped'}: "
+              f"{latency:.2f}s from downloads finishing to last step")
+        self.finished.emit(success, latency)
+        return success
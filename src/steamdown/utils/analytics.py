@@ -0,0 +1,317 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from .history import COMPACT_RESOLUTION, get_history_path
+from .eta import format_duration, format_rate
+
+# Must match history.RECORD
+HISTORY_DTYPE = np.dtype([
+    ('t', '<f8'),
+    ('app_id', '<u4'),
+    ('downloaded', '<u8'),
+    ('total', '<u8'),
+    ('rate', '<f8'),
+])
+
+# A gap longer than this between samples of an app starts a new download session
+SESSION_GAP = 3600
+# Minimum length of a no-progress run to count as a stall
+MIN_STALL = 60
+PERCENTILES = (50, 90, 99)
+
+# Percentiles are read from log-spaced rate histograms: RATE_BINS bins between
+# 1 B/s and 100 GB/s, i.e. about 5% resolution, which keeps them O(n)
+RATE_BINS = 512
+RATE_LOG_MIN = 0.0
+RATE_LOG_MAX = np.log(100 * 1024 ** 3)
+
+
+def load_history(path=None):
+    """Load recorded samples and arrange them as columns grouped by app.
+
+    Returns a dict of contiguous arrays: app_ids (the distinct app ids), app (index
+    into app_ids per sample), t, downloaded and total, sorted by app and then time.
+    """
+    samples = np.fromfile(path or get_history_path(), dtype=HISTORY_DTYPE)
+    return arrange(samples)
+
+
+def arrange(samples, resolution=COMPACT_RESOLUTION):
+    """Group structured history samples by app (see load_history).
+
+    Like history compaction, only the last sample of each app per resolution seconds
+    is kept, so raw 1 Hz samples and compacted ones give the same report and months
+    of history stay cheap to analyse. A resolution of 0 keeps every sample.
+    """
+    raw_ids = samples['app_id']
+    app_ids = np.nonzero(np.bincount(raw_ids))[0] if len(raw_ids) else raw_ids[:0]
+
+    # Compact app indexes let the stable sort below run as a linear radix sort.
+    # Records are written in time order, so a stable sort keeps each app chronological.
+    lookup = np.zeros(len(app_ids) and int(app_ids[-1]) + 1, dtype=np.int64)
+    lookup[app_ids] = np.arange(len(app_ids))
+    compact = lookup[raw_ids]
+    if len(app_ids) > 1:
+        index_type = np.uint16 if len(app_ids) <= np.iinfo(np.uint16).max else np.uint32
+        order = np.argsort(compact.astype(index_type), kind='stable')
+        app = compact[order]
+        t = samples['t'][order]
+    else:
+        order = None
+        app = compact
+        t = samples['t']
+
+    if resolution and len(t):
+        # Bucket before gathering the other columns, which then only touch kept samples
+        bucket = np.floor(t / resolution)
+        last = np.concatenate(((bucket[1:] != bucket[:-1]) | (app[1:] != app[:-1]), [True]))
+        kept = np.nonzero(last)[0]
+        order = kept if order is None else order[kept]
+        app = app[kept]
+        t = t[kept]
+
+    def column(name):
+        values = samples[name] if order is None else samples[name][order]
+        return values.astype(np.float64)
+
+    return {
+        'app_ids': app_ids.astype(np.uint32),
+        'app': app,
+        't': np.ascontiguousarray(t),
+        'downloaded': column('downloaded'),
+        'total': column('total'),
+    }
+
+
+def intervals(history, session_gap=SESSION_GAP):
+    """Per-interval arrays between consecutive samples of the same download session.
+
+    Returns a dict of arrays: app (compact index), session, start, dt, delta (bytes),
+    complete (whether the interval ends with the download complete), plus
+    all_sessions, the session number of every sample.
+    """
+    t = history['t']
+    app = history['app']
+    downloaded = history['downloaded']
+
+    dt = np.diff(t)
+    delta = np.diff(downloaded)
+    same_app = app[1:] == app[:-1]
+    new_session = np.concatenate(([True], ~same_app | (dt > session_gap) | (delta < 0)))
+    session = np.cumsum(new_session) - 1
+
+    valid = ~new_session[1:] & (dt > 0)
+    total = history['total'][1:]
+    complete = (total > 0) & (downloaded[1:] >= total)
+    iv = {
+        'app': app[1:][valid],
+        'session': session[1:][valid],
+        'start': t[:-1][valid],
+        'dt': dt[valid],
+        'delta': delta[valid],
+        'complete': complete[valid],
+        'all_sessions': session,
+    }
+    # Local hours since the epoch, shared by the per-day and hour-of-day views
+    iv['hour'] = ((iv['start'] + utc_offset()) // 3600).astype(np.int64)
+
+    # Rates of the intervals that made progress, pre-binned for the percentile views
+    moving = iv['delta'] > 0
+    rates = iv['delta'][moving] / iv['dt'][moving]
+    iv['moving'] = moving
+    iv['rate_bin'] = rate_bins(rates)
+    return iv
+
+
+def rate_bins(rates):
+    """Log-spaced histogram bin of each rate (see RATE_BINS)"""
+    scale = RATE_BINS / (RATE_LOG_MAX - RATE_LOG_MIN)
+    position = (np.log(np.maximum(rates, 1.0)) - RATE_LOG_MIN) * scale
+    return np.minimum(position.astype(np.int64), RATE_BINS - 1)
+
+
+def group_percentiles(groups, group_count, bins, percentiles=PERCENTILES):
+    """Percentiles of binned rates within each group, without sorting.
+
+    groups holds a group index (0..group_count-1) and bins the rate_bins() bin of
+    each value. The per-group histograms are accumulated with one bincount and each
+    percentile is interpolated inside the bin where the cumulative count crosses it.
+    Returns an array of shape (group_count, len(percentiles)); empty groups get 0.
+    """
+    if len(bins) == 0:
+        return np.zeros((group_count, len(percentiles)))
+
+    scale = RATE_BINS / (RATE_LOG_MAX - RATE_LOG_MIN)
+    counts = np.bincount(groups * RATE_BINS + bins,
+                         minlength=group_count * RATE_BINS).reshape(group_count, RATE_BINS)
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1]
+
+    targets = totals[:, None] * (np.asarray(percentiles) / 100.0)[None, :]
+    # First bin whose cumulative count reaches each target
+    crossing = (cumulative[:, :, None] >= targets[:, None, :]).argmax(axis=1)
+    rows = np.arange(group_count)[:, None]
+    in_bin = counts[rows, crossing]
+    before = cumulative[rows, crossing] - in_bin
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(in_bin > 0, (targets - before) / in_bin, 0.0)
+    log_value = RATE_LOG_MIN + (crossing + np.clip(fraction, 0, 1)) / scale
+    return np.where(totals[:, None] > 0, np.exp(log_value), 0.0)
+
+
+def throughput_by_app(history, iv, percentiles=PERCENTILES):
+    """Throughput percentiles (bytes/sec) per app over intervals that made progress.
+
+    Returns (app_ids, percentiles array) for apps that made progress.
+    """
+    apps = iv['app'][iv['moving']]
+    app_count = len(history['app_ids'])
+    values = group_percentiles(apps, app_count, iv['rate_bin'], percentiles)
+    seen = np.bincount(apps, minlength=app_count) > 0
+    return history['app_ids'][seen], values[seen]
+
+
+def utc_offset():
+    """Current local UTC offset in seconds (DST changes inside the history are ignored)"""
+    return -time.altzone if time.localtime().tm_isdst > 0 else -time.timezone
+
+
+def throughput_by_day(iv, percentiles=PERCENTILES):
+    """Throughput percentiles (bytes/sec) per local day over intervals that made progress.
+
+    Returns (day numbers since the epoch, percentiles array) for days with progress.
+    """
+    if not iv['moving'].any():
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(percentiles)))
+    days = iv['hour'][iv['moving']] // 24
+    first_day = days.min()
+    days -= first_day
+    day_count = int(days.max()) + 1
+    values = group_percentiles(days, day_count, iv['rate_bin'], percentiles)
+    seen = np.bincount(days, minlength=day_count) > 0
+    return (np.arange(day_count) + first_day)[seen], values[seen]
+
+
+def time_of_day_profile(iv):
+    """Mean bandwidth (bytes/sec) for each local hour of the day (24 values)"""
+    hours = iv['hour'] % 24
+    moved = np.bincount(hours, weights=np.maximum(iv['delta'], 0), minlength=24)
+    elapsed = np.bincount(hours, weights=iv['dt'], minlength=24)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(elapsed > 0, moved / elapsed, 0.0)
+
+
+def stall_periods(iv, min_duration=MIN_STALL):
+    """Runs of consecutive no-progress intervals within a session.
+
+    Returns (app index, start, duration) arrays for runs lasting at least min_duration.
+    """
+    stalled = (iv['delta'] <= 0) & ~iv['complete']
+    if not stalled.any():
+        empty = np.zeros(0)
+        return iv['app'][:0], empty, empty
+
+    # A run breaks when the stalled flag or the session changes
+    same_session = np.concatenate(([False], iv['session'][1:] == iv['session'][:-1]))
+    prev_stalled = np.concatenate(([False], stalled[:-1]))
+    run_start = stalled & ~(prev_stalled & same_session)
+    run_id = np.cumsum(run_start) - 1
+
+    stalled_idx = np.nonzero(stalled)[0]
+    durations = np.bincount(run_id[stalled_idx], weights=iv['dt'][stalled_idx])
+    starts_idx = np.nonzero(run_start)[0]
+    keep = durations >= min_duration
+    return iv['app'][starts_idx][keep], iv['start'][starts_idx][keep], durations[keep]
+
+
+def time_to_complete(history, iv):
+    """Seconds from the first sample of each session to the sample where it completed"""
+    session = iv['all_sessions']
+    if len(session) == 0:
+        return np.zeros(0)
+    t = history['t']
+    total = history['total']
+    complete = (total > 0) & (history['downloaded'] >= total)
+
+    boundaries = np.nonzero(np.concatenate(([True], session[1:] != session[:-1])))[0]
+    first_t = t[boundaries]
+    completed_t = np.minimum.reduceat(np.where(complete, t, np.inf), boundaries)
+    finished = np.isfinite(completed_t)
+    return (completed_t - first_t)[finished]
+
+
+def build_report(history):
+    """Compute every statistic and format a plain-text report"""
+    if len(history['t']) < 2:
+        return "Not enough download history recorded yet."
+
+    iv = intervals(history)
+    lines = [f"Samples: {len(history['t']):,} from {len(history['app_ids'])} apps, "
+             f"{time.strftime('%Y-%m-%d', time.localtime(history['t'].min()))} to "
+             f"{time.strftime('%Y-%m-%d', time.localtime(history['t'].max()))}", ""]
+
+    header = " / ".join(f"p{p}" for p in PERCENTILES)
+    lines.append(f"Throughput per app ({header}):")
+    apps, values = throughput_by_app(history, iv)
+    for app_id, row in zip(apps, values):
+        lines.append(f"  {app_id:>10}  " + " / ".join(format_rate(v) for v in row))
+
+    lines.append("")
+    lines.append(f"Throughput per day ({header}):")
+    days, values = throughput_by_day(iv)
+    for day, row in zip(days, values):
+        lines.append(f"  {time.strftime('%Y-%m-%d', time.gmtime(day * 86400))}  "
+                     + " / ".join(format_rate(v) for v in row))
+
+    lines.append("")
+    lines.append("Mean bandwidth by hour of day:")
+    profile = time_of_day_profile(iv)
+    for hour in range(24):
+        if profile[hour] > 0:
+            lines.append(f"  {hour:02d}:00  {format_rate(profile[hour])}")
+
+    stall_apps, stall_starts, stall_durations = stall_periods(iv)
+    lines.append("")
+    lines.append(f"Stalls of {MIN_STALL}s or more: {len(stall_durations)}"
+                 + (f", {format_duration(stall_durations.sum())} in total" if len(stall_durations) else ""))
+    for index in np.argsort(stall_durations)[::-1][:5]:
+        lines.append(f"  app {history['app_ids'][stall_apps[index]]} at "
+                     f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(stall_starts[index]))} "
+                     f"for {format_duration(stall_durations[index])}")
+
+    durations = time_to_complete(history, iv)
+    lines.append("")
+    lines.append(f"Completed downloads: {len(durations)}")
+    if len(durations):
+        values = np.percentile(durations, PERCENTILES)
+        lines.append(f"  Time to complete ({header}): " + " / ".join(format_duration(v) for v in values))
+    return "\n".join(lines)
+
+
+def generate_report(path=None):
+    """Load the history and build the report; returns (text, seconds taken)"""
+    start = time.perf_counter()
+    try:
+        history = load_history(path)
+    except (OSError, ValueError):
+        return "No download history recorded yet.", time.perf_counter() - start
+    report = build_report(history)
+    return report, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse SteamDown's recorded download history")
+    parser.add_argument("--history", help="History file (defaults to the one in the SteamDown data dir)")
+    args = parser.parse_args(argv)
+
+    report, elapsed = generate_report(args.history)
+    print(report)
+    print(f"\nAnalysed in {elapsed * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import os
+import re
+import bisect
+
+from .system import read_app_manifest, get_steam_library_folders
+
+MANIFEST_PREFIX = "appmanifest_"
+MANIFEST_SUFFIX = ".acf"
+# Default number of search results
+SEARCH_LIMIT = 20
+
+_word_split = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Lowercase and collapse punctuation to single spaces ("Half-Life: Alyx" -> "half life alyx")"""
+    return " ".join(_word_split.split(text.lower())).strip()
+
+
+def fuzzy_score(query, text):
+    """Score how well query's characters appear in order in text (higher is better), or None.
+
+    Consecutive matches and matches at word starts score higher, so "hla" ranks
+    "half life alyx" above "hollow last age".
+    """
+    score = 0
+    position = 0
+    previous = -2
+    for char in query:
+        index = text.find(char, position)
+        if index < 0:
+            return None
+        if index == previous + 1:
+            score += 3
+        elif index == 0 or text[index - 1] == " ":
+            score += 2
+        else:
+            score += 1
+        previous = index
+        position = index + 1
+    # Prefer shorter titles among equal matches
+    return score - len(text) * 0.01
+
+
+class AppIndex:
+    """App id -> name index of the apps installed in every Steam library.
+
+    refresh() lists each library's appmanifest files and re-reads only the
+    manifests whose mtime changed, so a refresh over thousands of installed
+    titles costs a directory listing plus one stat per manifest. search() does
+    prefix matches on titles and title words via bisect over sorted keys, then
+    fills up with fuzzy (in-order subsequence) matches.
+    """
+
+    def __init__(self):
+        # manifest path -> (mtime_ns, app_id, name)
+        self._manifests = {}
+        self.names = {}
+        self._titles = None
+        self._words = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def name(self, app_id):
+        """Name of an installed app, or None"""
+        return self.names.get(str(app_id))
+
+    def refresh(self, library_folders=None):
+        """Pick up added, changed and removed manifests; returns True if anything changed"""
+        if library_folders is None:
+            library_folders = get_steam_library_folders()
+        seen = set()
+        changed = False
+        for library in dict.fromkeys(os.path.realpath(l) for l in library_folders):
+            try:
+                entries = os.scandir(os.path.join(library, "steamapps"))
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith(MANIFEST_PREFIX) and name.endswith(MANIFEST_SUFFIX)):
+                        continue
+                    seen.add(entry.path)
+                    try:
+                        mtime_ns = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    cached = self._manifests.get(entry.path)
+                    if cached and cached[0] == mtime_ns:
+                        continue
+                    try:
+                        values = read_app_manifest(entry.path)
+                    except OSError as e:
+                        print(f"Error reading manifest {entry.path}: {e}")
+                        continue
+                    app_id = values.get('appid') or name[len(MANIFEST_PREFIX):-len(MANIFEST_SUFFIX)]
+                    self._manifests[entry.path] = (mtime_ns, app_id, values.get('name') or f"Game {app_id}")
+                    changed = True
+
+        for path in list(self._manifests):
+            if path not in seen:
+                del self._manifests[path]
+                changed = True
+        if changed:
+            self.names = {app_id: name for _, app_id, name in self._manifests.values()}
+            # Search keys are rebuilt on the next search
+            self._titles = None
+            self._words = None
+        return changed
+
+    def _build_keys(self):
+        titles = []
+        words = []
+        for app_id, name in self.names.items():
+            key = normalize(name)
+            titles.append((key, app_id))
+            for word in set(key.split()):
+                words.append((word, app_id))
+        titles.sort()
+        words.sort()
+        self._titles = titles
+        self._words = words
+
+    @staticmethod
+    def _prefixed(keys, prefix):
+        """app ids of the (key, app_id) entries whose key starts with prefix"""
+        start = bisect.bisect_left(keys, (prefix,))
+        for key, app_id in keys[start:]:
+            if not key.startswith(prefix):
+                break
+            yield app_id
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Find installed apps by name or id; returns [(app_id, name)] best first"""
+        if self._titles is None:
+            self._build_keys()
+        query = normalize(query)
+        if not query:
+            return []
+
+        results = []
+        found = set()
+
+        def add(app_id):
+            if app_id not in found:
+                found.add(app_id)
+                results.append(app_id)
+            return len(results) >= limit
+
+        if query.isdigit() and query in self.names:
+            add(query)
+        # Title prefix ("half" -> "Half-Life"), then any word prefix ("life" -> "Half-Life")
+        for app_id in self._prefixed(self._titles, query):
+            if add(app_id):
+                break
+        if len(results) < limit:
+            first, _, rest = query.partition(" ")
+            for app_id in self._prefixed(self._words, first):
+                if (not rest or rest in normalize(self.names[app_id])) and add(app_id):
+                    break
+        if len(results) < limit:
+            compact = query.replace(" ", "")
+            scored = []
+            for key, app_id in self._titles:
+                if app_id in found:
+                    continue
+                score = fuzzy_score(compact, key)
+                if score is not None:
+                    scored.append((-score, key, app_id))
+            scored.sort()
+            for _, _, app_id in scored[:limit - len(results)]:
+                add(app_id)
+        return [(app_id, self.names[app_id]) for app_id in results]
+
+
+_app_index = None
+
+
+def get_app_index():
+    """Get the shared index of installed apps (refresh() it before searching)"""
+    global _app_index
+    if _app_index is None:
+        _app_index = AppIndex()
+    return _app_index
@@ -0,0 +1,319 @@
+import os
+import json
+import mmap
+import struct
+
+from .system import get_steam_path, get_data_dir
+
+# appinfo.vdf header magics (little-endian uint32)
+APPINFO_V27 = 0x07564427
+APPINFO_V28 = 0x07564428
+APPINFO_V29 = 0x07564429
+SUPPORTED_VERSIONS = (APPINFO_V27, APPINFO_V28, APPINFO_V29)
+
+# Binary KeyValues value types
+KV_MAP = 0x00
+KV_STRING = 0x01
+KV_INT32 = 0x02
+KV_FLOAT32 = 0x03
+KV_POINTER = 0x04
+KV_WSTRING = 0x05
+KV_COLOR = 0x06
+KV_UINT64 = 0x07
+KV_END = 0x08
+KV_INT64 = 0x0A
+KV_END_ALT = 0x0B
+
+INDEX_FILE = "appinfo_index.json"
+INDEX_VERSION = 1
+
+_u32 = struct.Struct("<I")
+_i32 = struct.Struct("<i")
+_f32 = struct.Struct("<f")
+_u64 = struct.Struct("<Q")
+_i64 = struct.Struct("<q")
+_entry_head = struct.Struct("<II")
+
+
+class AppInfoReader:
+    """Lazy reader for Steam's binary appcache/appinfo.vdf.
+
+    The file is scanned once to build an app id -> (offset, size) index. Entries
+    are only decoded when asked for. The index is persisted next to the other
+    SteamDown data and rebuilt only when the file's mtime or size changes.
+
+    The file is memory-mapped only while scanning or decoding an entry; keeping
+    a mapping open would stop Steam from replacing the file on Windows.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or os.path.join(get_data_dir(), INDEX_FILE)
+        self._file = None
+        self._map = None
+        # (mtime_ns, size) of the file the index was built from
+        self._signature = None
+        self._version = None
+        self._strings = None
+        self._index = {}
+        self._cache = {}
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_map(self):
+        """Map the file; returns False if it can't be read"""
+        try:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # ValueError: mmap of an empty file
+            print(f"Error reading {self.path}: {e}")
+            self.close()
+            return False
+        return True
+
+    def _ensure_index(self):
+        """(Re)load the index if the file changed on disk"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._signature = None
+            self._version = None
+            self._index = {}
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return self._version is not None
+
+        self._signature = signature
+        self._version = None
+        self._strings = None
+        self._index = {}
+        self._cache.clear()
+        if not self._open_map():
+            return False
+        try:
+            magic, _universe = _entry_head.unpack_from(self._map, 0)
+            if magic not in SUPPORTED_VERSIONS:
+                print(f"Unsupported appinfo.vdf version: {magic:#x}")
+                return False
+            self._version = magic
+
+            if not self._load_index(stat):
+                self._index = self._scan()
+                self._save_index(stat)
+        except struct.error as e:
+            print(f"Error reading appinfo.vdf header: {e}")
+            self._version = None
+            return False
+        finally:
+            self.close()
+        return True
+
+    def _entries_start(self):
+        # v29 stores a string table offset right after the header
+        return 16 if self._version == APPINFO_V29 else 8
+
+    def _entry_header_size(self):
+        # info_state, last_updated, pics_token, text sha1, change_number[, binary sha1]
+        size = 4 + 4 + 8 + 20 + 4
+        if self._version >= APPINFO_V28:
+            size += 20
+        return size
+
+    def _scan(self):
+        """Walk the entry headers once and record where each app lives"""
+        index = {}
+        data = self._map
+        offset = self._entries_start()
+        end = len(data)
+        while offset + 8 <= end:
+            app_id, size = _entry_head.unpack_from(data, offset)
+            if app_id == 0:
+                break
+            index[app_id] = (offset + 8, size)
+            offset += 8 + size
+        return index
+
+    def _load_index(self, stat):
+        """Load a persisted index if it matches the current file"""
+        try:
+            with open(self.index_path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (cached.get("version") != INDEX_VERSION
+                or cached.get("path") != os.path.abspath(self.path)
+                or cached.get("mtime_ns") != stat.st_mtime_ns
+                or cached.get("size") != stat.st_size):
+            return False
+
+        self._index = {int(app_id): tuple(entry) for app_id, entry in cached.get("entries", {}).items()}
+        return True
+
+    def _save_index(self, stat):
+        """Persist the offset index, replacing any previous one atomically"""
+        cached = {
+            "version": INDEX_VERSION,
+            "path": os.path.abspath(self.path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "entries": {str(app_id): list(entry) for app_id, entry in self._index.items()},
+        }
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(cached, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Error saving appinfo index: {e}")
+
+    def _read_string_table(self):
+        """Read the v29 key string table"""
+        data = self._map
+        (table_offset,) = _i64.unpack_from(data, 8)
+        (count,) = _u32.unpack_from(data, table_offset)
+        offset = table_offset + 4
+        strings = []
+        for _ in range(count):
+            end = data.find(b"\x00", offset)
+            strings.append(data[offset:end].decode("utf-8", "replace"))
+            offset = end + 1
+        return strings
+
+    def _read_cstring(self, offset):
+        end = self._map.find(b"\x00", offset)
+        return self._map[offset:end].decode("utf-8", "replace"), end + 1
+
+    def _read_key(self, offset):
+        if self._version == APPINFO_V29:
+            if self._strings is None:
+                self._strings = self._read_string_table()
+            (key_index,) = _u32.unpack_from(self._map, offset)
+            return self._strings[key_index], offset + 4
+        return self._read_cstring(offset)
+
+    def _decode_map(self, offset):
+        """Decode a binary KeyValues map starting at offset"""
+        data = self._map
+        result = {}
+        while True:
+            value_type = data[offset]
+            offset += 1
+            if value_type in (KV_END, KV_END_ALT):
+                return result, offset
+
+            key, offset = self._read_key(offset)
+            if value_type == KV_MAP:
+                value, offset = self._decode_map(offset)
+            elif value_type == KV_STRING:
+                value, offset = self._read_cstring(offset)
+            elif value_type == KV_WSTRING:
+                end = offset
+                while data[end:end + 2] != b"\x00\x00":
+                    end += 2
+                value = data[offset:end].decode("utf-16-le", "replace")
+                offset = end + 2
+            elif value_type in (KV_INT32, KV_POINTER, KV_COLOR):
+                (value,) = _i32.unpack_from(data, offset)
+                offset += 4
+            elif value_type == KV_FLOAT32:
+                (value,) = _f32.unpack_from(data, offset)
+                offset += 4
+            elif value_type == KV_UINT64:
+                (value,) = _u64.unpack_from(data, offset)
+                offset += 8
+            elif value_type == KV_INT64:
+                (value,) = _i64.unpack_from(data, offset)
+                offset += 8
+            else:
+                raise ValueError(f"Unknown KeyValues type {value_type:#x} at offset {offset - 1}")
+            result[key] = value
+
+    def app_ids(self):
+        """Return all app ids present in appinfo.vdf"""
+        if not self._ensure_index():
+            return []
+        return list(self._index)
+
+    def get(self, app_id):
+        """Decode and return the appinfo section for a single app, or None"""
+        if not self._ensure_index():
+            return None
+
+        app_id = int(app_id)
+        if app_id in self._cache:
+            return self._cache[app_id]
+
+        entry = self._index.get(app_id)
+        if entry is None:
+            return None
+
+        offset, _size = entry
+        if not self._open_map():
+            return None
+        try:
+            if len(self._map) != self._signature[1]:
+                # Replaced since it was indexed; rebuild the index on the next call
+                self._signature = None
+                return None
+            data, _ = self._decode_map(offset + self._entry_header_size())
+        except (ValueError, IndexError, struct.error) as e:
+            print(f"Error decoding appinfo for {app_id}: {e}")
+            return None
+        finally:
+            self.close()
+
+        info = data.get("appinfo", data)
+        self._cache[app_id] = info
+        return info
+
+    def get_name(self, app_id):
+        """Return the app's display name, or None"""
+        info = self.get(app_id)
+        if not info:
+            return None
+        return info.get("common", {}).get("name")
+
+    def get_depot_sizes(self, app_id):
+        """Return {depot_id: size_in_bytes} for the public branch of each depot"""
+        info = self.get(app_id)
+        if not info:
+            return {}
+
+        sizes = {}
+        for depot_id, depot in info.get("depots", {}).items():
+            if not isinstance(depot, dict) or not depot_id.isdigit():
+                continue
+            public = depot.get("manifests", {}).get("public")
+            if isinstance(public, dict):
+                # Newer clients store {"gid", "size", "download"}
+                size = public.get("size")
+            else:
+                size = depot.get("maxsize")
+            if size is not None:
+                sizes[depot_id] = int(size)
+        return sizes
+
+
+_reader = None
+
+
+def get_appinfo_reader():
+    """Get the shared reader for the local Steam installation's appinfo.vdf"""
+    global _reader
+    if _reader is None:
+        steam_path = get_steam_path()
+        if not steam_path:
+            return None
+        _reader = AppInfoReader(os.path.join(steam_path, "appcache", "appinfo.vdf"))
+    return _reader
@@ -0,0 +1,92 @@
+from collections import deque
+
+# Download states
+ACTIVE = "active"
+STALLED = "stalled"
+PAUSED = "paused"
+COMPLETED = "completed"
+# Set by the disk space guard for stopped downloads whose library drive is full
+DISK_FULL = "disk full"
+
+# Length of the statistics window (seconds)
+DEFAULT_WINDOW_SECONDS = 90
+# Average progress below this (bytes/sec) over a full window counts as stalled
+STALL_RATE = 10 * 1024
+
+
+class DownloadClassifier:
+    """Label each download as active, stalled, paused or completed.
+
+    Every snapshot adds a (time, bytes_downloaded, download_rate) sample to a
+    per-app sliding window. Once the window covers enough time:
+
+    - completed: all bytes are downloaded (Steam may still be installing)
+    - paused: the backend says so, or (if it has no paused flag) neither bytes
+      nor the reported rate moved
+    - stalled: Steam reports a rate (or bytes trickle in) but progress over the
+      window stays below STALL_RATE, e.g. a dead CDN
+    - active: anything else, including apps without enough history yet and
+      downloads of other launchers with an unknown total (e.g. Epic)
+    """
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS, stall_rate=STALL_RATE):
+        self.window_seconds = window_seconds
+        self.stall_rate = stall_rate
+        self.samples = {}
+        self.states = {}
+
+    def reset(self):
+        """Forget all history"""
+        self.samples.clear()
+        self.states.clear()
+
+    def update(self, downloads, now):
+        """Add the downloads (AppDownloadState) seen at `now` and return {app_id: state}"""
+        states = {}
+        for download in downloads:
+            app_id = download.app_id
+            window = self.samples.setdefault(app_id, deque())
+            window.append((now, download.bytes_downloaded, download.download_rate or 0))
+            # Keep one sample older than the window so it is always fully covered
+            while len(window) > 2 and now - window[1][0] >= self.window_seconds:
+                window.popleft()
+            states[app_id] = self.classify(download, window, now)
+
+        for app_id in list(self.samples):
+            if app_id not in states:
+                del self.samples[app_id]
+        self.states = states
+        return states
+
+    def classify(self, download, window, now):
+        """Classify one download from its sample window"""
+        bytes_total = download.bytes_total
+        if bytes_total > 0 and download.bytes_downloaded >= bytes_total:
+            return COMPLETED
+        if download.paused:
+            return PAUSED
+        if bytes_total <= 0 and download.launcher != "steam":
+            # Other launchers only list a download while it runs; without a total
+            # there is no progress to judge, so it holds the action until it's gone
+            return ACTIVE
+
+        span = now - window[0][0]
+        if span < self.window_seconds:
+            return ACTIVE
+
+        progress = window[-1][1] - window[0][1]
+        # Backends that report a paused flag have already told us; otherwise Steam
+        # dropping the rate to zero with no progress means the user paused it
+        if progress <= 0 and download.paused is None and not any(rate for _, _, rate in window):
+            return PAUSED
+        if progress / span < self.stall_rate:
+            return STALLED
+        return ACTIVE
+
+    def mark(self, app_id, state):
+        """Override an app's state until the next update (e.g. with DISK_FULL)"""
+        self.states[app_id] = state
+
+    def state(self, app_id):
+        """Last state of an app (ACTIVE if unknown)"""
+        return self.states.get(app_id, ACTIVE)
@@ -0,0 +1,227 @@
+import os
+import sys
+import hmac
+import json
+import queue
+import socket
+import struct
+import hashlib
+import secrets
+import threading
+from concurrent.futures import Future
+from socketserver import BaseRequestHandler, ThreadingTCPServer
+
+from .system import get_data_dir
+
+DEFAULT_COMMAND_PORT = 47801
+TOKEN_FILE = "command_token"
+
+# Every message is a JSON object preceded by its length (4 bytes, big-endian)
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME = 1024 * 1024
+# A client must authenticate within this many seconds of connecting
+AUTH_TIMEOUT = 5
+
+
+def get_command_token(create=True):
+    """Shared secret for the command API, stored in the data dir (created on first use)"""
+    path = os.path.join(get_data_dir(), TOKEN_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            token = f.read().strip()
+        if token:
+            return token
+    except OSError:
+        pass
+    if not create:
+        return None
+    token = secrets.token_urlsafe(32)
+    # Readable by the current user only
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def auth_digest(token, nonce):
+    """Response to the server's challenge: HMAC-SHA256 of the nonce keyed with the token"""
+    return hmac.new(token.encode("utf-8"), nonce.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+def encode_frame(message):
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def recv_frame(sock):
+    """Read one message from a blocking socket; returns None when the peer disconnects"""
+    header = _recv_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes is too large")
+    body = _recv_exactly(sock, length)
+    if body is None:
+        return None
+    message = json.loads(body.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("message is not an object")
+    return message
+
+
+class _CommandHandler(BaseRequestHandler):
+    """One controller connection.
+
+    After the challenge-response handshake, requests ({"id", "cmd", "args"}) are
+    dispatched as they arrive and answered ({"id", "ok", "result"/"error"}) as they
+    complete, so many commands can be in flight on one connection.
+
+    Futures complete on the UI thread, so their callbacks only queue the reply; a
+    writer thread per connection sends it. A controller that stops reading then
+    stalls its own writer, never the UI.
+    """
+
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send_lock = threading.Lock()
+        self.closed = False
+        # (request id, completed future), in completion order; None stops the writer
+        self.replies = queue.Queue()
+        self.server.connections.add(self.request)
+
+    def send(self, message):
+        with self.send_lock:
+            if self.closed:
+                return
+            try:
+                self.request.sendall(encode_frame(message))
+            except OSError:
+                self.closed = True
+
+    def authenticate(self):
+        nonce = secrets.token_hex(16)
+        self.send({"hello": "steamdown", "nonce": nonce})
+        self.request.settimeout(AUTH_TIMEOUT)
+        try:
+            reply = recv_frame(self.request)
+        except (OSError, ValueError):
+            return False
+        self.request.settimeout(None)
+        expected = auth_digest(self.server.token, nonce).encode("ascii")
+        given = str((reply or {}).get("auth", "")).encode("utf-8")
+        if not hmac.compare_digest(expected, given):
+            self.send({"ok": False, "error": "authentication failed"})
+            print(f"Rejected command connection from {self.client_address[0]}")
+            return False
+        self.send({"ok": True})
+        return True
+
+    def handle(self):
+        if not self.authenticate():
+            return
+        threading.Thread(target=self.write_replies, name="steamdown-command-replies",
+                         daemon=True).start()
+        while True:
+            try:
+                message = recv_frame(self.request)
+            except (OSError, ValueError):
+                break
+            if message is None:
+                break
+            request_id = message.get("id")
+            try:
+                future = self.server.dispatch(str(message.get("cmd")), message.get("args") or {})
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(lambda future, request_id=request_id:
+                                     self.replies.put((request_id, future)))
+
+    def write_replies(self):
+        """Send replies as their commands complete (writer thread)"""
+        while True:
+            item = self.replies.get()
+            if item is None or self.closed:
+                return
+            request_id, future = item
+            try:
+                self.send({"id": request_id, "ok": True, "result": future.result()})
+            except Exception as e:
+                self.send({"id": request_id, "ok": False, "error": str(e) or type(e).__name__})
+
+    def finish(self):
+        self.closed = True
+        self.replies.put(None)
+        self.server.connections.discard(self.request)
+
+
+class _Server(ThreadingTCPServer):
+    daemon_threads = True
+    # Rebind right after a restart; on Windows SO_REUSEADDR would let others share the port
+    allow_reuse_address = sys.platform != "win32"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = set()
+
+
+class CommandServer:
+    """Authenticated TCP command API for controlling this instance remotely.
+
+    dispatch(command, args) is called on the connection's thread and must return a
+    concurrent.futures.Future; the main window completes it on the UI thread.
+    """
+
+    def __init__(self, dispatch, host="0.0.0.0", port=DEFAULT_COMMAND_PORT, token=None):
+        self.dispatch = dispatch
+        self.host = host
+        self.port = port
+        self.token = token
+        self._server = None
+
+    def is_running(self):
+        return self._server is not None
+
+    def start(self):
+        """Start serving; returns False if the port could not be bound"""
+        if self._server is not None:
+            return True
+        try:
+            token = self.token or get_command_token()
+            self._server = _Server((self.host, self.port), _CommandHandler)
+        except OSError as e:
+            print(f"Could not start command server on port {self.port}: {e}")
+            return False
+        # Port 0 binds any free port; report the one actually used
+        self.port = self._server.server_address[1]
+        self._server.token = token
+        self._server.dispatch = self.dispatch
+        threading.Thread(target=self._server.serve_forever,
+                         name="steamdown-commands", daemon=True).start()
+        print(f"Command server listening on {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        """Stop serving and disconnect all controllers"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        # Disabling the API also drops controllers that are already connected
+        for connection in list(self._server.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._server = None
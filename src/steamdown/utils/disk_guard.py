@@ -0,0 +1,116 @@
+import os
+import shutil
+
+from .system import get_steam_library_folders
+
+# How long library lists and free-space readings are reused (seconds)
+DISK_CHECK_INTERVAL = 30
+# Space Steam needs on top of the remaining bytes (staging, manifests)
+DISK_RESERVE = 512 * 1024 * 1024
+
+
+class DiskShortage:
+    """A library drive without room for the downloads queued on it"""
+
+    __slots__ = ('library', 'free', 'needed', 'app_ids')
+
+    def __init__(self, library, free, needed, app_ids):
+        self.library = library
+        self.free = free
+        self.needed = needed
+        self.app_ids = app_ids
+
+    def __repr__(self):
+        return f"DiskShortage({self.library!r}, free={self.free}, needed={self.needed}, apps={self.app_ids})"
+
+
+class DiskSpaceGuard:
+    """Compares each library drive's free space with the bytes still to download to it.
+
+    Downloads are mapped to the library holding their appmanifest, and
+    libraries to drives by st_dev, so several libraries on one drive share its
+    free space. The library list and disk_usage() readings are cached for
+    `check_interval`, so a tick normally costs a few dict lookups.
+    """
+
+    def __init__(self, check_interval=DISK_CHECK_INTERVAL, reserve=DISK_RESERVE):
+        self.check_interval = check_interval
+        self.reserve = reserve
+        self.shortages = []
+        # [(library, device)], refreshed every check_interval
+        self._libraries = []
+        self._libraries_checked = None
+        # app id -> library (None if no library has its manifest)
+        self._app_libraries = {}
+        # device -> (checked at, free bytes)
+        self._free = {}
+
+    def _refresh_libraries(self, now):
+        if self._libraries_checked is not None and now - self._libraries_checked < self.check_interval:
+            return
+        self._libraries_checked = now
+        libraries = []
+        for library in dict.fromkeys(os.path.realpath(l) for l in get_steam_library_folders()):
+            try:
+                libraries.append((library, os.stat(library).st_dev))
+            except OSError:
+                continue
+        if libraries != self._libraries:
+            self._libraries = libraries
+            self._app_libraries.clear()
+        else:
+            # Look again for apps whose manifest hadn't been written yet
+            for app_id, entry in list(self._app_libraries.items()):
+                if entry is None:
+                    del self._app_libraries[app_id]
+
+    def _library_of(self, app_id):
+        """(library, device) whose steamapps holds the app's manifest, or None"""
+        if app_id not in self._app_libraries:
+            self._app_libraries[app_id] = next(
+                (entry for entry in self._libraries
+                 if os.path.exists(os.path.join(entry[0], "steamapps", f"appmanifest_{app_id}.acf"))),
+                None)
+        return self._app_libraries[app_id]
+
+    def _free_space(self, library, device, now):
+        cached = self._free.get(device)
+        if cached is not None and now - cached[0] < self.check_interval:
+            return cached[1]
+        try:
+            free = shutil.disk_usage(library).free
+        except OSError as e:
+            print(f"Error checking free space of {library}: {e}")
+            free = None
+        self._free[device] = (now, free)
+        return free
+
+    def update(self, downloads, now):
+        """Check the downloads (AppDownloadState) against their drives; returns [DiskShortage]"""
+        self._refresh_libraries(now)
+        # device -> [library, remaining bytes, app ids]
+        queued = {}
+        for download in downloads:
+            if download.bytes_total <= 0:
+                continue
+            entry = self._library_of(download.app_id)
+            if entry is None:
+                continue
+            library, device = entry
+            remaining = max(0, download.bytes_total - download.bytes_downloaded)
+            drive = queued.setdefault(device, [library, 0, []])
+            drive[1] += remaining
+            drive[2].append(download.app_id)
+
+        shortages = []
+        for device, (library, remaining, app_ids) in queued.items():
+            free = self._free_space(library, device, now)
+            if free is not None and free < remaining + self.reserve:
+                shortages.append(DiskShortage(library, free, remaining + self.reserve, tuple(app_ids)))
+
+        active_ids = {download.app_id for download in downloads}
+        for app_id in list(self._app_libraries):
+            if app_id not in active_ids:
+                del self._app_libraries[app_id]
+        self.shortages = shortages
+        return shortages
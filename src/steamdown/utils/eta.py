@@ -0,0 +1,190 @@
+from collections import deque
+
+# How much history the rate fit looks at
+DEFAULT_WINDOW_SECONDS = 120
+# Fraction of bytes after which a disappearing download counts as finished
+COMPLETION_FRACTION = 0.99
+# Flaps are forgotten after this long without another one (seconds)
+FLAP_MEMORY = 3600
+
+
+def format_duration(seconds):
+    """Format seconds as a short human readable duration (e.g. '1h 05m')"""
+    if seconds is None:
+        return "unknown"
+    seconds = int(max(0, seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def format_size(num_bytes):
+    """Format a byte count (e.g. '12.3 MB')"""
+    if not num_bytes:
+        return "0 B"
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+def format_rate(bytes_per_sec):
+    """Format a transfer rate (e.g. '12.3 MB/s')"""
+    return f"{format_size(bytes_per_sec)}/s"
+
+
+def fit_rate(samples):
+    """Least-squares slope (bytes/sec) of (time, bytes) samples, or None"""
+    n = len(samples)
+    if n < 2:
+        return None
+    t0 = samples[0][0]
+    mean_t = sum(t - t0 for t, _ in samples) / n
+    mean_b = sum(b for _, b in samples) / n
+    var_t = sum((t - t0 - mean_t) ** 2 for t, _ in samples)
+    if var_t <= 0:
+        return None
+    cov = sum((t - t0 - mean_t) * (b - mean_b) for t, b in samples)
+    return cov / var_t
+
+
+class EtaEstimator:
+    """Predict completion times from the recent byte-counter history of each download.
+
+    The monitor feeds it every snapshot; it keeps a sliding window per app, fits the
+    download rate and predicts when each app and the whole queue will finish. It also
+    remembers whether the queue drained as predicted so the monitor can confirm
+    completion with a short grace period instead of the full inactivity timeout.
+    """
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS, base_grace=15):
+        self.window_seconds = window_seconds
+        self.base_grace = base_grace
+        self.history = {}
+        self.last_downloads = {}
+        self.last_queue_eta = None
+        self.last_update = None
+        self.drained_at = None
+        self.drained_as_predicted = False
+        self.flaps = 0
+        self.last_flap_at = None
+
+    def reset(self):
+        """Forget all history"""
+        self.history.clear()
+        self.last_downloads.clear()
+        self.last_queue_eta = None
+        self.last_update = None
+        self.drained_at = None
+        self.drained_as_predicted = False
+        self.flaps = 0
+        self.last_flap_at = None
+
+    def update(self, downloads, now):
+        """Record the active downloads (AppDownloadState) seen at time `now`"""
+        current = {d.app_id: d for d in downloads}
+
+        if self.flaps and now - self.last_flap_at >= FLAP_MEMORY:
+            self.flaps = 0
+        if current and self.drained_at is not None:
+            if self.drained_as_predicted and now - self.drained_at <= self._grace():
+                # Downloads came back while the drain was being confirmed: be more patient next time
+                self.flaps += 1
+                self.last_flap_at = now
+            self.drained_at = None
+        elif not current and self.last_downloads and self.drained_at is None:
+            self.drained_at = now
+            self.drained_as_predicted = self._drain_expected(now)
+
+        for app_id in list(self.history):
+            if app_id not in current:
+                del self.history[app_id]
+
+        for app_id, download in current.items():
+            samples = self.history.setdefault(app_id, deque())
+            samples.append((now, download.bytes_downloaded))
+            while samples and now - samples[0][0] > self.window_seconds:
+                samples.popleft()
+
+        self.last_downloads = current
+        self.last_update = now
+        self.last_queue_eta = self.queue_eta() if current else None
+
+    def _drain_expected(self, now):
+        """Whether the queue disappearing matches what we predicted"""
+        for download in self.last_downloads.values():
+            total = download.bytes_total
+            if total > 0 and download.bytes_downloaded >= total * COMPLETION_FRACTION:
+                continue
+            if self.last_queue_eta is None or self.last_update is None:
+                return False
+            # Allow for the time between ticks plus a little slack
+            if self.last_queue_eta > (now - self.last_update) * 2 + 5:
+                return False
+        return True
+
+    def app_rate(self, app_id):
+        """Fitted download rate in bytes/sec for an app"""
+        samples = self.history.get(app_id)
+        rate = fit_rate(samples) if samples else None
+        if rate is None or rate <= 0:
+            download = self.last_downloads.get(app_id)
+            rate = (download.download_rate if download else 0) or None
+        return rate
+
+    def app_remaining(self, app_id):
+        """Bytes left to download for an app, or None if the size is unknown"""
+        download = self.last_downloads.get(app_id)
+        if not download or download.bytes_total <= 0:
+            return None
+        return max(0, download.bytes_total - download.bytes_downloaded)
+
+    def app_eta(self, app_id):
+        """Predicted seconds until an app finishes, or None"""
+        remaining = self.app_remaining(app_id)
+        if remaining is None:
+            return None
+        if remaining == 0:
+            return 0
+        rate = self.app_rate(app_id)
+        if not rate:
+            return None
+        return remaining / rate
+
+    def queue_eta(self):
+        """Predicted seconds until every known download finishes, or None.
+
+        Steam works through its queue one app at a time, so the queue finishes when
+        all remaining bytes have arrived at the combined current rate.
+        """
+        if not self.last_downloads:
+            return 0
+        remaining = 0
+        for app_id in self.last_downloads:
+            app_remaining = self.app_remaining(app_id)
+            if app_remaining is None:
+                return None
+            remaining += app_remaining
+        rate = sum(self.app_rate(app_id) or 0 for app_id in self.last_downloads)
+        if rate <= 0:
+            return None if remaining else 0
+        return remaining / rate
+
+    def grace_period(self, max_timeout):
+        """Seconds to wait after the queue drained before acting.
+
+        A drain that matched the prediction only needs a short confirmation window,
+        which doubles every time a download reappeared within it. Those flaps are
+        forgotten after FLAP_MEMORY without another, or when the estimator is reset
+        after an action. Anything unexpected falls back to the full inactivity timeout.
+        """
+        if not self.drained_as_predicted:
+            return max_timeout
+        return min(max_timeout, self._grace())
+
+    def _grace(self):
+        return self.base_grace * (2 ** self.flaps)
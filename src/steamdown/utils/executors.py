@@ -0,0 +1,44 @@
+import subprocess
+
+
+class CommandExecutor:
+    """Runs the OS commands SteamDown issues (power actions, Steam shutdown)"""
+
+    def run(self, args, timeout=None):
+        """Run a command and return its exit code"""
+        raise NotImplementedError
+
+
+class SubprocessExecutor(CommandExecutor):
+    """Runs commands for real without going through a shell"""
+
+    def run(self, args, timeout=None):
+        print(f"Running: {subprocess.list2cmdline(args)}")
+        return subprocess.run(args, timeout=timeout).returncode
+
+
+class DryRunExecutor(CommandExecutor):
+    """Records commands instead of running them, for testing and dry runs"""
+
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.commands = []
+
+    def run(self, args, timeout=None):
+        print(f"[dry run] {subprocess.list2cmdline(args)}")
+        self.commands.append(list(args))
+        return self.returncode
+
+
+_default_executor = SubprocessExecutor()
+
+
+def get_default_executor():
+    """Get the executor used when none is passed explicitly"""
+    return _default_executor
+
+
+def set_default_executor(executor):
+    """Replace the default executor (e.g. with a DryRunExecutor)"""
+    global _default_executor
+    _default_executor = executor
@@ -0,0 +1,403 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import itertools
+
+from .status_server import DEFAULT_STATUS_PORT
+from .command_server import (DEFAULT_COMMAND_PORT, FRAME_HEADER, MAX_FRAME, auth_digest,
+                             encode_frame, get_command_token)
+from .eta import format_duration
+
+# Per-host deadline for connecting and reading one status response (seconds)
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_INTERVAL = 1.0
+# Unreachable hosts are retried after 1, 2, 4, ... seconds, up to MAX_BACKOFF
+MAX_BACKOFF = 60
+# Upper bound on requests in flight at once
+MAX_CONCURRENCY = 256
+
+
+def parse_host(text, default_port=DEFAULT_STATUS_PORT):
+    """Split 'host[:port]' (or '[v6addr]:port') into (host, port)"""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    if text.count(":") == 1:
+        host, port = text.split(":")
+        return host, int(port)
+    return text, default_port
+
+
+def read_hosts_file(path):
+    """Hosts listed one per line; blank lines and # comments are ignored"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+class FleetHost:
+    """One SteamDown instance and its keep-alive connection.
+
+    The connection is opened on first use and reused for every later poll, so
+    polling a host once a second costs a request, not a TCP handshake.
+    """
+
+    def __init__(self, host, port=DEFAULT_STATUS_PORT):
+        self.host = host
+        self.port = port
+        self.status = None
+        self.error = None
+        self.latency = None
+        self.last_seen = None
+        self.failures = 0
+        self.retry_at = 0
+        self._reader = None
+        self._writer = None
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
+    @property
+    def online(self):
+        return self.error is None and self.status is not None
+
+    async def fetch(self):
+        """GET /status over the pooled connection and return the decoded JSON"""
+        reused = self._writer is not None
+        try:
+            return await self._request()
+        except (EOFError, ConnectionError):
+            if not reused:
+                raise
+            # The instance closed the idle connection (e.g. it restarted); retry once
+            self.close()
+            return await self._request()
+
+    async def _request(self):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(f"GET /status HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Accept: application/json\r\n\r\n".encode("ascii"))
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise EOFError("connection closed")
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+            raise ValueError(f"bad status line {status_line!r}")
+
+        length = None
+        keep_alive = parts[0] == b"HTTP/1.1"
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n"):
+                break
+            if not line:
+                raise EOFError("connection closed")
+            key, _, value = line.decode("latin-1").partition(":")
+            key = key.strip().lower()
+            if key == "content-length":
+                length = int(value)
+            elif key == "connection":
+                keep_alive = value.strip().lower() != "close"
+
+        if length is None:
+            body = await self._reader.read()
+            keep_alive = False
+        else:
+            body = await self._reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+
+        code = int(parts[1])
+        if code != 200:
+            raise ValueError(f"HTTP {code}")
+        return json.loads(body.decode("utf-8"))
+
+    def close(self):
+        """Drop the pooled connection"""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+class FleetMonitor:
+    """Polls many instances concurrently on one asyncio event loop.
+
+    Every host has its own deadline, so one slow or dead machine never holds up
+    the others; hosts that fail are backed off exponentially.
+    """
+
+    def __init__(self, hosts, timeout=DEFAULT_TIMEOUT, max_concurrency=MAX_CONCURRENCY):
+        self.hosts = [host if isinstance(host, FleetHost) else FleetHost(*parse_host(host))
+                      for host in hosts]
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def poll_host(self, host, now):
+        """Poll one host unless it is backing off"""
+        if now < host.retry_at:
+            return
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(host.fetch(), self.timeout)
+            except asyncio.TimeoutError:
+                self.record_failure(host, now, f"timed out after {self.timeout:g}s")
+            except (OSError, EOFError, ValueError) as e:
+                self.record_failure(host, now, str(e) or type(e).__name__)
+            else:
+                host.status = status
+                host.error = None
+                host.latency = time.perf_counter() - start
+                host.last_seen = time.time()
+                host.failures = 0
+                host.retry_at = 0
+
+    def record_failure(self, host, now, error):
+        """Close the host's connection and schedule its next attempt"""
+        host.close()
+        host.error = error
+        host.latency = None
+        host.failures += 1
+        host.retry_at = now + min(MAX_BACKOFF, 2 ** (host.failures - 1))
+
+    async def poll(self):
+        """Poll every host once, concurrently"""
+        if self._semaphore is None:
+            # Created here so it binds to the running loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        now = time.monotonic()
+        await asyncio.gather(*(self.poll_host(host, now) for host in self.hosts))
+
+    async def run(self, on_update, interval=DEFAULT_INTERVAL, once=False):
+        """Poll every `interval` seconds, calling on_update(hosts) after each round"""
+        try:
+            while True:
+                start = time.monotonic()
+                await self.poll()
+                on_update(self.hosts)
+                if once:
+                    return
+                await asyncio.sleep(max(0, interval - (time.monotonic() - start)))
+        finally:
+            self.close()
+
+    def close(self):
+        """Drop all pooled connections"""
+        for host in self.hosts:
+            host.close()
+
+
+async def read_frame(reader):
+    """Read one length-prefixed JSON message"""
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes is too large")
+    message = json.loads((await reader.readexactly(length)).decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("message is not an object")
+    return message
+
+
+class CommandClient:
+    """Persistent, authenticated connection to one instance's command API.
+
+    Requests carry ids and are matched to responses as they arrive, so any number
+    of calls can be in flight on the one connection.
+    """
+
+    def __init__(self, host, port=DEFAULT_COMMAND_PORT, token=None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = None
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
+    async def connect(self, timeout=DEFAULT_TIMEOUT):
+        """Connect and answer the server's challenge"""
+        try:
+            await asyncio.wait_for(self._handshake(), timeout)
+        except BaseException:
+            self.close()
+            raise
+        self._read_task = asyncio.ensure_future(self._read_responses())
+
+    async def _handshake(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        hello = await read_frame(self._reader)
+        token = self.token or get_command_token(create=False)
+        if not token:
+            raise PermissionError("no command token")
+        self._writer.write(encode_frame({"auth": auth_digest(token, str(hello.get("nonce", "")))}))
+        reply = await read_frame(self._reader)
+        if not reply.get("ok"):
+            raise PermissionError(reply.get("error") or "authentication failed")
+
+    async def _read_responses(self):
+        error = ConnectionError("connection closed")
+        try:
+            while True:
+                message = await read_frame(self._reader)
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (OSError, EOFError, ValueError) as e:
+            error = ConnectionError(str(e) or "connection closed")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def call(self, command, timeout=DEFAULT_TIMEOUT, **args):
+        """Run a command on the instance and return its result"""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._read_task is None or self._read_task.done():
+                # Not connected yet, or the instance dropped the connection
+                self.close()
+                await self.connect(timeout)
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode_frame({"id": request_id, "cmd": command, "args": args}))
+        try:
+            reply = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error") or "command failed")
+        return reply.get("result")
+
+    def close(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+async def send_command(hosts, command, args, token=None, timeout=DEFAULT_TIMEOUT):
+    """Run one command on many instances concurrently; returns [(name, ok, result or error)]"""
+    clients = [CommandClient(*parse_host(host, DEFAULT_COMMAND_PORT), token=token) for host in hosts]
+
+    async def run(client):
+        try:
+            return client.name, True, await client.call(command, timeout, **args)
+        except asyncio.TimeoutError:
+            return client.name, False, f"timed out after {timeout:g}s"
+        except (OSError, EOFError, ValueError, RuntimeError) as e:
+            return client.name, False, str(e) or type(e).__name__
+        finally:
+            client.close()
+
+    return await asyncio.gather(*(run(client) for client in clients))
+
+
+def host_summary(host):
+    """One row of dashboard columns: host, state, downloads, queue ETA, countdown, status"""
+    if not host.online:
+        retry = max(0, host.retry_at - time.monotonic())
+        return (host.name, "offline", "", "", "", f"{host.error} (retry in {retry:.0f}s)")
+    status = host.status
+    if status.get('action_done'):
+        state = "done"
+    elif status.get('countdown') is not None:
+        state = "counting"
+    elif status.get('downloads'):
+        state = "downloading"
+    else:
+        state = "idle"
+    if not status.get('enabled'):
+        state += " (off)"
+    countdown = status.get('countdown')
+    return (status.get('host') or host.name, state, str(len(status.get('downloads', []))),
+            format_duration(status['queue_eta']) if status.get('queue_eta') is not None else "",
+            f"{format_duration(countdown)} → {status.get('action', '')}" if countdown is not None else "",
+            status.get('status', ""))
+
+
+COLUMNS = ("HOST", "STATE", "DL", "QUEUE ETA", "COUNTDOWN", "STATUS")
+
+
+def format_table(hosts):
+    """Plain-text dashboard of all hosts"""
+    rows = [host_summary(host) for host in hosts]
+    widths = [max([len(column)] + [len(row[i]) for row in rows]) for i, column in enumerate(COLUMNS[:-1])]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(COLUMNS, widths)) + "  " + COLUMNS[-1]]
+    for row in rows:
+        lines.append("  ".join(c.ljust(w) for c, w in zip(row, widths)) + "  " + row[-1])
+    online = sum(host.online for host in hosts)
+    lines.append("")
+    lines.append(f"{online}/{len(hosts)} instances reachable, "
+                 f"{sum(1 for row in rows if row[1].startswith('downloading'))} downloading, "
+                 f"{sum(1 for row in rows if row[1].startswith('counting'))} counting down")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard for SteamDown instances with the status server enabled")
+    parser.add_argument("hosts", nargs="*", help=f"host[:port] (default port {DEFAULT_STATUS_PORT})")
+    parser.add_argument("-f", "--file", help="File with one host[:port] per line")
+    parser.add_argument("-i", "--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between polls")
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-host timeout in seconds")
+    parser.add_argument("--once", action="store_true", help="Poll once, print the table and exit")
+    parser.add_argument("--gui", action="store_true", help="Show the dashboard in a window")
+    parser.add_argument("-c", "--command", metavar="CMD[=VALUE]",
+                        help="Send a command instead of showing the dashboard: status, arm, disarm, "
+                             "cancel, perform, set_timeout=SECONDS or set_action=ACTION. "
+                             f"Ports then refer to the command port (default {DEFAULT_COMMAND_PORT})")
+    parser.add_argument("--token", help="Command token (defaults to this machine's own token)")
+    args = parser.parse_args(argv)
+
+    hosts = list(args.hosts)
+    if args.file:
+        hosts.extend(read_hosts_file(args.file))
+    if not hosts:
+        parser.error("no hosts given")
+
+    if args.command:
+        command, _, value = args.command.partition("=")
+        command_args = {"value": value} if value else {}
+        results = asyncio.run(send_command(hosts, command, command_args, args.token, args.timeout))
+        for name, ok, result in results:
+            print(f"{name}: {json.dumps(result) if ok else 'error: ' + result}")
+        return 0 if all(ok for _, ok, _ in results) else 1
+
+    monitor = FleetMonitor(hosts, timeout=args.timeout)
+    if args.gui:
+        from ..components.fleet_view import run_fleet_view
+        return run_fleet_view(monitor, args.interval)
+
+    clear = "\033[2J\033[H" if sys.stdout.isatty() and not args.once else ""
+
+    def show(hosts):
+        print(clear + format_table(hosts), flush=True)
+
+    try:
+        asyncio.run(monitor.run(show, args.interval, once=args.once))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
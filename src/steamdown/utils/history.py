@@ -0,0 +1,153 @@
+import os
+import time
+import shutil
+import struct
+import threading
+
+from .system import get_data_dir
+
+HISTORY_FILE = "download_history.bin"
+
+# One record per app per sample: time, app id, bytes downloaded, bytes total, reported rate.
+# The layout matches analytics.HISTORY_DTYPE so the file can be loaded with numpy directly.
+RECORD = struct.Struct("<dIQQd")
+
+# Flush buffered records after this many seconds or records
+FLUSH_INTERVAL = 60
+FLUSH_RECORDS = 4096
+
+# Samples older than COMPACT_AFTER are thinned to one per app per COMPACT_RESOLUTION,
+# and dropped after HISTORY_RETENTION; compaction runs every COMPACT_INTERVAL (seconds)
+COMPACT_AFTER = 7 * 86400
+COMPACT_RESOLUTION = 60
+HISTORY_RETENTION = 180 * 86400
+COMPACT_INTERVAL = 86400
+
+
+def get_history_path():
+    """Path of the recorded download history"""
+    return os.path.join(get_data_dir(), HISTORY_FILE)
+
+
+class DownloadHistory:
+    """Append-only recorder of download samples.
+
+    Samples are packed into fixed-size binary records and buffered in memory; the
+    buffer is appended to the history file every FLUSH_INTERVAL seconds (or when it
+    grows large), and on flush(). Once a day the file is compacted on a
+    background thread (see compact()), so it stops growing with the uptime.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_history_path()
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+        # Guards the buffer and the file against the compaction thread
+        self._lock = threading.Lock()
+        self._next_compaction = time.monotonic() + FLUSH_INTERVAL
+
+    def record(self, downloads, now=None):
+        """Record one sample for every active download"""
+        now = time.time() if now is None else now
+        records = bytearray()
+        for download in downloads:
+            try:
+                # Only numeric (Steam) app ids fit the record format
+                app_id = int(download.app_id)
+            except ValueError:
+                continue
+            records += RECORD.pack(now, app_id,
+                                   max(0, int(download.bytes_downloaded)),
+                                   max(0, int(download.bytes_total)),
+                                   float(download.download_rate or 0))
+        if records:
+            with self._lock:
+                self._buffer += records
+
+        if (len(self._buffer) >= FLUSH_RECORDS * RECORD.size
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL):
+            self.flush()
+        if time.monotonic() >= self._next_compaction:
+            self._next_compaction = time.monotonic() + COMPACT_INTERVAL
+            threading.Thread(target=self.compact, name="steamdown-history", daemon=True).start()
+
+    def flush(self):
+        """Write buffered records to the history file"""
+        self._last_flush = time.monotonic()
+        with self._lock:
+            if not self._buffer:
+                return True
+            try:
+                with open(self.path, "ab") as f:
+                    f.write(self._buffer)
+                self._buffer.clear()
+                return True
+            except OSError as e:
+                print(f"Error writing download history: {e}")
+                return False
+
+    def compact(self, now=None):
+        """Thin out old samples and drop expired ones; returns the number of bytes saved.
+
+        Samples older than COMPACT_AFTER keep the last record per app per
+        COMPACT_RESOLUTION (so progress and completion survive), and samples older
+        than HISTORY_RETENTION are dropped. Records are in time order, so only
+        the old part of the file is parsed; the rest is copied as is, and records
+        flushed in the meantime are carried over under the lock.
+        """
+        now = time.time() if now is None else now
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                size -= size % RECORD.size
+                split = self._find_time(f, size // RECORD.size, now - COMPACT_AFTER) * RECORD.size
+                f.seek(0)
+                old = f.read(split)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            print(f"Error reading download history: {e}")
+            return 0
+
+        expiry = now - HISTORY_RETENTION
+        kept = {}
+        for record in RECORD.iter_unpack(old):
+            if record[0] >= expiry:
+                kept[(record[1], int(record[0] // COMPACT_RESOLUTION))] = record
+        if len(kept) * RECORD.size == len(old):
+            return 0
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as out:
+                out.write(b"".join(RECORD.pack(*record) for record in kept.values()))
+                with open(self.path, "rb") as f:
+                    f.seek(split)
+                    shutil.copyfileobj(f, out)
+                    copied = f.tell()
+            with self._lock:
+                # Carry over records flushed while the old part was being compacted
+                with open(self.path, "rb") as f, open(tmp_path, "ab") as out:
+                    f.seek(copied)
+                    shutil.copyfileobj(f, out)
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error compacting download history: {e}")
+            return 0
+        saved = len(old) - len(kept) * RECORD.size
+        print(f"Compacted download history: {len(old) // RECORD.size} old samples "
+              f"down to {len(kept)}, {saved // 1024} KB saved")
+        return saved
+
+    @staticmethod
+    def _find_time(f, count, t):
+        """Index of the first of `count` records in f at or after time t (binary search)"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            f.seek(middle * RECORD.size)
+            if RECORD.unpack(f.read(RECORD.size))[0] < t:
+                low = middle + 1
+            else:
+                high = middle
+        return low
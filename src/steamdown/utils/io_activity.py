@@ -0,0 +1,91 @@
+import time
+import psutil
+
+# Processes whose disk writes mean content is being downloaded. steamwebhelper
+# (the store/overlay browser) writes caches all the time, so it is ignored.
+CONTENT_PROCESSES = ('steam', 'steamservice')
+# Sustained write rate (bytes/sec) that counts as download activity
+WRITE_THRESHOLD = 1024 * 1024
+# Consecutive samples above the threshold before we call it sustained
+SUSTAIN_SAMPLES = 3
+
+
+def _process_key(name):
+    """Normalise a process name for matching (e.g. 'Steam.exe' -> 'steam')"""
+    name = name.lower()
+    if name.endswith('.exe'):
+        name = name[:-4]
+    return name
+
+
+class IoActivityDetector:
+    """Detect download activity from the Steam client's own disk I/O.
+
+    Each sample reads psutil's per-process I/O counters for the tracked Steam
+    processes and turns them into read/write rates. Writes above the threshold
+    for several samples in a row are treated as a download in progress, which
+    catches activity the registry flags haven't caught up with yet.
+
+    Note that on Windows the counters include all I/O the process performs,
+    not only disk I/O.
+    """
+
+    def __init__(self, write_threshold=WRITE_THRESHOLD, sustain_samples=SUSTAIN_SAMPLES,
+                 content_processes=CONTENT_PROCESSES):
+        self.write_threshold = write_threshold
+        self.sustain_samples = sustain_samples
+        self.content_processes = content_processes
+        self.read_rate = 0.0
+        self.write_rate = 0.0
+        self._counters = {}
+        self._last_sample = None
+        self._streak = 0
+
+    def reset(self):
+        """Forget previous counters"""
+        self._counters.clear()
+        self._last_sample = None
+        self._streak = 0
+        self.read_rate = 0.0
+        self.write_rate = 0.0
+
+    def sample(self, processes, now=None):
+        """Sample I/O counters for the given processes; returns is_active()"""
+        now = time.monotonic() if now is None else now
+        counters = {}
+        read_delta = 0
+        write_delta = 0
+
+        for proc in processes:
+            try:
+                if _process_key(proc.name()) not in self.content_processes:
+                    continue
+                io = proc.io_counters()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                continue
+            counters[proc.pid] = (io.read_bytes, io.write_bytes)
+            previous = self._counters.get(proc.pid)
+            # New processes only contribute from their second sample on
+            if previous:
+                read_delta += max(0, io.read_bytes - previous[0])
+                write_delta += max(0, io.write_bytes - previous[1])
+
+        interval = now - self._last_sample if self._last_sample is not None else 0
+        self._counters = counters
+        self._last_sample = now
+
+        if interval <= 0:
+            self.read_rate = self.write_rate = 0.0
+            return self.is_active()
+
+        self.read_rate = read_delta / interval
+        self.write_rate = write_delta / interval
+        if self.write_rate >= self.write_threshold:
+            self._streak += 1
+        else:
+            self._streak = 0
+        return self.is_active()
+
+    def is_active(self):
+        """Whether the Steam client has been writing content for long enough"""
+        return self._streak >= self.sustain_samples
@@ -0,0 +1,117 @@
+import time
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+from ..platforms.base import get_backend
+
+# How often the battery and idle state are re-read (seconds)
+POLICY_CHECK_INTERVAL = 10
+# Input within this many seconds means the user is at the machine
+USER_IDLE_THRESHOLD = 120
+# On battery: poll this many times less often, and act at most this long after downloads finish
+BATTERY_POLL_SCALE = 5
+BATTERY_ACTION_TIMEOUT = 60
+
+_idle_executor = None
+
+
+def get_idle_executor():
+    """Get the single-worker executor that reads the user's idle time"""
+    global _idle_executor
+    if _idle_executor is None:
+        _idle_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="steamdown-idle")
+    return _idle_executor
+
+
+class PowerPolicy:
+    """Adapts monitoring to the power source and to whether the user is at the machine.
+
+    On battery (with battery_saver on) the monitor polls less often, stops the
+    title animation and acts sooner once downloads are done. With
+    defer_while_active on, a due action waits while the user is using the
+    machine. Battery state (psutil) and idle time (platform backend) are read at
+    most every `check_interval` seconds; an unknown idle time never defers.
+
+    Reading the idle time can spawn helper processes (Linux), so refresh_idle()
+    runs it on a worker and user_active() answers from the last result.
+    """
+
+    def __init__(self, check_interval=POLICY_CHECK_INTERVAL, idle_threshold=USER_IDLE_THRESHOLD):
+        self.check_interval = check_interval
+        self.idle_threshold = idle_threshold
+        self.battery_saver = True
+        self.defer_while_active = True
+        self.on_battery = False
+        self.battery_percent = None
+        self.idle_time = None
+        self._battery_checked = None
+        self._idle_checked = None
+        self._idle_future = None
+        # Whether any reading has finished yet
+        self._idle_read = False
+
+    def update(self, now=None):
+        """Re-read the power source if it is due; returns True if it changed"""
+        now = time.monotonic() if now is None else now
+        if self._battery_checked is not None and now - self._battery_checked < self.check_interval:
+            return False
+        self._battery_checked = now
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        # power_plugged is None when it can't be determined; assume mains power then
+        on_battery = battery is not None and battery.power_plugged is False
+        self.battery_percent = battery.percent if battery is not None else None
+        changed = on_battery != self.on_battery
+        self.on_battery = on_battery
+        return changed
+
+    @property
+    def saving(self):
+        """Whether battery saving applies right now"""
+        return self.battery_saver and self.on_battery
+
+    @property
+    def poll_scale(self):
+        """Multiplier for the monitor's polling interval"""
+        return BATTERY_POLL_SCALE if self.saving else 1
+
+    @property
+    def animate(self):
+        """Whether decorative animations should run"""
+        return not self.saving
+
+    def action_timeout(self, timeout):
+        """Inactivity timeout to use, shortened on battery"""
+        return min(timeout, BATTERY_ACTION_TIMEOUT) if self.saving else timeout
+
+    def refresh_idle(self, now=None):
+        """Start reading the idle time on the worker if it is due (doesn't block)"""
+        if not self.defer_while_active:
+            return
+        now = time.monotonic() if now is None else now
+        if self._idle_future is not None and not self._idle_future.done():
+            return
+        if self._idle_checked is not None and now - self._idle_checked < self.check_interval:
+            return
+        self._idle_checked = now
+        self._idle_future = get_idle_executor().submit(self._read_idle_time)
+
+    def _read_idle_time(self):
+        try:
+            self.idle_time = get_backend().get_idle_time()
+        except Exception as e:
+            print(f"Error reading idle time: {e}")
+            self.idle_time = None
+        self._idle_read = True
+
+    def user_active(self, now=None):
+        """Whether a due action should wait because the user is at the machine"""
+        if not self.defer_while_active:
+            return False
+        self.refresh_idle(now)
+        if not self._idle_read:
+            # First reading still running; wait for it rather than act blindly
+            return True
+        return self.idle_time is not None and self.idle_time < self.idle_threshold
@@ -0,0 +1,204 @@
+import os
+import sys
+import time
+import threading
+import tracemalloc
+
+# Time between stack samples (seconds); ~100 Hz keeps the overhead around 1%
+DEFAULT_SAMPLE_INTERVAL = 0.01
+# Time between tracemalloc snapshots in long runs (seconds)
+DEFAULT_SNAPSHOT_INTERVAL = 60
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 10
+# Entries in each section of the allocations report
+TOP_ALLOCATIONS = 25
+
+COLLAPSED_FILE = "steamdown.collapsed"
+ALLOCATIONS_FILE = "steamdown-allocations.txt"
+
+
+def frame_label(code):
+    """Flame graph label of a function: 'name (package/file.py:line)'"""
+    path = code.co_filename.replace("\\", "/").split("/")
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Statistical profiler for the Qt thread, the monitor workers and any other thread.
+
+    A daemon thread walks sys._current_frames() every `sample_interval` and
+    counts each stack (as a tuple of code objects; labels are only formatted when
+    writing). While memory tracing is on, a tracemalloc snapshot is taken every
+    `snapshot_interval`; the first one is the baseline the report compares to.
+    Both halves can be switched on and off at any time.
+    """
+
+    def __init__(self, sample_interval=DEFAULT_SAMPLE_INTERVAL,
+                 snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+        self.sample_interval = sample_interval
+        self.snapshot_interval = snapshot_interval
+        self.stacks = {}
+        self.sample_count = 0
+        self.sample_time = 0.0
+        self.baseline = None
+        self.latest = None
+        self.memory_history = []
+        self.sampling = False
+        self.tracing = False
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._next_snapshot = 0
+
+    @property
+    def overhead(self):
+        """Share of wall time the sampler spends walking stacks (0-1)"""
+        samples = self.sample_count
+        return self.sample_time / (samples * self.sample_interval) if samples else 0.0
+
+    def set_sampling(self, enabled):
+        """Start or pause stack sampling"""
+        self.sampling = enabled
+        self._update_thread()
+
+    def set_tracing(self, enabled):
+        """Start or stop tracemalloc (the snapshots taken so far are kept)"""
+        if enabled and not self.tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            # Growth is measured from the first snapshot of this tracing session
+            self.baseline = None
+            self.tracing = True
+            self._next_snapshot = 0
+        elif not enabled and self.tracing:
+            self.take_snapshot()
+            self.tracing = False
+            with self._snapshot_lock:
+                tracemalloc.stop()
+        self._update_thread()
+
+    def _update_thread(self):
+        if self.sampling or self.tracing:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="steamdown-profiler",
+                                                daemon=True)
+                self._thread.start()
+        elif self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def stop(self):
+        """Stop sampling and tracing"""
+        self.set_tracing(False)
+        self.set_sampling(False)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            if self.sampling:
+                self.sample(own_id)
+            if self.tracing and time.monotonic() >= self._next_snapshot:
+                self.take_snapshot()
+
+    def sample(self, own_id=None):
+        """Record the current stack of every thread except `own_id`"""
+        start = time.perf_counter()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                key = tuple(stack)
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.sample_count += 1
+            self.sample_time += time.perf_counter() - start
+
+    def take_snapshot(self):
+        """Take a tracemalloc snapshot (the first one becomes the baseline)"""
+        with self._snapshot_lock:
+            if not tracemalloc.is_tracing():
+                return
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ))
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_history.append((time.time(), current, peak))
+            if self.baseline is None:
+                self.baseline = snapshot
+            self.latest = snapshot
+            self._next_snapshot = time.monotonic() + self.snapshot_interval
+
+    def collapsed_stacks(self):
+        """Lines of 'thread;outer;...;inner count' (flamegraph.pl / speedscope format)"""
+        with self._lock:
+            stacks = dict(self.stacks)
+        labels = {}
+        lines = []
+        for stack, count in stacks.items():
+            frames = [stack[-1]]
+            for code in reversed(stack[:-1]):
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = frame_label(code).replace(";", ":")
+                frames.append(label)
+            lines.append(f"{';'.join(frames)} {count}")
+        lines.sort()
+        return lines
+
+    def allocation_report(self):
+        """Text report of the largest allocations and the growth since the baseline"""
+        if self.latest is None:
+            return "No tracemalloc snapshots were taken.\n"
+        lines = []
+        start, _, _ = self.memory_history[0]
+        end, current, peak = self.memory_history[-1]
+        lines.append(f"Traced memory: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB) "
+                     f"after {end - start:.0f}s, {len(self.memory_history)} snapshots")
+        lines.append("")
+        lines.append("Traced memory over time (s, KiB):")
+        for timestamp, current, _ in self.memory_history:
+            lines.append(f"  {timestamp - start:8.0f} {current / 1024:10.1f}")
+
+        lines.append("")
+        lines.append(f"Top {TOP_ALLOCATIONS} allocation sites:")
+        for stat in self.latest.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(f"  {stat}")
+
+        if self.baseline is not self.latest:
+            lines.append("")
+            lines.append(f"Top {TOP_ALLOCATIONS} growth since the first snapshot:")
+            # compare_to() sorts by absolute change, so shrinking sites can come first
+            growth = [stat for stat in self.latest.compare_to(self.baseline, "traceback")
+                      if stat.size_diff > 0]
+            for stat in growth[:TOP_ALLOCATIONS]:
+                lines.append(f"  {stat}")
+                for line in stat.traceback.format(limit=TRACEMALLOC_FRAMES):
+                    lines.append(f"    {line}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, directory="."):
+        """Write the collapsed stacks and allocation report; returns the written paths"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        if self.stacks:
+            path = os.path.join(directory, COLLAPSED_FILE)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.collapsed_stacks()) + "\n")
+            paths.append(path)
+        if self.latest is not None:
+            path = os.path.join(directory, ALLOCATIONS_FILE)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.allocation_report())
+            paths.append(path)
+        return paths
@@ -0,0 +1,67 @@
+import os
+import re
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+
+# Loose copies of the assets, used when the resource module hasn't been compiled
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+_compiled = None
+# name -> decoded QImage; (name, size) -> QPixmap
+_images = {}
+_pixmaps = {}
+
+
+def load_resources():
+    """Register the compiled Qt resources; returns False in a checkout where build.py hasn't run.
+
+    The module is generated from assets/resources.qrc by build.py and embeds the
+    icons and stylesheets, so a built app reads none of them from disk. Without it,
+    resource_url() and resolve_stylesheet() point at the files in assets/ instead.
+    """
+    global _compiled
+    if _compiled is None:
+        try:
+            from .. import resources_rc  # noqa: F401 (importing registers the resources)
+            _compiled = True
+        except ImportError:
+            _compiled = False
+    return _compiled
+
+
+def resource_url(name):
+    """Path Qt can open for an asset: ':/name' when compiled in, else the file in assets/"""
+    if load_resources():
+        return f":/{name}"
+    return os.path.join(ASSETS_DIR, name)
+
+
+def resolve_stylesheet(stylesheet):
+    """Rewrite url(:/name) references to the files in assets/ when the resources aren't compiled"""
+    if load_resources():
+        return stylesheet
+    # Qt stylesheets want forward slashes, also on Windows
+    return re.sub(r"url\(:/([^)]+)\)",
+                  lambda match: f'url("{resource_url(match.group(1)).replace(os.sep, "/")}")',
+                  stylesheet)
+
+
+def get_pixmap(name, size=None):
+    """Pixmap of an image asset, optionally scaled to fit size x size.
+
+    Each image is decoded once; every requested size is scaled from that copy
+    and cached, so repeated lookups cost a dict access.
+    """
+    key = (name, size)
+    pixmap = _pixmaps.get(key)
+    if pixmap is None:
+        image = _images.get(name)
+        if image is None:
+            image = _images[name] = QImage(resource_url(name))
+            if image.isNull():
+                print(f"Could not load image resource {name}")
+        if size is not None and not image.isNull():
+            image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap = _pixmaps[key] = QPixmap.fromImage(image)
+    return pixmap
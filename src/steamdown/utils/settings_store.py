@@ -0,0 +1,54 @@
+import os
+import json
+
+from .system import get_data_dir
+
+SETTINGS_FILE = "settings.json"
+
+
+def get_settings_path():
+    """Path of the saved settings"""
+    return os.path.join(get_data_dir(), SETTINGS_FILE)
+
+
+class SettingsStore:
+    """Settings persisted as one small JSON object in the data dir.
+
+    load() is synchronous and cheap enough to run before the window is shown;
+    save() writes a temporary file and renames it over the old one, so a crash
+    mid-write never leaves a truncated settings file behind.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_settings_path()
+        self.saved = {}
+
+    def load(self):
+        """Return the saved settings ({} if there are none or the file is unreadable)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        except FileNotFoundError:
+            settings = {}
+        except (OSError, ValueError) as e:
+            print(f"Error loading settings, using defaults: {e}")
+            settings = {}
+        self.saved = settings if isinstance(settings, dict) else {}
+        return dict(self.saved)
+
+    def save(self, settings):
+        """Write settings if they differ from what is on disk; returns False on error"""
+        if settings == self.saved:
+            return True
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(settings, f, separators=(",", ":"), sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving settings: {e}")
+            return False
+        self.saved = dict(settings)
+        return True
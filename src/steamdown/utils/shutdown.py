@@ -0,0 +1,48 @@
+from PySide6.QtCore import QObject, Signal
+
+from .system import (find_steam_processes, request_steam_shutdown, wait_for_steam_exit,
+                     STEAM_EXIT_TIMEOUT, STEAM_TERMINATE_TIMEOUT, STEAM_KILL_TIMEOUT)
+
+
+class SteamShutdownOrchestrator(QObject):
+    """Stops Steam as the request and wait steps of an action pipeline (see stop_steam_steps).
+
+    The graceful request is followed by psutil.wait_procs on the tracked Steam
+    processes; if they are still alive after each deadline the orchestrator escalates
+    to terminate and then kill. Progress is delivered through a signal, so connected
+    slots run on the thread that owns this object.
+    """
+
+    # Signals
+    progress = Signal(str)
+
+    def __init__(self, exit_timeout=STEAM_EXIT_TIMEOUT, terminate_timeout=STEAM_TERMINATE_TIMEOUT,
+                 kill_timeout=STEAM_KILL_TIMEOUT, parent=None):
+        super().__init__(parent)
+        self.exit_timeout = exit_timeout
+        self.terminate_timeout = terminate_timeout
+        self.kill_timeout = kill_timeout
+
+    def request(self, executor=None):
+        """Send the graceful shutdown request; returns the Steam processes to wait on"""
+        steam_processes = find_steam_processes()
+        if not steam_processes:
+            self.progress.emit("Steam is not running")
+            return []
+
+        self.progress.emit("Attempting to close Steam...")
+        if not request_steam_shutdown(executor):
+            self.progress.emit("Graceful shutdown request failed, waiting before escalating...")
+        return steam_processes
+
+    def wait(self, steam_processes, cancel_event=None):
+        """Wait for Steam to exit, escalating after each deadline (blocking)"""
+        if not steam_processes:
+            return True
+        return wait_for_steam_exit(steam_processes, self.exit_timeout, self.terminate_timeout,
+                                   self.kill_timeout, progress=self.progress.emit,
+                                   cancel_event=cancel_event)
+
+    def total_timeout(self):
+        """Longest time wait() can take"""
+        return self.exit_timeout + self.terminate_timeout + self.kill_timeout
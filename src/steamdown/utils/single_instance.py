@@ -0,0 +1,172 @@
+import os
+import sys
+import getpass
+import hashlib
+import tempfile
+import threading
+from multiprocessing.connection import (Listener, Client, AuthenticationError,
+                                        deliver_challenge, answer_challenge)
+
+# Deliberately no Qt imports: a second launch must be able to hand off and exit
+# without loading the GUI stack.
+
+# How long either side waits for the other's next message (seconds)
+CONNECTION_TIMEOUT = 2.0
+
+
+def _user_name():
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "user"
+
+
+def get_instance_address():
+    """Per-user local socket address: a named pipe on Windows, a Unix socket elsewhere"""
+    user = _user_name()
+    if sys.platform == "win32":
+        return rf"\\.\pipe\SteamDown-{user}", "AF_PIPE"
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"steamdown-{user}.sock"), "AF_UNIX"
+
+
+def _authkey(address):
+    # Only keeps unrelated local clients from talking to us; the socket/pipe
+    # itself is private to the user
+    return hashlib.sha256(f"steamdown:{address}".encode("utf-8")).digest()
+
+
+class _TimedConnection:
+    """Connection whose receives give up after a timeout, for the authentication handshake"""
+
+    def __init__(self, connection, timeout):
+        self._connection = connection
+        self._timeout = timeout
+
+    def send_bytes(self, *args):
+        self._connection.send_bytes(*args)
+
+    def recv_bytes(self, *args):
+        if not self._connection.poll(self._timeout):
+            raise TimeoutError("no answer from client")
+        return self._connection.recv_bytes(*args)
+
+
+class InstanceGuard:
+    """Single-instance lock backed by a local socket.
+
+    The first instance binds the socket (which is the lock) and later serves it;
+    any further launch connects, passes its arguments along and exits. A client
+    that connects and then goes quiet is dropped after CONNECTION_TIMEOUT, so it
+    can't block later hand-offs.
+    """
+
+    def __init__(self, address=None, family=None):
+        default_address, default_family = get_instance_address()
+        self.address = address or default_address
+        self.family = family or default_family
+        self._listener = None
+        self._thread = None
+        self._closed = False
+
+    def hand_off(self, args, timeout=CONNECTION_TIMEOUT):
+        """Send args to a running instance; returns True if one accepted them"""
+        if self.family == "AF_UNIX" and not os.path.exists(self.address):
+            return False
+        try:
+            connection = Client(self.address, self.family, authkey=_authkey(self.address))
+        except (OSError, EOFError):
+            return False
+        try:
+            connection.send(list(args))
+            # Wait for the acknowledgement so we know the message was delivered
+            return connection.poll(timeout) and connection.recv() == "ok"
+        except (OSError, EOFError):
+            return False
+        finally:
+            connection.close()
+
+    def acquire(self):
+        """Become the primary instance; returns False if another one holds the lock"""
+        # No authkey here: Listener.accept() would run the handshake without a
+        # timeout, so _serve() does it per connection instead
+        try:
+            self._listener = Listener(self.address, self.family)
+            return True
+        except OSError:
+            pass
+
+        if self.family != "AF_UNIX":
+            return False
+        # A socket file nobody answers on was left behind by a crashed instance
+        if self.hand_off(["--ping"]):
+            return False
+        try:
+            os.unlink(self.address)
+            self._listener = Listener(self.address, self.family)
+            return True
+        except OSError:
+            return False
+
+    def serve(self, on_message):
+        """Start delivering messages from later launches to on_message(args).
+
+        on_message is called on a background thread.
+        """
+        if self._listener is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._serve, args=(on_message,),
+                                        name="steamdown-instance", daemon=True)
+        self._thread.start()
+
+    def _serve(self, on_message):
+        while not self._closed:
+            try:
+                connection = self._listener.accept()
+            except Exception:
+                # Client gone, or listener closed
+                if self._closed:
+                    return
+                continue
+            try:
+                timed = _TimedConnection(connection, CONNECTION_TIMEOUT)
+                authkey = _authkey(self.address)
+                deliver_challenge(timed, authkey)
+                answer_challenge(timed, authkey)
+                if not connection.poll(CONNECTION_TIMEOUT):
+                    continue
+                args = connection.recv()
+                connection.send("ok")
+                if args != ["--ping"]:
+                    on_message(args)
+            except (AuthenticationError, TimeoutError, EOFError):
+                # Not a SteamDown launch, or it went quiet
+                pass
+            except Exception as e:
+                print(f"Error handling instance message: {e}")
+            finally:
+                connection.close()
+
+    def close(self):
+        """Release the lock"""
+        self._closed = True
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+
+
+def acquire_or_hand_off(args):
+    """Return an InstanceGuard if this is the primary instance, or None after handing
+    args to the running one"""
+    guard = InstanceGuard()
+    for _ in range(3):
+        if guard.hand_off(args):
+            return None
+        if guard.acquire():
+            return guard
+    # Could neither reach nor replace the other instance; run anyway
+    print("Could not acquire the single-instance lock")
+    return guard
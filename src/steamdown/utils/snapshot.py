@@ -0,0 +1,161 @@
+import sys
+
+
+class AppDownloadState:
+    """Immutable state of one download.
+
+    paused is None when the source can't tell (the classifier then infers it from
+    progress). Instances compare and hash by value; backends can hand back the
+    previous instance when nothing changed (see intern_state), which makes the
+    comparison an identity check.
+    """
+
+    __slots__ = ('app_id', 'name', 'bytes_total', 'bytes_downloaded', 'download_rate',
+                 'paused', 'launcher', '_key')
+
+    def __init__(self, app_id, name, bytes_total=0, bytes_downloaded=0, download_rate=0,
+                 paused=None, launcher="steam"):
+        set_field = object.__setattr__
+        set_field(self, 'app_id', sys.intern(str(app_id)))
+        set_field(self, 'name', name)
+        set_field(self, 'bytes_total', bytes_total)
+        set_field(self, 'bytes_downloaded', bytes_downloaded)
+        set_field(self, 'download_rate', download_rate)
+        set_field(self, 'paused', paused)
+        set_field(self, 'launcher', launcher)
+        set_field(self, '_key', (self.app_id, name, bytes_total, bytes_downloaded,
+                                 download_rate, paused, launcher))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, AppDownloadState):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return (f"AppDownloadState({self.app_id!r}, {self.name!r}, "
+                f"{self.bytes_downloaded}/{self.bytes_total}, rate={self.download_rate})")
+
+    def replace(self, **changes):
+        """Copy with some fields changed"""
+        fields = {field: getattr(self, field) for field in self.__slots__[:-1]}
+        fields.update(changes)
+        return AppDownloadState(**fields)
+
+    def as_dict(self):
+        """Plain dict of the fields (e.g. for JSON)"""
+        return {field: getattr(self, field) for field in self.__slots__[:-1]}
+
+
+def intern_state(cache, state):
+    """Return the cached state for the app if it is equal to `state`, else cache `state`.
+
+    Lets a backend hand out the same object for an unchanged download, so
+    snapshot comparisons and diffs mostly reduce to identity checks.
+    """
+    previous = cache.get(state.app_id)
+    if previous is not None and previous._key == state._key:
+        return previous
+    cache[state.app_id] = state
+    return state
+
+
+class SnapshotDiff:
+    """Apps added, removed and changed between two snapshots (tuples of app ids)"""
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"SnapshotDiff(added={self.added}, removed={self.removed}, changed={self.changed})"
+
+
+class SteamSnapshot:
+    """Immutable result of one poll: launcher state plus its active downloads.
+
+    downloads is a tuple of AppDownloadState in the order the backend reported
+    them; launchers maps launcher names to summaries when several are merged.
+    """
+
+    __slots__ = ('running', 'process_count', 'downloads', 'io_active', 'io_write_rate',
+                 'io_read_rate', 'launchers', '_index')
+
+    def __init__(self, running=False, process_count=0, downloads=(), io_active=False,
+                 io_write_rate=0, io_read_rate=0, launchers=None):
+        set_field = object.__setattr__
+        set_field(self, 'running', running)
+        set_field(self, 'process_count', process_count)
+        set_field(self, 'downloads', tuple(downloads))
+        set_field(self, 'io_active', io_active)
+        set_field(self, 'io_write_rate', io_write_rate)
+        set_field(self, 'io_read_rate', io_read_rate)
+        set_field(self, 'launchers', launchers or {})
+        set_field(self, '_index', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def has_downloads(self):
+        return bool(self.downloads)
+
+    def get(self, app_id):
+        """State of one app, or None"""
+        index = self._index
+        if index is None:
+            # Built on first lookup only; most snapshots are just iterated
+            index = {state.app_id: state for state in self.downloads}
+            object.__setattr__(self, '_index', index)
+        return index.get(app_id)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, SteamSnapshot):
+            return NotImplemented
+        return (self.running == other.running
+                and self.process_count == other.process_count
+                and self.io_active == other.io_active
+                and self.io_write_rate == other.io_write_rate
+                and self.io_read_rate == other.io_read_rate
+                and len(self.downloads) == len(other.downloads)
+                and all(a is b or a == b for a, b in zip(self.downloads, other.downloads))
+                and self.launchers == other.launchers)
+
+    def __hash__(self):
+        return hash((self.running, self.process_count, self.downloads, self.io_active))
+
+    def replace(self, **changes):
+        """Copy with some fields changed"""
+        fields = {field: getattr(self, field) for field in self.__slots__[:-1]}
+        fields.update(changes)
+        return SteamSnapshot(**fields)
+
+    def diff(self, previous):
+        """Which apps were added, removed or changed since `previous` (may be None)"""
+        if previous is None:
+            return SnapshotDiff(tuple(state.app_id for state in self.downloads), (), ())
+        added = []
+        changed = []
+        for state in self.downloads:
+            old = previous.get(state.app_id)
+            if old is None:
+                added.append(state.app_id)
+            elif old is not state and old._key != state._key:
+                changed.append(state.app_id)
+        removed = tuple(state.app_id for state in previous.downloads if self.get(state.app_id) is None)
+        return SnapshotDiff(tuple(added), removed, tuple(changed))
@@ -0,0 +1,84 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_STATUS_PORT = 47800
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so aggregators can keep one connection open per instance
+    protocol_version = "HTTP/1.1"
+    # Send headers and body as one segment; with Nagle on, a kept-alive connection
+    # stalls on the client's delayed ACK between the two
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/status":
+            self.send_error(404)
+            return
+        body = self.server.status_body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Aggregators poll every second; don't log each request
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    status_body = b"{}"
+
+
+class StatusServer:
+    """Read-only HTTP endpoint (GET /status) exposing this instance's state as JSON.
+
+    The monitor publishes a snapshot every tick with update(); requests are served
+    from the pre-encoded snapshot on background threads.
+    """
+
+    def __init__(self, host="0.0.0.0", port=DEFAULT_STATUS_PORT):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def is_running(self):
+        return self._server is not None
+
+    def start(self):
+        """Start serving; returns False if the port could not be bound"""
+        if self._server is not None:
+            return True
+        try:
+            self._server = _Server((self.host, self.port), _StatusHandler)
+        except OSError as e:
+            print(f"Could not start status server on port {self.port}: {e}")
+            return False
+        # Port 0 binds any free port; report the one actually used
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="steamdown-status", daemon=True)
+        self._thread.start()
+        print(f"Status server listening on {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        """Stop serving"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+    def update(self, snapshot):
+        """Publish a new status snapshot (a JSON-serialisable dict)"""
+        if self._server is not None:
+            # Swapping the reference is atomic, so handlers never see a partial body
+            self._server.status_body = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
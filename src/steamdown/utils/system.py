@@ -1,41 +1,53 @@
 import os
 import sys
-import winreg
 import psutil
 import subprocess
-from threading import Thread
 import time
 import re
 
+from .executors import get_default_executor
+from .snapshot import SteamSnapshot
+from ..platforms.base import get_backend
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and PyInstaller"""
     base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
     return os.path.join(base_path, relative_path)
 
+def get_data_dir():
+    """Get (and create) the per-user directory for SteamDown caches and data"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        data_dir = os.path.join(base, "SteamDown")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        data_dir = os.path.join(base, "steamdown")
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
 def get_steam_path():
-    """Get Steam installation path from Windows registry"""
-    try:
-        hkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\WOW6432Node\\Valve\\Steam")
-        steam_path = winreg.QueryValueEx(hkey, "InstallPath")[0]
-        winreg.CloseKey(hkey)
-        return steam_path
-    except WindowsError:
-        try:
-            # Try non-WOW6432Node path as fallback
-            hkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\Valve\\Steam")
-            steam_path = winreg.QueryValueEx(hkey, "InstallPath")[0]
-            winreg.CloseKey(hkey)
-            return steam_path
-        except WindowsError:
-            print("Could not find Steam path in registry")
-            return None
+    """Get Steam installation path"""
+    return get_backend().get_steam_path()
+
+# Default deadlines (seconds) for stopping Steam
+STEAM_EXIT_TIMEOUT = 30
+STEAM_TERMINATE_TIMEOUT = 10
+STEAM_KILL_TIMEOUT = 5
 
 def find_steam_processes():
     """Find all Steam-related processes"""
     steam_processes = []
+    own_pid = os.getpid()
     for proc in psutil.process_iter(['pid', 'name', 'exe']):
         try:
-            if proc.info['name'] and any(s in proc.info['name'].lower() for s in ['steam', 'steamservice', 'steamwebhelper']):
+            name = proc.info['name']
+            if not name or proc.info['pid'] == own_pid:
+                continue
+            name = name.lower()
+            # Don't match ourselves (SteamDown.exe)
+            if name.startswith('steamdown'):
+                continue
+            if any(s in name for s in ['steam', 'steamservice', 'steamwebhelper']):
                 steam_processes.append(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
@@ -84,179 +96,154 @@ def get_game_name_from_manifest(app_id, library_folders):
                 print(f"Error reading manifest {manifest_path}: {e}")
     return None
 
-def get_steam_registry_downloads():
-    """Get active downloads by monitoring Steam registry keys"""
+def read_app_manifest(manifest_path):
+    """Read the top-level "key" "value" pairs of an appmanifest_<id>.acf file"""
+    with open(manifest_path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    values = {}
+    for key, value in re.findall(r'"(\w+)"\s+"([^"]*)"', content):
+        # Nested sections come after the top-level keys, so keep the first match
+        values.setdefault(key, value)
+    return values
+
+def get_game_name_from_appinfo(app_id):
+    """Get game name from Steam's binary appcache/appinfo.vdf"""
+    from .appinfo import get_appinfo_reader
+
     try:
-        steam_apps_path = r"Software\\Valve\\Steam\\Apps"
-        library_folders = get_steam_library_folders()
-        
-        # Try to open the Steam Apps registry key
-        try:
-            hkey = winreg.OpenKey(winreg.HKEY_CURRENT_USER, steam_apps_path)
-        except WindowsError:
-            print("Could not find Steam Apps registry key")
-            return []
-            
-        active_downloads = []
-        index = 0
-        
-        # Enumerate all app subkeys
-        while True:
-            try:
-                # Get the name of the subkey (app ID)
-                app_id = winreg.EnumKey(hkey, index)
-                
-                # Open the app's subkey
-                app_key_path = f"{steam_apps_path}\\{app_id}"
-                app_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, app_key_path)
-                
-                # Try to get all relevant values at once
-                try:
-                    values = {}
-                    i = 0
-                    while True:
-                        try:
-                            name, data, _ = winreg.EnumValue(app_key, i)
-                            values[name] = data
-                            i += 1
-                        except WindowsError:
-                            break
-                    
-                    # Check if app is being updated or downloaded
-                    if values.get('Updating', 0) == 1 or values.get('Downloading', 0) == 1:
-                        # Try to get the game name from manifest first
-                        game_name = get_game_name_from_manifest(app_id, library_folders)
-                        
-                        # Fall back to registry name if manifest not found
-                        if not game_name:
-                            game_name = values.get('Name', f"Game {app_id}")
-                            
-                        print(f"\nFound active game: {game_name} (ID: {app_id})")
-                        print(f"Status - Updating: {values.get('Updating')}, Downloading: {values.get('Downloading')}")
-                        
-                        # Debug print all values for this app
-                        print("Registry values:")
-                        for key, value in values.items():
-                            print(f"  {key}: {value}")
-                        
-                        # Get download progress
-                        # Try different progress indicators
-                        bytes_total = values.get('SizeOnDisk', values.get('BytesToDownload', 0))
-                        bytes_downloaded = values.get('BytesDownloaded', 0)
-                        download_rate = values.get('DownloadRate', 0)
-                        
-                        print(f"Download info:")
-                        print(f"  Total bytes: {bytes_total}")
-                        print(f"  Downloaded: {bytes_downloaded}")
-                        print(f"  Rate: {download_rate} bytes/sec")
-                        
-                        if bytes_total > 0:
-                            progress = (bytes_downloaded / bytes_total) * 100
-                            print(f"  Progress: {progress:.1f}%")
-                        else:
-                            progress = 0
-                            print("  Progress: Unknown (total size is 0)")
-                        
-                        active_downloads.append({
-                            'app_id': app_id,
-                            'name': game_name,
-                            'bytes_total': bytes_total,
-                            'bytes_downloaded': bytes_downloaded,
-                            'download_rate': download_rate
-                        })
-                        
-                except WindowsError as e:
-                    if app_id in ['730', '228980', '250820']:  # Common Steam apps
-                        print(f"Error reading values for {app_id}: {e}")
-                
-                winreg.CloseKey(app_key)
-                index += 1
-                
-            except WindowsError:
-                break  # No more subkeys
-                
-        winreg.CloseKey(hkey)
-        if active_downloads:
-            print(f"\nFound {len(active_downloads)} active downloads")
-        return active_downloads
-        
+        reader = get_appinfo_reader()
+        if reader:
+            return reader.get_name(app_id)
+    except Exception as e:
+        print(f"Error reading appinfo for {app_id}: {e}")
+    return None
+
+def get_active_downloads(app_ids=None):
+    """Get active downloads from the platform backend (only among app_ids, if given)"""
+    try:
+        if app_ids is not None:
+            return get_backend().get_app_downloads(get_steam_library_folders(), app_ids)
+        return get_backend().get_downloads(get_steam_library_folders())
     except Exception as e:
-        print(f"Error checking Steam registry: {e}")
+        print(f"Error checking Steam downloads: {e}")
         return []
 
-def get_steam_status():
-    """Get comprehensive Steam status including downloads"""
+def get_steam_status(io_detector=None, app_ids=None):
+    """Get comprehensive Steam status including downloads, as a SteamSnapshot.
+
+    If an IoActivityDetector is given, the Steam processes' disk I/O is sampled
+    as well and reported alongside the registry result. With app_ids, only
+    those apps' downloads are looked up.
+    """
     try:
         steam_processes = find_steam_processes()
-        active_downloads = get_steam_registry_downloads()
+        active_downloads = get_active_downloads(app_ids)
         
-        return {
-            'running': bool(steam_processes),
-            'process_count': len(steam_processes),
-            'active_downloads': active_downloads,
-            'has_downloads': bool(active_downloads)
-        }
+        if io_detector is None:
+            return SteamSnapshot(bool(steam_processes), len(steam_processes), active_downloads)
+        io_active = io_detector.sample(steam_processes)
+        return SteamSnapshot(bool(steam_processes), len(steam_processes), active_downloads,
+                             io_active, io_detector.write_rate, io_detector.read_rate)
     except Exception as e:
         print(f"Error getting Steam status: {e}")
         return None
 
-def close_steam_async(callback=None):
-    """Close Steam process gracefully in a separate thread"""
-    def shutdown_thread():
+def request_steam_shutdown(executor=None):
+    """Ask the running Steam client to exit (e.g. Steam.exe -shutdown)"""
+    steam_path = get_steam_path()
+    if not steam_path:
+        return False
+    command = get_backend().steam_shutdown_command(steam_path)
+    if not command:
+        return False
+
+    print(f"Attempting graceful shutdown via {' '.join(command)}")
+    try:
+        # Only delivers the request to the running client; exit is confirmed separately
+        returncode = (executor or get_default_executor()).run(command, timeout=5)
+        if returncode == 0:
+            print("Shutdown command sent successfully")
+            return True
+        print(f"Shutdown command failed with exit code {returncode}")
+    except subprocess.TimeoutExpired:
+        print("Shutdown command timed out")
+    except OSError as e:
+        print(f"Could not run shutdown command: {e}")
+    return False
+
+def _wait_procs(processes, timeout, cancel_event=None):
+    """psutil.wait_procs that gives up early once cancel_event is set"""
+    if cancel_event is None:
+        return psutil.wait_procs(processes, timeout=timeout)[1]
+
+    deadline = time.monotonic() + timeout
+    alive = processes
+    while alive and not cancel_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        alive = psutil.wait_procs(alive, timeout=min(1, remaining))[1]
+    return alive
+
+def wait_for_steam_exit(steam_processes, exit_timeout=STEAM_EXIT_TIMEOUT,
+                        terminate_timeout=STEAM_TERMINATE_TIMEOUT,
+                        kill_timeout=STEAM_KILL_TIMEOUT, progress=None,
+                        cancel_event=None):
+    """Wait for Steam processes to exit, escalating to terminate and then kill.
+
+    Returns True once every process is gone. Setting cancel_event stops waiting
+    (and escalating) early and returns False.
+    """
+    def report(message):
+        print(message)
+        if progress:
+            progress(message)
+
+    report(f"Waiting up to {exit_timeout}s for Steam to exit...")
+    alive = _wait_procs(steam_processes, exit_timeout, cancel_event)
+    if cancel_event is not None and cancel_event.is_set():
+        report("Stopping Steam cancelled")
+        return False
+    if not alive:
+        report("Steam has exited")
+        return True
+
+    report(f"{len(alive)} Steam processes still running, terminating...")
+    for proc in alive:
         try:
-            print("Starting Steam shutdown process...")
-            result = False
-            
-            # First check if Steam is running
-            steam_processes = find_steam_processes()
-            if not steam_processes:
-                print("Steam is not running")
-                if callback:
-                    callback(True)  # Return true since there's nothing to close
-                return
-            
-            print(f"Found {len(steam_processes)} Steam processes")
-            
-            # Try to close Steam gracefully using the Steam executable
-            steam_path = get_steam_path()
-            if steam_path:
-                print(f"Found Steam path: {steam_path}")
-                steam_exe = os.path.join(steam_path, "Steam.exe")
-                if os.path.exists(steam_exe):
-                    print("Attempting graceful shutdown via Steam.exe -shutdown")
-                    try:
-                        subprocess.run([steam_exe, "-shutdown"], timeout=5, check=True)
-                        print("Shutdown command sent successfully")
-                        result = True
-                    except subprocess.TimeoutExpired:
-                        print("Shutdown command timed out")
-                    except subprocess.CalledProcessError as e:
-                        print(f"Shutdown command failed: {e}")
-            
-            if callback:
-                callback(result)
-                
-        except Exception as e:
-            print(f"Error during Steam shutdown: {e}")
-            if callback:
-                callback(False)
-    
-    # Start the shutdown process in a separate thread
-    Thread(target=shutdown_thread, daemon=True).start()
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    alive = _wait_procs(alive, terminate_timeout, cancel_event)
+    if cancel_event is not None and cancel_event.is_set():
+        report("Stopping Steam cancelled")
+        return False
+    if not alive:
+        report("Steam has exited after terminate")
+        return True
+
+    report(f"{len(alive)} Steam processes ignored terminate, killing...")
+    for proc in alive:
+        try:
+            proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    alive = _wait_procs(alive, kill_timeout)
+    if alive:
+        report(f"{len(alive)} Steam processes could not be stopped")
+        return False
+    report("Steam has exited after kill")
     return True
 
-def system_action(action="shutdown"):
+def system_action(action="shutdown", executor=None):
     """Perform system action (shutdown, sleep, hibernate, or log off)"""
     try:
-        if action == "shutdown":
-            os.system("shutdown /s /t 60 /c \"SteamDown is shutting down the PC. Save your work!\"")
-        elif action == "sleep":
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-        elif action == "hibernate":
-            os.system("shutdown /h")
-        elif action == "logoff":
-            os.system("shutdown /l")
-        return True
+        command = get_backend().power_command(action)
+        if not command:
+            print(f"Unknown system action: {action}")
+            return False
+        # No timeout: sleep/hibernate only return once the machine resumes
+        return (executor or get_default_executor()).run(command) == 0
     except Exception as e:
         print(f"Error performing system action: {e}")
-        return False 
\ No newline at end of file
+        return False
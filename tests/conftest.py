@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Import the package the way main.py does (from src.steamdown import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Application instance, so cross-thread signals are delivered by an event loop"""
+    return QCoreApplication.instance() or QCoreApplication([])
@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+from PySide6.QtCore import QObject, QEventLoop, QTimer, Slot
+
+from src.steamdown.platforms.base import get_backend
+from src.steamdown.utils.actions import ActionPipeline, ActionStep, flush_history_step, power_action_step
+from src.steamdown.utils.executors import DryRunExecutor
+
+# Upper bound for one pipeline run in these tests (ms)
+RUN_TIMEOUT_MS = 5000
+
+
+class PipelineRecorder(QObject):
+    """Collects a pipeline's signals on the test thread and ends the event loop when it finishes"""
+
+    def __init__(self, pipeline):
+        super().__init__()
+        self.loop = QEventLoop()
+        self.steps = []
+        self.success = None
+        pipeline.step_finished.connect(self.on_step_finished)
+        pipeline.finished.connect(self.on_finished)
+
+    @Slot(str, bool, str)
+    def on_step_finished(self, name, success, message):
+        self.steps.append((name, success, message))
+
+    @Slot(bool, float)
+    def on_finished(self, success, latency):
+        self.success = success
+        self.loop.quit()
+
+    def wait(self):
+        if self.success is None:
+            QTimer.singleShot(RUN_TIMEOUT_MS, self.loop.quit)
+            self.loop.exec()
+        assert self.success is not None, "pipeline did not finish"
+
+
+class FailingHistory:
+    """Download history whose flush fails, like on a full disk"""
+
+    def flush(self):
+        return False
+
+
+def waiting_step(name, started=None, **kwargs):
+    """Step that blocks until it is asked to stop, then reports failure"""
+    def run(context):
+        cancel_event = context.cancel_event
+        if started is not None:
+            started.set()
+        cancel_event.wait(RUN_TIMEOUT_MS / 1000)
+        return False
+
+    return ActionStep(name, run, **kwargs)
+
+
+def run_pipeline(steps, executor):
+    pipeline = ActionPipeline(executor)
+    recorder = PipelineRecorder(pipeline)
+    try:
+        assert pipeline.start(steps)
+        recorder.wait()
+    finally:
+        pipeline.shutdown()
+    return recorder
+
+
+@pytest.fixture
+def executor(qapp):
+    return DryRunExecutor()
+
+
+def test_power_action_runs_command_through_executor(executor):
+    recorder = run_pipeline([power_action_step("shutdown")], executor)
+
+    assert recorder.success
+    assert executor.commands == [get_backend().power_command("shutdown")]
+
+
+def test_failing_power_command_fails_pipeline(qapp):
+    executor = DryRunExecutor(returncode=1)
+    recorder = run_pipeline([power_action_step("shutdown")], executor)
+
+    assert not recorder.success
+    assert len(executor.commands) == 1
+
+
+def test_required_step_failure_stops_pipeline(executor):
+    steps = [ActionStep("Check", lambda context: (False, "not ready")), power_action_step("shutdown")]
+    recorder = run_pipeline(steps, executor)
+
+    assert not recorder.success
+    assert recorder.steps == [("Check", False, "not ready")]
+    assert executor.commands == []
+
+
+def test_best_effort_step_failure_continues(executor):
+    steps = [flush_history_step(FailingHistory()), power_action_step("shutdown")]
+    recorder = run_pipeline(steps, executor)
+
+    assert recorder.success
+    assert [(name, success) for name, success, _ in recorder.steps] == [
+        ("Flush download history", False), ("Power action: shutdown", True)]
+    assert len(executor.commands) == 1
+
+
+def test_step_timeout_stops_pipeline(executor):
+    steps = [waiting_step("Wait", timeout=0.1), power_action_step("shutdown")]
+    recorder = run_pipeline(steps, executor)
+
+    assert not recorder.success
+    assert recorder.steps == [("Wait", False, "Timed out after 0.1s")]
+    assert executor.commands == []
+
+
+def test_best_effort_timeout_does_not_cancel_later_steps(executor):
+    steps = [waiting_step("Wait", timeout=0.1, required=False), power_action_step("shutdown")]
+    recorder = run_pipeline(steps, executor)
+
+    assert recorder.success
+    assert recorder.steps[0] == ("Wait", False, "Timed out after 0.1s")
+    assert len(executor.commands) == 1
+
+
+def test_cancel_stops_running_step_and_skips_the_rest(executor):
+    started = threading.Event()
+    pipeline = ActionPipeline(executor)
+    recorder = PipelineRecorder(pipeline)
+    try:
+        assert pipeline.start([waiting_step("Wait", started), power_action_step("shutdown")])
+        assert started.wait(RUN_TIMEOUT_MS / 1000)
+        # Only one run at a time
+        assert not pipeline.start([power_action_step("shutdown")])
+        pipeline.cancel()
+        recorder.wait()
+    finally:
+        pipeline.shutdown()
+
+    assert not recorder.success
+    assert recorder.steps == [("Wait", False, "Cancelled")]
+    assert executor.commands == []
@@ -0,0 +1,111 @@
+import asyncio
+import socket
+from concurrent.futures import Future
+
+import pytest
+
+from src.steamdown.utils.command_server import CommandServer
+from src.steamdown.utils.fleet import FleetMonitor, format_table, send_command
+from src.steamdown.utils.status_server import StatusServer
+
+TOKEN = "fleet-test-token"
+# Per-host deadline in these tests (seconds)
+TIMEOUT = 2.0
+
+STATUS = {
+    'host': "gaming-pc",
+    'enabled': True,
+    'action': "Shutdown PC",
+    'status': "Active download detected, waiting...",
+    'queue_eta': 754,
+    'countdown': None,
+    'action_done': False,
+    'downloads': [{'app_id': "730", 'name': "Counter-Strike 2", 'state': "active"},
+                  {'app_id': "570", 'name': "Dota 2", 'state': "paused"}],
+}
+
+
+def free_port():
+    """A local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def poll_once(hosts):
+    monitor = FleetMonitor(hosts, timeout=TIMEOUT)
+    asyncio.run(monitor.run(lambda hosts: None, once=True))
+    return monitor.hosts
+
+
+def dispatch(command, args):
+    """Stand-in for MainWindow.dispatch_remote_command that answers right away"""
+    future = Future()
+    if command == "status":
+        future.set_result({'enabled': True, 'args': args})
+    else:
+        future.set_exception(ValueError(f"unknown command {command!r}"))
+    return future
+
+
+@pytest.fixture
+def status_server():
+    server = StatusServer("127.0.0.1", 0)
+    assert server.start()
+    server.update(STATUS)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def command_server():
+    server = CommandServer(dispatch, "127.0.0.1", 0, token=TOKEN)
+    assert server.start()
+    yield server
+    server.stop()
+
+
+def test_fleet_table_shows_polled_status(status_server):
+    hosts = poll_once([f"127.0.0.1:{status_server.port}"])
+
+    assert hosts[0].online
+    assert hosts[0].status == STATUS
+    lines = format_table(hosts).splitlines()
+    assert lines[0].split() == ["HOST", "STATE", "DL", "QUEUE", "ETA", "COUNTDOWN", "STATUS"]
+    assert lines[1].split()[:5] == ["gaming-pc", "downloading", "2", "12m", "34s"]
+    assert lines[1].endswith(STATUS['status'])
+    assert lines[-1] == "1/1 instances reachable, 1 downloading, 0 counting down"
+
+
+def test_unreachable_host_is_reported_offline(status_server):
+    port = free_port()
+    hosts = poll_once([f"127.0.0.1:{status_server.port}", f"127.0.0.1:{port}"])
+
+    assert hosts[0].online
+    assert not hosts[1].online
+    assert hosts[1].failures == 1
+    assert hosts[1].retry_at > 0
+    row = format_table(hosts).splitlines()[2]
+    assert row.split()[:2] == [f"127.0.0.1:{port}", "offline"]
+    assert format_table(hosts).splitlines()[-1].startswith("1/2 instances reachable")
+
+
+def test_command_is_sent_with_token(command_server):
+    host = f"127.0.0.1:{command_server.port}"
+    results = asyncio.run(send_command([host], "status", {'value': "1"}, token=TOKEN, timeout=TIMEOUT))
+
+    assert results == [(host, True, {'enabled': True, 'args': {'value': "1"}})]
+
+
+def test_command_error_is_returned(command_server):
+    host = f"127.0.0.1:{command_server.port}"
+    results = asyncio.run(send_command([host], "explode", {}, token=TOKEN, timeout=TIMEOUT))
+
+    assert results == [(host, False, "unknown command 'explode'")]
+
+
+def test_wrong_token_is_rejected(command_server):
+    host = f"127.0.0.1:{command_server.port}"
+    results = asyncio.run(send_command([host], "status", {}, token="not-the-token", timeout=TIMEOUT))
+
+    assert results == [(host, False, "authentication failed")]
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+import pytest
+
+from src.steamdown.utils.io_activity import IoActivityDetector, _process_key
+
+# Seconds between detector samples
+SAMPLE_INTERVAL = 0.25
+
+# Writes 256 KB chunks to the file in argv[1] and syncs each one, until killed
+WRITER = """
+import os, sys, time
+with open(sys.argv[1], "wb") as f:
+    while True:
+        f.seek(0)
+        f.write(os.urandom(256 * 1024))
+        f.flush()
+        os.fsync(f.fileno())
+        time.sleep(0.01)
+"""
+
+
+@pytest.fixture
+def writer():
+    # Next to the tests rather than in /tmp: writes to a tmpfs never reach the disk counters
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__))) as directory:
+        process = subprocess.Popen([sys.executable, "-c", WRITER, os.path.join(directory, "content.bin")])
+        yield process
+        process.kill()
+        process.wait()
+
+
+def sample_for(detector, processes, count):
+    results = []
+    for _ in range(count):
+        time.sleep(SAMPLE_INTERVAL)
+        results.append(detector.sample(processes))
+    return results
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="per-process disk write counters come from /proc")
+def test_detects_writing_process_and_goes_idle_after_exit(writer):
+    process = psutil.Process(writer.pid)
+    detector = IoActivityDetector(write_threshold=64 * 1024, sustain_samples=3,
+                                  content_processes=(_process_key(process.name()),))
+    detector.sample([process])
+
+    results = sample_for(detector, [process], 4)
+    assert detector.write_rate > 0
+    assert results[-1]
+
+    writer.kill()
+    writer.wait()
+    results = sample_for(detector, [process], 2)
+    assert not any(results)
+    assert detector.write_rate == 0